@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.profiling import aggregate_profiles, get_hot_functions
+
+
+class Command(BaseCommand):
+    """Report the hot functions of the profiled requests of every endpoint."""
+
+    help = "Aggregate the profiles saved by ProfilingMiddleware into the top functions per endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            type=Path,
+            default=settings.API_PROFILING["DIR"],
+            help="Directory of the profiles (default: API_PROFILING['DIR'])",
+        )
+        parser.add_argument(
+            "--endpoint", help="Only report endpoints whose URL name contains this text"
+        )
+        parser.add_argument(
+            "--top", type=int, default=20, help="Number of functions reported per endpoint"
+        )
+        parser.add_argument(
+            "--sort",
+            choices=("cumulative", "tottime"),
+            default="cumulative",
+            help="Rank functions by time including callees, or by time spent in them",
+        )
+
+    def handle(self, *args, **options):
+        if not options["dir"].is_dir():
+            raise CommandError(f"No profiles directory at {options['dir']}")
+
+        endpoints = aggregate_profiles(options["dir"], options["endpoint"])
+        if not endpoints:
+            self.stdout.write("No profiles found")
+            return
+
+        # Slowest endpoints first, times are per request
+        for key, profile in sorted(
+            endpoints.items(), key=lambda item: item[1]["duration"], reverse=True
+        ):
+            requests = profile["requests"]
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"{key}: {requests} requests, "
+                    f"{profile['duration'] / requests * 1000:.1f} ms on average"
+                )
+            )
+            self.stdout.write(f"{'calls':>10} {'tottime ms':>12} {'cumtime ms':>12}  function")
+            for row in get_hot_functions(profile["stats"], options["sort"], options["top"]):
+                self.stdout.write(
+                    f"{row['calls'] / requests:>10.1f} "
+                    f"{row['tottime'] / requests * 1000:>12.3f} "
+                    f"{row['cumulative'] / requests * 1000:>12.3f}  {row['function']}"
+                )
+            self.stdout.write("")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.schema import write_schema
+
+
+class Command(BaseCommand):
+    """Generate the OpenAPI schema once, so servers do not generate it on request."""
+
+    help = "Generate the OpenAPI schema into OPENAPI_SCHEMA_DIR, served by /api/schema"
+
+    def handle(self, *args, **options):
+        for path in write_schema():
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
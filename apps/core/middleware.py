@@ -0,0 +1,129 @@
+"""Project-wide middleware."""
+
+import cProfile
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+
+from .profiling import save_profile
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionControlMiddleware:
+    """
+    Reject requests with 503 while the process handles too many requests at once.
+
+    Past API_MAX_IN_FLIGHT concurrent requests, more work only makes every
+    request slower, so extra requests are shed right away with a Retry-After
+    header of API_RETRY_AFTER seconds. Streaming responses count until they
+    are fully sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_in_flight = settings.API_MAX_IN_FLIGHT
+        self.slots = threading.BoundedSemaphore(self.max_in_flight or 1)
+
+    def __call__(self, request):
+        if not self.max_in_flight:
+            return self.get_response(request)
+
+        if not self.slots.acquire(blocking=False):
+            response = JsonResponse(
+                {"detail": "The server is busy, please retry later."}, status=503
+            )
+            response["Retry-After"] = str(settings.API_RETRY_AFTER)
+            return response
+
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        if response.streaming:
+            response.streaming_content = StreamingSlot(response.streaming_content, self.slots)
+        else:
+            self.slots.release()
+        return response
+
+
+class StreamingSlot:
+    """Streaming content that frees its admission slot when the response is closed."""
+
+    def __init__(self, streaming_content, slots):
+        self.streaming_content = streaming_content
+        self.slots = slots
+        self.released = False
+
+    def __iter__(self):
+        return iter(self.streaming_content)
+
+    def close(self):
+        # Called by the server once the response is sent or the client went away
+        if not self.released:
+            self.released = True
+            self.slots.release()
+
+
+class ProfilingMiddleware:
+    """
+    Profile a random sample of requests with cProfile and save the profiles to disk.
+
+    API_PROFILING["SAMPLE_RATE"] is the fraction of requests profiled. At 0 the
+    middleware removes itself from the chain when the server starts, so it
+    costs nothing. Profiles are aggregated by the aggregate_profiles command.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.API_PROFILING["SAMPLE_RATE"]
+        if not self.sample_rate:
+            raise MiddlewareNotUsed()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can be active at a time, another thread has it
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+
+        # A profile that cannot be written must not fail the request
+        try:
+            save_profile(profiler, request, time.perf_counter() - start)
+        except OSError:
+            logger.exception("Failed to save the profile of %s %s", request.method, request.path)
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with gzip when they are larger than a size threshold.
+
+    Small responses are sent as-is, compressing them costs more CPU than the
+    bytes saved on the wire. The threshold is set by API_COMPRESSION_MIN_SIZE,
+    streaming responses are always compressed.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.API_COMPRESSION_MIN_SIZE:
+            return response
+
+        return super().process_response(request, response)
@@ -0,0 +1,162 @@
+"""Storage and aggregation of the profiles of sampled requests."""
+
+import os
+import pstats
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+PROFILE_SUFFIX = ".prof"
+
+# Profile files are named <method>_<endpoint>_<duration>ms_<timestamp>_<pid>.prof
+PROFILE_NAME = re.compile(
+    r"^(?P<method>[A-Z]+)_(?P<endpoint>[\w.-]+)_(?P<duration>\d+)ms_\d+_\d+\.prof$"
+)
+
+# Number of profiles in each directory as last counted by this process, so that
+# a directory is only listed when it went over the limit
+_profile_counts = {}
+
+
+def get_profile_dir():
+    """Get the directory of the profiles, creating it if needed."""
+    directory = Path(settings.API_PROFILING["DIR"])
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def get_endpoint(request):
+    """
+    Get the name profiles of a request are grouped by.
+
+    Args:
+        request (HttpRequest): Profiled request
+
+    Returns:
+        str: URL name of the view, "unresolved" for requests no view matched
+    """
+    match = request.resolver_match
+    return re.sub(r"[^\w.-]", "-", match.view_name) if match else "unresolved"
+
+
+def save_profile(profiler, request, duration):
+    """
+    Write the profile of a request to disk, removing the oldest profiles once over the limit.
+
+    When the directory holds more than API_PROFILING["MAX_FILES"] profiles, it is
+    pruned a tenth below the limit, so it is only listed again after as many more
+    requests. Profiles written by other processes are counted at the next prune,
+    so the limit is approximate.
+
+    Args:
+        profiler (cProfile.Profile): Profiler that ran during the request
+        request (HttpRequest): Profiled request
+        duration (float): Duration of the request in seconds
+
+    Returns:
+        Path: Path of the profile file
+    """
+    directory = get_profile_dir()
+    name = (
+        f"{request.method}_{get_endpoint(request)}_{round(duration * 1000)}ms"
+        f"_{time.time_ns()}_{os.getpid()}{PROFILE_SUFFIX}"
+    )
+    path = directory / name
+    # Written aside and renamed, so that aggregation never reads a partial profile
+    temporary_path = directory / f".{name}.tmp"
+    profiler.dump_stats(temporary_path)
+    os.replace(temporary_path, path)
+
+    max_files = settings.API_PROFILING["MAX_FILES"]
+    count = _profile_counts.get(directory)
+    count = len(list_profiles(directory)) if count is None else count + 1
+    if count > max_files:
+        count = prune_profiles(directory, max_files - max_files // 10)
+    _profile_counts[directory] = count
+    return path
+
+
+def list_profiles(directory):
+    """List the profiles of a directory, oldest first."""
+    profiles = [path for path in directory.iterdir() if PROFILE_NAME.match(path.name)]
+    # By the timestamp in the name
+    profiles.sort(key=lambda path: int(path.stem.split("_")[-2]))
+    return profiles
+
+
+def prune_profiles(directory, max_files):
+    """
+    Remove the oldest profiles of a directory beyond a number of files.
+
+    Args:
+        directory (Path): Directory of the profiles
+        max_files (int): Number of profiles kept
+
+    Returns:
+        int: Number of profiles left
+    """
+    profiles = list_profiles(directory)
+    removed = profiles[: max(len(profiles) - max_files, 0)]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return len(profiles) - len(removed)
+
+
+def aggregate_profiles(directory, endpoint=None):
+    """
+    Merge the profiles of a directory by endpoint.
+
+    Args:
+        directory (Path): Directory of the profiles
+        endpoint (str): Only merge the profiles of endpoints containing this name
+
+    Returns:
+        dict: Number of requests, total duration in seconds and merged pstats.Stats
+            by method and endpoint
+    """
+    paths = defaultdict(list)
+    durations = defaultdict(int)
+    for path in sorted(Path(directory).glob(f"*{PROFILE_SUFFIX}")):
+        match = PROFILE_NAME.match(path.name)
+        if not match or (endpoint and endpoint not in match["endpoint"]):
+            continue
+        key = f"{match['method']} {match['endpoint']}"
+        paths[key].append(str(path))
+        durations[key] += int(match["duration"])
+
+    return {
+        key: {
+            "requests": len(files),
+            "duration": durations[key] / 1000,
+            "stats": pstats.Stats(*files),
+        }
+        for key, files in paths.items()
+    }
+
+
+def get_hot_functions(stats, sort="cumulative", limit=20):
+    """
+    Get the functions that took most time in merged profiles.
+
+    Args:
+        stats (pstats.Stats): Merged profiles
+        sort (str): "cumulative" for time including callees, "tottime" for time in the function
+        limit (int): Number of functions
+
+    Returns:
+        list: Dictionaries with the calls, own time, cumulative time and name of the functions
+    """
+    rows = [
+        {
+            "calls": calls,
+            "tottime": tottime,
+            "cumulative": cumulative,
+            "function": pstats.func_std_string(function),
+        }
+        for function, (_, calls, tottime, cumulative, _) in stats.stats.items()
+    ]
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:limit]
@@ -0,0 +1,217 @@
+"""JSON renderers and parsers backed by the fastest installed JSON library."""
+
+import codecs
+import math
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Backends tried in order when JSON_BACKEND is "auto"
+AUTO_BACKENDS = ("orjson", "msgspec", "json")
+
+# Types skipped when searching data for non-finite floats
+SCALARS = (str, int, type(None))
+
+# Line and paragraph separators are valid JSON but not valid JavaScript
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class JSONBackend:
+    """A JSON library with its encode and decode functions."""
+
+    def __init__(
+        self, name, dumps=None, loads=None, decode_errors=(ValueError,), encode_errors=(TypeError,)
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            name (str): Name of the JSON library
+            dumps (callable): Function encoding data to UTF-8 bytes, None for the stdlib
+            loads (callable): Function decoding UTF-8 bytes, None for the stdlib
+            decode_errors (tuple): Exceptions raised by loads for invalid JSON
+            encode_errors (tuple): Exceptions raised by dumps for data it cannot encode
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.decode_errors = decode_errors
+        self.encode_errors = encode_errors
+
+    @property
+    def is_stdlib(self):
+        return self.dumps is None
+
+
+def _encode_default(obj):
+    """Encode the types the fast libraries do not support the way DRF does."""
+    return JSONEncoder().default(obj)
+
+
+def _contains_non_finite(value):
+    """Check whether data holds NaN or infinite floats, which the fast libraries render as null."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        values = value.values()
+    elif isinstance(value, (list, tuple)):
+        try:
+            # Lists of strings, e.g. image URLs, are checked at C speed
+            "".join(value)
+            return False
+        except TypeError:
+            values = value
+    else:
+        return False
+
+    for item in values:
+        if type(item) not in SCALARS and _contains_non_finite(item):
+            return True
+    return False
+
+
+def _load_orjson():
+    import orjson
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(data):
+        return orjson.dumps(data, default=_encode_default, option=options)
+
+    # Integers over 64 bits raise JSONEncodeError, a TypeError
+    return JSONBackend("orjson", dumps, orjson.loads, encode_errors=(orjson.JSONEncodeError,))
+
+
+def _load_msgspec():
+    import msgspec
+
+    # Decimals are numbers, like the DRF encoder renders them
+    encoder = msgspec.json.Encoder(enc_hook=_encode_default, decimal_format="number")
+    decoder = msgspec.json.Decoder()
+
+    return JSONBackend(
+        "msgspec",
+        encoder.encode,
+        decoder.decode,
+        (msgspec.DecodeError,),
+        (msgspec.EncodeError, OverflowError, TypeError),
+    )
+
+
+LOADERS = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "json": lambda: JSONBackend("json"),
+}
+
+
+def get_json_backend():
+    """
+    Get the JSON backend configured by the JSON_BACKEND setting.
+
+    Returns:
+        JSONBackend: The configured backend, or the stdlib one if it is not installed
+    """
+    return load_json_backend(settings.JSON_BACKEND)
+
+
+@lru_cache(maxsize=None)
+def load_json_backend(name):
+    """
+    Load a JSON backend by name.
+
+    Args:
+        name (str): "auto", "orjson", "msgspec" or "json"
+
+    Returns:
+        JSONBackend: The requested backend, or the stdlib one if it is not installed
+    """
+    for candidate in AUTO_BACKENDS if name == "auto" else (name,):
+        try:
+            return LOADERS[candidate]()
+        except ImportError:
+            continue
+
+    return LOADERS["json"]()
+
+
+def json_dumps(data):
+    """
+    Encode data exactly like the API renders it.
+
+    Args:
+        data: Data to encode
+
+    Returns:
+        bytes: Compact UTF-8 encoded JSON
+    """
+    return FastJSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer using orjson or msgspec when installed.
+
+    Compact, unindented output is byte-compatible with the DRF JSONRenderer,
+    except that floats below 1e-4 or from 1e16 use the library's exponent
+    notation (e.g. 1e16 instead of 1e+16), and that msgspec keeps the exponent
+    and trailing zeros of decimals. Indented output, non-default COMPACT_JSON or
+    UNICODE_JSON settings and data the library cannot encode, e.g. integers over
+    64 bits, fall back to the DRF renderer. Like the DRF renderer, NaN and
+    Infinity raise a ValueError.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        backend = get_json_backend()
+        if (
+            backend.is_stdlib
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = backend.dumps(data)
+        except backend.encode_errors:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Non-finite floats are rendered as null, only look for them when null was
+        if b"null" in ret and _contains_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser using orjson or msgspec when installed.
+
+    Like the DRF parser with STRICT_JSON, NaN and Infinity are rejected.
+    Non UTF-8 request bodies fall back to the DRF parser.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        backend = get_json_backend()
+        if backend.is_stdlib or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return backend.loads(stream.read())
+        except backend.decode_errors as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,148 @@
+"""Precomputed OpenAPI schema, generated at build time and served from memory."""
+
+import hashlib
+import os
+from functools import lru_cache
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import etag, require_safe
+
+# Schema formats along with their media types, YAML is the default like drf-spectacular's
+SCHEMA_FORMATS = {
+    "yaml": "application/vnd.oai.openapi",
+    "json": "application/vnd.oai.openapi+json",
+}
+
+
+# Packages whose version changes the generated schema
+SCHEMA_PACKAGES = ("django", "djangorestframework", "drf-spectacular")
+
+
+@lru_cache(maxsize=None)
+def get_code_hash():
+    """
+    Hash the code the schema is generated from.
+
+    Covers the source of the apps package and the versions of SCHEMA_PACKAGES,
+    so a schema file built from other code is never served.
+
+    Returns:
+        str: Short hex digest
+    """
+    digest = hashlib.sha256()
+    apps_dir = Path(settings.BASE_DIR) / "apps"
+    for path in sorted(apps_dir.rglob("*.py")):
+        digest.update(path.relative_to(apps_dir).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    for package in SCHEMA_PACKAGES:
+        digest.update(f"{package}=={package_version(package)}".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def get_schema_path(schema_format, version=None):
+    """
+    Get the path of the precomputed schema file of an API version and the current code.
+
+    Args:
+        schema_format (str): "yaml" or "json"
+        version (str): API version, defaults to the VERSION of SPECTACULAR_SETTINGS
+
+    Returns:
+        Path: Path of the schema file in OPENAPI_SCHEMA_DIR
+    """
+    version = version or settings.SPECTACULAR_SETTINGS["VERSION"]
+    return (
+        Path(settings.OPENAPI_SCHEMA_DIR) / f"openapi-{version}-{get_code_hash()}.{schema_format}"
+    )
+
+
+def generate_schema():
+    """
+    Generate the OpenAPI schema by introspecting every view and serializer.
+
+    Returns:
+        dict: Rendered schema bytes by format
+    """
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def write_schema():
+    """
+    Generate the OpenAPI schema and write it to OPENAPI_SCHEMA_DIR in every format.
+
+    Schema files built from other code are removed.
+
+    Returns:
+        list: Paths of the written files
+    """
+    paths = []
+    for schema_format, content in generate_schema().items():
+        path = get_schema_path(schema_format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Replace the file atomically, so running servers never read a partial schema
+        temporary_path = path.with_suffix(f"{path.suffix}.tmp")
+        temporary_path.write_bytes(content)
+        os.replace(temporary_path, path)
+        paths.append(path)
+
+        for stale_path in path.parent.glob(f"openapi-*.{schema_format}"):
+            if stale_path != path:
+                stale_path.unlink(missing_ok=True)
+    return paths
+
+
+@lru_cache(maxsize=None)
+def load_schema(schema_format):
+    """
+    Load the schema from its precomputed file, or generate it when there is none.
+
+    The result is kept in memory for the lifetime of the process.
+
+    Args:
+        schema_format (str): "yaml" or "json"
+
+    Returns:
+        tuple: Schema bytes and their ETag
+    """
+    try:
+        content = get_schema_path(schema_format).read_bytes()
+    except FileNotFoundError:
+        content = generate_schema()[schema_format]
+    return content, f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def get_schema_format(request):
+    """Select the schema format from the format parameter or the Accept header."""
+    schema_format = request.GET.get("format")
+    if schema_format in SCHEMA_FORMATS:
+        return schema_format
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_safe
+@etag(lambda request: load_schema(get_schema_format(request))[1])
+def schema_view(request):
+    """
+    Serve the precomputed OpenAPI schema.
+
+    Select JSON with ?format=json or an Accept header asking for JSON.
+    Clients revalidate with the ETag once the cache lifetime set by
+    OPENAPI_SCHEMA_MAX_AGE has passed.
+    """
+    schema_format = get_schema_format(request)
+    content, _ = load_schema(schema_format)
+
+    response = HttpResponse(content, content_type=SCHEMA_FORMATS[schema_format])
+    response["Cache-Control"] = f"public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}"
+    response["Vary"] = "Accept"
+    return response
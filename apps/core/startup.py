@@ -0,0 +1,15 @@
+"""Process startup helpers for application servers."""
+
+from django.urls import get_resolver
+
+
+def warm_up():
+    """
+    Import the modules of the request path before the first request.
+
+    Loading the URLconf imports every view along with its serializers and
+    renderers, so the first request of a worker does not pay for the imports.
+    Modules only some requests need, such as BeautifulSoup and the schema
+    views, are still imported on first use. Safe to call more than once.
+    """
+    get_resolver().url_patterns
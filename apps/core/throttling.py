@@ -0,0 +1,119 @@
+"""Per-client rate limiting of the API with sliding window counters."""
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+READ_SCOPE = "read"
+WRITE_SCOPE = "write"
+# Requests that fetch from upstream services are far more expensive than reads
+FETCH_SCOPE = "fetch"
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Limit the requests of every client to every endpoint with a sliding window counter.
+
+    The budget of a request is chosen by its scope: the throttle_scopes of the
+    view by action, else its throttle_scope, else read for safe methods and
+    write for the others. Rates are set by scope in DEFAULT_THROTTLE_RATES,
+    scopes without rate are not limited.
+
+    Instead of a list of timestamps per client, only a counter per fixed window
+    is kept and the previous window is weighted by how much of it still overlaps
+    the sliding window. Counters are incremented atomically in the cache set by
+    API_THROTTLE_CACHE, which must be shared by all processes (e.g. Redis or
+    Memcached) for the budgets to be shared as well.
+    """
+
+    cache_format = "throttle_%(scope)s_%(endpoint)s_%(ident)s"
+
+    def __init__(self):
+        # The scope depends on the request, the rate is looked up in allow_request()
+        self.wait_seconds = None
+
+    @property
+    def cache(self):
+        return caches[settings.API_THROTTLE_CACHE]
+
+    def get_scope(self, request, view):
+        """
+        Get the budget a request is counted against.
+
+        Args:
+            request (Request): Incoming request
+            view (APIView): View handling the request
+
+        Returns:
+            str: Throttle scope
+        """
+        scope = getattr(view, "throttle_scopes", {}).get(getattr(view, "action", None))
+        scope = scope or getattr(view, "throttle_scope", None)
+        return scope or (READ_SCOPE if request.method in SAFE_METHODS else WRITE_SCOPE)
+
+    def get_rate(self):
+        # Rates are read on every request, so they follow settings changes
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user{request.user.pk}"
+        else:
+            ident = self.get_ident(request)
+
+        match = request.resolver_match
+        endpoint = match.view_name if match else request.path
+        return self.cache_format % {"scope": self.scope, "endpoint": endpoint, "ident": ident}
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current_key = f"{self.key}_{int(window)}"
+        previous_key = f"{self.key}_{int(window) - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+
+        weight = 1 - elapsed / self.duration
+        if previous * weight + current >= self.num_requests:
+            self.wait_seconds = self.get_wait(current, previous, elapsed)
+            return False
+
+        # Counters outlive their window by one window, to weight the next one
+        if not self.cache.add(current_key, 1, self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, self.duration * 2)
+        return True
+
+    def get_wait(self, current, previous, elapsed):
+        """
+        Get the time until the sliding window admits a request again.
+
+        Args:
+            current (int): Requests counted in the current window
+            previous (int): Requests counted in the previous window
+            elapsed (float): Seconds elapsed in the current window
+
+        Returns:
+            float: Seconds to wait
+        """
+        if current < self.num_requests:
+            # The weight of the previous window has to drop below the remaining budget
+            return max(self.duration * (1 - (self.num_requests - current) / previous) - elapsed, 0)
+        # The current window becomes the previous one and has to be weighted down as well
+        next_window = self.duration - elapsed
+        return next_window + self.duration * (1 - self.num_requests / max(current, 1))
+
+    def wait(self):
+        return self.wait_seconds
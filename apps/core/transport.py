@@ -0,0 +1,278 @@
+"""Recording and replay of upstream HTTP responses, for running without the network."""
+
+import base64
+import gzip
+import io
+import json
+import random
+import threading
+import time
+from functools import cache
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# Headers kept in cassettes, bodies are stored decoded so encoding headers are dropped
+RECORDED_HEADERS = (
+    "Cache-Control",
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Location",
+    "Retry-After",
+)
+
+
+# Size of the chunks a recorded body is read in
+RECORD_CHUNK_SIZE = 64 * 1024
+
+
+class CassetteMissError(requests.ConnectionError):
+    """Raised when replaying a request that was never recorded."""
+
+
+class Cassette:
+    """
+    Recorded responses, stored as gzip-compressed JSON lines of one response each.
+
+    Responses to the same request are replayed in the order they were
+    recorded, the last one repeating once all were replayed.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the cassette.
+
+        Args:
+            path (Path): Cassette file, created on the first recording
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._interactions = {}
+        self._positions = {}
+        if self.path.exists():
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    interaction = json.loads(line)
+                    self._interactions.setdefault(interaction["request"], []).append(interaction)
+
+    @staticmethod
+    def get_key(request):
+        """Get the key responses to a prepared request are recorded under."""
+        return f"{request.method} {request.url}"
+
+    def play(self, request):
+        """
+        Get the next recorded response to a request.
+
+        Args:
+            request (PreparedRequest): Request sent
+
+        Returns:
+            dict: Recorded status, headers and body, None if the request was never recorded
+        """
+        key = self.get_key(request)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return interactions[min(position, len(interactions) - 1)]
+
+    def record(self, request, response, body):
+        """
+        Append a response to the cassette.
+
+        Args:
+            request (PreparedRequest): Request sent
+            response (requests.Response): Response received
+            body (bytes): Decoded body of the response
+        """
+        try:
+            content = {"text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            content = {"base64": base64.b64encode(body).decode("ascii")}
+        interaction = {
+            "request": self.get_key(request),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            **content,
+        }
+
+        with self._lock:
+            self._interactions.setdefault(interaction["request"], []).append(interaction)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Each append adds a gzip member, readers see them as a single stream
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    Transport adapter recording real responses to a cassette, or replaying them.
+
+    Redirects are recorded hop by hop, so replayed responses have the same
+    history. Replays can be slowed down by a fixed latency, and a fraction of
+    them can fail with a connection error or an error status instead.
+    """
+
+    def __init__(
+        self,
+        cassette,
+        mode,
+        latency=0,
+        error_rate=0,
+        error_status=None,
+        rng=None,
+        max_body_size=None,
+    ):
+        """
+        Initialize the adapter.
+
+        Args:
+            cassette (Cassette): Cassette recorded to or replayed from
+            mode (str): MODE_RECORD or MODE_REPLAY
+            latency (float): Seconds every replayed response is delayed by
+            error_rate (float): Fraction of replayed requests that fail
+            error_status (int): Status of the failed requests, None for connection errors
+            rng (random.Random): Generator sampling the failures, shared by the adapters
+                of a process so that a seeded run fails the same requests every time
+            max_body_size (int): Decoded size above which a body is neither read further
+                nor recorded, None for no limit
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.mode = mode
+        self.max_body_size = max_body_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = rng or random.Random()
+
+    def send(self, request, **kwargs):
+        if self.mode == MODE_RECORD:
+            response = super().send(request, **kwargs)
+            body = self.read_body(response)
+            if body is not None:
+                self.cassette.record(request, response, body)
+            return response
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            if self.error_status is None:
+                raise requests.ConnectionError("Injected connection error", request=request)
+            return self.build_cassette_response(
+                request, {"status": self.error_status, "reason": "Injected error", "text": ""}
+            )
+
+        interaction = self.cassette.play(request)
+        if interaction is None:
+            raise CassetteMissError(
+                f"No recorded response for {Cassette.get_key(request)}", request=request
+            )
+        return self.build_cassette_response(request, interaction)
+
+    def read_body(self, response):
+        """
+        Read the body of a response to record it, stopping past max_body_size.
+
+        The body read is kept on the response, so the caller reads the same bytes
+        and rejects a body over the limit itself.
+
+        Args:
+            response (requests.Response): Response received
+
+        Returns:
+            bytes: Decoded body, None if it is larger than max_body_size
+        """
+        if self.max_body_size is None:
+            return response.content
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(RECORD_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.max_body_size:
+                break
+
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+        return response._content if size <= self.max_body_size else None
+
+    def build_cassette_response(self, request, interaction):
+        """Build a response to a request from a recorded interaction."""
+        if "base64" in interaction:
+            body = base64.b64decode(interaction["base64"])
+        else:
+            body = interaction["text"].encode("utf-8")
+
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers={**interaction.get("headers", {}), "Content-Length": str(len(body))},
+            status=interaction["status"],
+            reason=interaction.get("reason"),
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def cassette_enabled():
+    """Check whether upstream requests are recorded or replayed."""
+    return settings.UPSTREAM_CASSETTE["MODE"] in (MODE_RECORD, MODE_REPLAY)
+
+
+@cache
+def get_cassette(path):
+    """Get the cassette of a path, loaded once per process."""
+    return Cassette(path)
+
+
+@cache
+def get_error_random(seed):
+    """Get the generator sampling injected errors, one per seed and process."""
+    return random.Random(seed)
+
+
+def mount_cassette(session, max_body_size=None):
+    """
+    Record or replay the requests of a session, as configured by UPSTREAM_CASSETTE.
+
+    Args:
+        session (requests.Session): Session of an upstream client
+        max_body_size (int): Decoded size above which response bodies are not recorded
+
+    Returns:
+        requests.Session: The session, unchanged when recording and replay are off
+    """
+    if not cassette_enabled():
+        return session
+
+    config = settings.UPSTREAM_CASSETTE
+    adapter = CassetteAdapter(
+        get_cassette(Path(config["PATH"])),
+        config["MODE"],
+        latency=config["LATENCY_MS"] / 1000,
+        error_rate=config["ERROR_RATE"],
+        error_status=config["ERROR_STATUS"],
+        rng=get_error_random(config["SEED"]),
+        max_body_size=max_body_size,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,32 @@
+"""Project-wide view helpers."""
+
+from functools import cache
+
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Wrap a class-based view so that its module is only imported on first request.
+
+    Keeps rarely used views with heavy dependencies, such as the schema
+    documentation, from being imported when the URLconf is loaded.
+
+    Args:
+        view_path (str): Dotted path of the view class
+        **initkwargs: Arguments passed to the as_view() method of the view class
+
+    Returns:
+        callable: View function
+    """
+
+    @cache
+    def load_view():
+        return import_string(view_path).as_view(**initkwargs)
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return load_view()(request, *args, **kwargs)
+
+    return view
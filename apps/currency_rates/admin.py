@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import EcbObservation
+
+
+@admin.register(EcbObservation)
+class EcbObservationAdmin(admin.ModelAdmin):
+    """Admin configuration for the EcbObservation model."""
+
+    list_display = ("period", "frequency", "eur_to_gbp", "created_at")
+    list_filter = ("frequency",)
+    search_fields = ("period",)
+    readonly_fields = ("created_at",)
@@ -0,0 +1,203 @@
+"""Batch lookup of EUR to GBP rates for many dates and periods with few ECB requests."""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils import timezone
+
+from .clients import EcbApiClient
+from .models import EcbObservation
+from .periods import (
+    DAILY,
+    MONTHLY,
+    is_target_business_day,
+    previous_target_business_day,
+    published_at,
+)
+
+
+class ObservationCache:
+    """Bounded, thread-safe LRU cache of published observations by frequency and period."""
+
+    def __init__(self, max_entries):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of observations kept, 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get a cached observation, None if it is not cached."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        """Cache an observation, evicting the least recently used ones beyond the limit."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached observations."""
+        with self._lock:
+            self._entries.clear()
+
+
+observation_cache = ObservationCache(settings.CURRENCY_RATES_OBSERVATION_CACHE_SIZE)
+
+
+def resolve_observation(frequency, day, now):
+    """
+    Get the observation a date or month is answered with.
+
+    A date is answered with the reference rate of the last TARGET business day
+    on or before it, a month with its average.
+
+    Args:
+        frequency (str): MONTHLY or DAILY
+        day (date): Requested date, or the first day of the requested month
+        now (datetime): Current time
+
+    Returns:
+        date: Day identifying the observation, None if it is not published yet
+    """
+    if frequency == DAILY and not is_target_business_day(day):
+        day = previous_target_business_day(day)
+    return day if published_at(frequency, day) <= now else None
+
+
+def group_ranges(days, max_gap):
+    """
+    Group sorted days into ranges, so that each range can be fetched in one request.
+
+    Args:
+        days (list): Sorted days
+        max_gap (int): Largest gap in days within a range, None for a single range
+
+    Returns:
+        list: First and last day of every range
+    """
+    ranges = []
+    for day in days:
+        if ranges and (max_gap is None or (day - ranges[-1][1]).days <= max_gap):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [tuple(day_range) for day_range in ranges]
+
+
+def format_period(frequency, day):
+    """Format an observation day as the ECB names its period."""
+    return day.strftime("%Y-%m") if frequency == MONTHLY else day.isoformat()
+
+
+def get_eur_to_gbp_rates(dates=(), months=(), now=None, client=None):
+    """
+    Get the EUR to GBP conversion rates of many dates and months at once.
+
+    Observations are looked up in the in-memory LRU cache, then in the database,
+    and the missing ones are fetched with one ECB request per frequency, split
+    only where requested dates are more than CURRENCY_RATES_BATCH_MAX_GAP_DAYS
+    apart. Published observations never change, so fetched ones are stored.
+
+    Args:
+        dates (iterable): Dates answered with daily reference rates
+        months (iterable): First days of months answered with monthly averages
+        now (datetime): Current time, defaults to now
+        client (EcbApiClient): ECB client, defaults to a new one
+
+    Returns:
+        dict: Results in request order and the number of ECB requests made
+    """
+    now = now or timezone.now()
+    requested = [(DAILY, day) for day in dates] + [(MONTHLY, day) for day in months]
+    observations = {
+        (frequency, day): resolve_observation(frequency, day, now) for frequency, day in requested
+    }
+    needed = {
+        (frequency, observation)
+        for (frequency, _), observation in observations.items()
+        if observation is not None
+    }
+
+    rates = _load_rates({(frequency, format_period(frequency, day)) for frequency, day in needed})
+
+    client = client or EcbApiClient()
+    upstream_requests = 0
+    max_gaps = {DAILY: settings.CURRENCY_RATES_BATCH_MAX_GAP_DAYS, MONTHLY: None}
+    for frequency, max_gap in max_gaps.items():
+        missing = sorted(
+            day
+            for needed_frequency, day in needed
+            if needed_frequency == frequency
+            and (frequency, format_period(frequency, day)) not in rates
+        )
+        for start, end in group_ranges(missing, max_gap):
+            upstream_requests += 1
+            series = client.get_eur_to_gbp_series(
+                frequency, format_period(frequency, start), format_period(frequency, end)
+            )
+            if series:
+                rates.update(_store_rates(frequency, series))
+
+    results = []
+    for frequency, day in requested:
+        observation = observations[(frequency, day)]
+        period = format_period(frequency, observation) if observation else None
+        results.append(
+            {
+                ("date" if frequency == DAILY else "month"): format_period(frequency, day),
+                "observation": period,
+                "eur_to_gbp": rates.get((frequency, period)),
+            }
+        )
+    return {"results": results, "upstream_requests": upstream_requests}
+
+
+def _load_rates(keys):
+    """Look up observations in the LRU cache, then in the database."""
+    rates = {}
+    for key in keys:
+        rate = observation_cache.get(key)
+        if rate is not None:
+            rates[key] = rate
+
+    for frequency in (DAILY, MONTHLY):
+        periods = [
+            period for key_frequency, period in keys - rates.keys() if key_frequency == frequency
+        ]
+        if not periods:
+            continue
+        stored = EcbObservation.objects.filter(frequency=frequency, period__in=periods)
+        for period, rate in stored.values_list("period", "eur_to_gbp"):
+            rates[(frequency, period)] = rate
+            observation_cache.set((frequency, period), rate)
+    return rates
+
+
+def _store_rates(frequency, series):
+    """Store fetched observations in the database and the LRU cache."""
+    EcbObservation.objects.bulk_create(
+        [
+            EcbObservation(frequency=frequency, period=period, eur_to_gbp=rate)
+            for period, rate in series.items()
+        ],
+        ignore_conflicts=True,
+    )
+    rates = {}
+    for period, rate in series.items():
+        rates[(frequency, period)] = rate
+        observation_cache.set((frequency, period), rate)
+    return rates
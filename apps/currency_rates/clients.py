@@ -6,6 +6,10 @@ import requests
 from django.core.cache import cache
 from requests.exceptions import RequestException
 
+from apps.core.transport import mount_cassette
+
+from .periods import MONTHLY, resolve_latest, resolve_range
+
 
 class BaseApiClient:
     """Base class for API clients."""
@@ -20,7 +24,8 @@ class BaseApiClient:
             timeout (int): Request timeout in seconds
         """
         self.timeout = timeout
-        self.session = requests.Session()
+        # Responses are recorded or replayed when UPSTREAM_CASSETTE is enabled
+        self.session = mount_cassette(requests.Session())
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -91,11 +96,17 @@ class EcbApiClient(BaseApiClient):
 
     BASE_URL = "https://data-api.ecb.europa.eu/service/data"
 
-    def get_eur_to_gbp_rate(self, date_range=None):
+    def get_eur_to_gbp_rate(self, date_range=None, frequency=MONTHLY):
         """
-        Get the monthly EUR to GBP conversion rate from the ECB API.
+        Get the EUR to GBP conversion rate from the ECB API.
+
+        Without a date range, this fetches the latest published rate. The request is
+        resolved to the ECB publication period it depends on, so the rate is cached
+        until the next observation of that period is published.
 
-        This fetches the exchange rate for the last month.
+        Args:
+            date_range (dict): Optional 'start_date' and 'end_date' in YYYY-MM-DD format
+            frequency (str): "M" for monthly averages, "D" for daily reference rates
 
         Returns:
             float: EUR to GBP conversion rate
@@ -104,27 +115,21 @@ class EcbApiClient(BaseApiClient):
         try:
             # Construct the API URL
             # EXR = Exchange Rate dataset
-            # M = Monthly frequency
+            # M = Monthly frequency, D = Daily frequency
             # GBP.EUR = Currency pair (GBP against EUR)
             # SP00 = Spot rate
             # A = Average
-            endpoint = "EXR/M.GBP.EUR.SP00.A"
+            endpoint = f"EXR/{frequency}.GBP.EUR.SP00.A"
 
+            period = self._resolve_period(date_range, frequency)
             params = {
                 "format": "jsondata",
                 "detail": "dataonly",
+                "startPeriod": period.start_period,
+                "endPeriod": period.end_period,
             }
 
-            if date_range is not None:
-                params = params | {
-                    "startPeriod": date_range.get("start_date"),
-                    "endPeriod": date_range.get("end_date"),
-                }
-            else:
-                date_range = {}
-
-            today = datetime.date.today().strftime("%Y-%m-%d")
-            cache_key = f"ecb_eur_gbp_rate_{date_range.get('start_date', today)}_{date_range.get('end_date', today)}"
+            cache_key = f"ecb_eur_gbp_rate_{period.cache_key}"
             eur_to_gbp_rate = cache.get(cache_key)
             if eur_to_gbp_rate is not None:
                 return eur_to_gbp_rate
@@ -143,7 +148,8 @@ class EcbApiClient(BaseApiClient):
                 # The rate is GBP to EUR, so we need to take the reciprocal to get EUR to GBP
                 gbp_to_eur_rate = float(observations["0"][0])
                 eur_to_gbp_rate = 1 / gbp_to_eur_rate
-                cache.set(cache_key, eur_to_gbp_rate, 3600 * 24)  # caching result for 24 hours
+                # Cache the rate until the period gets a new observation
+                cache.set(cache_key, eur_to_gbp_rate, period.timeout())
 
                 return eur_to_gbp_rate
 
@@ -151,3 +157,55 @@ class EcbApiClient(BaseApiClient):
         except (KeyError, ValueError, ZeroDivisionError) as e:
             print(f"Error extracting EUR to GBP rate: {e}")
             return None
+
+    def _resolve_period(self, date_range, frequency):
+        """Resolve the requested date range, or the latest rate, to an ECB period."""
+
+        if not date_range or not date_range.get("start_date"):
+            return resolve_latest(frequency)
+
+        start = datetime.date.fromisoformat(date_range["start_date"])
+        end = datetime.date.fromisoformat(date_range.get("end_date") or date_range["start_date"])
+        return resolve_range(frequency, start, end)
+
+    def get_eur_to_gbp_series(self, frequency, start_period, end_period):
+        """
+        Get every EUR to GBP conversion rate of a range from the ECB API in one request.
+
+        Args:
+            frequency (str): "M" for monthly averages, "D" for daily reference rates
+            start_period (str): First period, YYYY-MM for monthly or YYYY-MM-DD for daily
+            end_period (str): Last period, in the same format
+
+        Returns:
+            dict: EUR to GBP conversion rates by period, periods without observation are absent
+            None: If there was an error
+        """
+        data = self._make_request(
+            f"EXR/{frequency}.GBP.EUR.SP00.A",
+            params={
+                "format": "jsondata",
+                "detail": "dataonly",
+                "startPeriod": start_period,
+                "endPeriod": end_period,
+            },
+        )
+        if data is None:
+            return None
+
+        try:
+            # Observations are keyed by their index in the values of the time dimension
+            dimensions = data.get("structure", {}).get("dimensions", {}).get("observation", [])
+            if not dimensions:
+                return {}
+            periods = [value["id"] for value in dimensions[0]["values"]]
+            series = next(iter(data.get("dataSets", [{}])[0].get("series", {}).values()), {})
+
+            return {
+                periods[int(index)]: 1 / float(values[0])
+                for index, values in series.get("observations", {}).items()
+                if values and values[0] is not None
+            }
+        except (IndexError, KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            print(f"Error extracting EUR to GBP rates: {e}")
+            return None
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="EcbObservation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("frequency", models.CharField(max_length=1)),
+                ("period", models.CharField(max_length=10)),
+                ("eur_to_gbp", models.FloatField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "ECB Observation",
+                "verbose_name_plural": "ECB Observations",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("frequency", "period"), name="unique_ecb_observation_period"
+                    )
+                ],
+            },
+        ),
+    ]
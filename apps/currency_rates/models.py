@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class EcbObservation(models.Model):
+    """Model to store published ECB EUR to GBP observations, which never change."""
+
+    frequency = models.CharField(max_length=1)
+    period = models.CharField(max_length=10)
+    eur_to_gbp = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["frequency", "period"], name="unique_ecb_observation_period"
+            )
+        ]
+        verbose_name = "ECB Observation"
+        verbose_name_plural = "ECB Observations"
+
+    def __str__(self):
+        return f"{self.frequency} {self.period}"
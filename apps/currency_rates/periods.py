@@ -0,0 +1,236 @@
+"""Resolution of requests to the ECB publication periods they depend on."""
+
+import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+
+# Euro reference rates are published around 16:00 CET on TARGET business days
+ECB_TIMEZONE = ZoneInfo("Europe/Berlin")
+PUBLICATION_TIME = datetime.time(16, 0)
+
+MONTHLY = "M"
+DAILY = "D"
+
+# Published observations are final, they are only re-fetched after this many seconds
+FINAL_TIMEOUT = 30 * 24 * 3600
+
+# Cached values expiring sooner than this are kept for this many seconds instead
+MIN_TIMEOUT = 60
+
+
+@dataclass(frozen=True)
+class EcbPeriod:
+    """A range of ECB observations along with the time its cached value may change."""
+
+    frequency: str
+    start: datetime.date
+    end: datetime.date
+    # None when every observation of the period has been published
+    expires_at: datetime.datetime = None
+
+    @property
+    def start_period(self):
+        """Start of the period in the format of the ECB startPeriod parameter."""
+        return self._format(self.start)
+
+    @property
+    def end_period(self):
+        """End of the period in the format of the ECB endPeriod parameter."""
+        return self._format(self.end)
+
+    @property
+    def cache_key(self):
+        """Key identifying the observations of the period."""
+        return f"{self.frequency}_{self.start_period}_{self.end_period}"
+
+    def timeout(self, now=None):
+        """
+        Get the number of seconds a value of the period can be cached.
+
+        Args:
+            now (datetime): Current time, defaults to now
+
+        Returns:
+            int: Seconds until the next observation of the period is published
+        """
+        if self.expires_at is None:
+            return FINAL_TIMEOUT
+
+        now = now or timezone.now()
+        return max(int((self.expires_at - now).total_seconds()), MIN_TIMEOUT)
+
+    def _format(self, day):
+        return day.strftime("%Y-%m") if self.frequency == MONTHLY else day.isoformat()
+
+
+def easter_sunday(year):
+    """
+    Get the date of Easter Sunday in the Gregorian calendar.
+
+    Args:
+        year (int): Year
+
+    Returns:
+        date: Easter Sunday of the year
+    """
+    # Anonymous Gregorian algorithm (Meeus/Jones/Butcher)
+    golden = year % 19
+    century, year_of_century = divmod(year, 100)
+    leap_centuries, century_rest = divmod(century, 4)
+    moon_correction = (century - (century + 8) // 25 + 1) // 3
+    epact = (19 * golden + century - leap_centuries - moon_correction + 15) % 30
+    leap_years, year_rest = divmod(year_of_century, 4)
+    weekday = (32 + 2 * century_rest + 2 * leap_years - epact - year_rest) % 7
+    correction = (golden + 11 * epact + 22 * weekday) // 451
+    month, day = divmod(epact + weekday - 7 * correction + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+@lru_cache(maxsize=None)
+def target_holidays(year):
+    """
+    Get the TARGET closing days of a year, on which no reference rates are published.
+
+    Args:
+        year (int): Year
+
+    Returns:
+        frozenset: New Year's Day, Good Friday, Easter Monday, Labour Day and Christmas
+    """
+    easter = easter_sunday(year)
+    return frozenset(
+        {
+            datetime.date(year, 1, 1),
+            easter - datetime.timedelta(days=2),
+            easter + datetime.timedelta(days=1),
+            datetime.date(year, 5, 1),
+            datetime.date(year, 12, 25),
+            datetime.date(year, 12, 26),
+        }
+    )
+
+
+def is_target_business_day(day):
+    """
+    Check whether reference rates are published on a day.
+
+    Args:
+        day (date): Day to check
+
+    Returns:
+        bool: True on weekdays other than TARGET holidays
+    """
+    return day.weekday() < 5 and day not in target_holidays(day.year)
+
+
+def next_target_business_day(day):
+    """Get the first TARGET business day after a day."""
+    day += datetime.timedelta(days=1)
+    while not is_target_business_day(day):
+        day += datetime.timedelta(days=1)
+    return day
+
+
+def previous_target_business_day(day):
+    """Get the last TARGET business day before a day."""
+    day -= datetime.timedelta(days=1)
+    while not is_target_business_day(day):
+        day -= datetime.timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=256)
+def month_range(year, month):
+    """
+    Get the first and last day of a month.
+
+    Args:
+        year (int): Year
+        month (int): Month, 1 to 12
+
+    Returns:
+        tuple: First and last day of the month as dates
+    """
+    first_day = datetime.date(year, month, 1)
+    next_month = (first_day + datetime.timedelta(days=31)).replace(day=1)
+    return first_day, next_month - datetime.timedelta(days=1)
+
+
+def published_at(frequency, day):
+    """
+    Get the time the observation covering a day is published.
+
+    Daily observations are published on their own day, monthly averages on the
+    first TARGET business day after the end of the month.
+
+    Args:
+        frequency (str): MONTHLY or DAILY
+        day (date): Day covered by the observation
+
+    Returns:
+        datetime: Aware publication time
+    """
+    if frequency == MONTHLY:
+        day = next_target_business_day(month_range(day.year, day.month)[1])
+    elif not is_target_business_day(day):
+        day = next_target_business_day(day)
+    return datetime.datetime.combine(day, PUBLICATION_TIME, tzinfo=ECB_TIMEZONE)
+
+
+def resolve_latest(frequency, now=None):
+    """
+    Resolve a request for the latest rate to the last published observation.
+
+    Args:
+        frequency (str): MONTHLY or DAILY
+        now (datetime): Current time, defaults to now
+
+    Returns:
+        EcbPeriod: The last published observation, expiring when the next one is published
+    """
+    now = now or timezone.now()
+    today = now.astimezone(ECB_TIMEZONE).date()
+
+    if frequency == MONTHLY:
+        last_day = today.replace(day=1) - datetime.timedelta(days=1)
+        if published_at(MONTHLY, last_day) > now:
+            last_day = last_day.replace(day=1) - datetime.timedelta(days=1)
+        start, end = month_range(last_day.year, last_day.month)
+        next_day = end + datetime.timedelta(days=1)
+    else:
+        start = end = today
+        if not is_target_business_day(end) or published_at(DAILY, end) > now:
+            start = end = previous_target_business_day(end)
+        next_day = next_target_business_day(end)
+
+    return EcbPeriod(frequency, start, end, published_at(frequency, next_day))
+
+
+def resolve_range(frequency, start, end, now=None):
+    """
+    Resolve a request for a date range to the observations covering it.
+
+    Monthly ranges are widened to whole months, so every date range within the
+    same months shares one period.
+
+    Args:
+        frequency (str): MONTHLY or DAILY
+        start (date): First day of the range
+        end (date): Last day of the range
+        now (datetime): Current time, defaults to now
+
+    Returns:
+        EcbPeriod: The observations covering the range, final once all are published
+    """
+    now = now or timezone.now()
+    if frequency == MONTHLY:
+        start = month_range(start.year, start.month)[0]
+        end = month_range(end.year, end.month)[1]
+
+    # A range ending after the latest publication gains observations at the next one
+    latest = resolve_latest(frequency, now)
+    expires_at = latest.expires_at if end > latest.end else None
+    return EcbPeriod(frequency, start, end, expires_at)
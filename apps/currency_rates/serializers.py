@@ -0,0 +1,45 @@
+import datetime
+
+from django.conf import settings
+from rest_framework import serializers
+
+
+class MonthField(serializers.Field):
+    """Field for a month in YYYY-MM format, represented by its first day."""
+
+    default_error_messages = {"invalid": "Month has wrong format. Use YYYY-MM."}
+
+    def to_internal_value(self, data):
+        try:
+            return datetime.datetime.strptime(str(data), "%Y-%m").date()
+        except ValueError:
+            self.fail("invalid")
+
+    def to_representation(self, value):
+        return value.strftime("%Y-%m")
+
+
+class CurrencyRatesBatchValidator(serializers.Serializer):
+    """Serializer for validating the dates and months of a batch rates request."""
+
+    dates = serializers.ListField(
+        child=serializers.DateField(),
+        required=False,
+        help_text="Dates answered with the ECB reference rate of that day (YYYY-MM-DD)",
+    )
+    months = serializers.ListField(
+        child=MonthField(),
+        required=False,
+        help_text="Months answered with the ECB monthly average rate (YYYY-MM)",
+    )
+
+    def validate(self, attrs):
+        """Validate that dates or months are given, and not more than the configured maximum."""
+        count = len(attrs.get("dates", [])) + len(attrs.get("months", []))
+        if not count:
+            raise serializers.ValidationError("At least one of dates or months is required.")
+        if count > settings.CURRENCY_RATES_BATCH_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"At most {settings.CURRENCY_RATES_BATCH_MAX_ITEMS} dates and months are allowed."
+            )
+        return attrs
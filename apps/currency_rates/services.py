@@ -3,6 +3,7 @@
 import datetime
 
 from .clients import BlockchainApiClient, EcbApiClient
+from .periods import month_range
 
 
 def get_bitcoin_price_eur():
@@ -21,20 +22,20 @@ def get_bitcoin_price_eur():
 
 def get_last_month_date_range():
     """
+    Get the date range of the previous calendar month.
+
     Returns:
         dict: A dictionary with 'start_date' and 'end_date' keys as strings in YYYY-MM-DD format
     """
     today = datetime.date.today()
-    # Get the first day of the current month
-    first_day_current_month = today.replace(day=1)
     # Get the last day of the previous month
-    last_day_previous_month = first_day_current_month - datetime.timedelta(days=1)
-    # Get the first day of the previous month
-    first_day_previous_month = last_day_previous_month.replace(day=1)
+    last_day_previous_month = today.replace(day=1) - datetime.timedelta(days=1)
+    # The first and last day of each month are only computed once
+    first_day, last_day = month_range(last_day_previous_month.year, last_day_previous_month.month)
 
     return {
-        "start_date": first_day_previous_month.strftime("%Y-%m-%d"),
-        "end_date": last_day_previous_month.strftime("%Y-%m-%d"),
+        "start_date": first_day.strftime("%Y-%m-%d"),
+        "end_date": last_day.strftime("%Y-%m-%d"),
     }
 
 
@@ -0,0 +1,117 @@
+"""Pre-rendered response of the latest currency rates."""
+
+import datetime
+import hashlib
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.renderers import json_dumps
+
+from .periods import MIN_TIMEOUT, MONTHLY, resolve_latest
+from .services import get_currency_rates
+
+SNAPSHOT_CACHE_KEY = "currency_rates_snapshot"
+
+# Snapshot of this process, replaced as a whole so readers never see a partial one
+_current = None
+_refresh_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RatesSnapshot:
+    """Rendered currency rates along with their validators and expiry."""
+
+    body: bytes
+    etag: str
+    last_modified: datetime.datetime
+    expires_at: datetime.datetime
+
+    def max_age(self, now=None):
+        """Get the seconds the snapshot may still be cached for."""
+        return max(int((self.expires_at - (now or timezone.now())).total_seconds()), 0)
+
+
+def build_snapshot(rates, previous=None, now=None):
+    """
+    Render currency rates into a snapshot.
+
+    The snapshot expires after CURRENCY_RATES_SNAPSHOT_TTL, the delay of the
+    Bitcoin ticker, or when the next monthly ECB rate is published if that is
+    sooner. Missing rates are retried after a minute.
+
+    Args:
+        rates (dict): Currency rates, as returned by get_currency_rates()
+        previous (RatesSnapshot): Snapshot replaced, whose validators are kept if
+            the rates did not change
+        now (datetime): Current time, defaults to now
+
+    Returns:
+        RatesSnapshot: The new snapshot
+    """
+    now = now or timezone.now()
+    body = json_dumps(rates)
+
+    if previous and previous.body == body:
+        etag, last_modified = previous.etag, previous.last_modified
+    else:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        # HTTP dates have a resolution of one second
+        last_modified = now.replace(microsecond=0)
+
+    timeout = settings.CURRENCY_RATES_SNAPSHOT_TTL
+    if None in rates.values():
+        timeout = MIN_TIMEOUT
+    timeout = min(timeout, resolve_latest(MONTHLY, now).timeout(now))
+
+    return RatesSnapshot(body, etag, last_modified, now + datetime.timedelta(seconds=timeout))
+
+
+def get_rates_snapshot(now=None):
+    """
+    Get the snapshot of the latest currency rates, refreshing it when it expired.
+
+    The snapshot is shared by the processes through the cache. Only one thread
+    per process refreshes an expired snapshot, the others keep serving the
+    expired one meanwhile instead of waiting for the upstream services.
+
+    Args:
+        now (datetime): Current time, defaults to now
+
+    Returns:
+        RatesSnapshot: The current snapshot
+    """
+    global _current
+
+    now = now or timezone.now()
+    snapshot = _current
+    if snapshot and snapshot.expires_at > now:
+        return snapshot
+
+    if not _refresh_lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        # Another thread or process may have refreshed it meanwhile
+        shared = cache.get(SNAPSHOT_CACHE_KEY)
+        for candidate in (_current, shared):
+            if candidate and candidate.expires_at > now:
+                _current = candidate
+                return candidate
+
+        snapshot = build_snapshot(get_currency_rates(), previous=shared or _current, now=now)
+        cache.set(SNAPSHOT_CACHE_KEY, snapshot, snapshot.max_age(now))
+        _current = snapshot
+        return snapshot
+    finally:
+        _refresh_lock.release()
+
+
+def clear_rates_snapshot():
+    """Forget the snapshot, so that the next request renders the rates again."""
+    global _current
+
+    _current = None
+    cache.delete(SNAPSHOT_CACHE_KEY)
@@ -1,7 +1,10 @@
 from django.urls import re_path
 
-from .views import CurrencyRatesView
+from .views import CurrencyRatesBatchView, CurrencyRatesView
 
 urlpatterns = [
+    re_path(
+        r"^currency-rates/batch/?$", CurrencyRatesBatchView.as_view(), name="currency-rates-batch"
+    ),
     re_path(r"^currency-rates/?$", CurrencyRatesView.as_view(), name="currency-rates"),
 ]
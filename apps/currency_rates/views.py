@@ -1,8 +1,16 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from drf_spectacular.utils import extend_schema
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .services import get_currency_rates
+from apps.core.throttling import FETCH_SCOPE
+
+from .batch import get_eur_to_gbp_rates
+from .serializers import CurrencyRatesBatchValidator
+from .snapshot import get_rates_snapshot
 
 
 class CurrencyRatesView(APIView):
@@ -13,6 +21,9 @@ class CurrencyRatesView(APIView):
     1. Bitcoin price in EUR (15min delayed)
     2. EUR to GBP conversion rate (monthly average from ECB)
     3. Bitcoin price in GBP (calculated using the above rates)
+
+    The rates are rendered once into a snapshot that is served as-is, with
+    validators and cache headers, until the ticker delay has passed.
     """
 
     @extend_schema(
@@ -45,9 +56,84 @@ class CurrencyRatesView(APIView):
             - bitcoin_eur: The 15min delayed Bitcoin market price in EUR
             - eur_to_gbp: Monthly conversion rate from EUR to GBP from the European Central Bank
             - bitcoin_gbp: The price from bitcoin_eur converted to GBP using the official ECB rate
+
+        Responds with 304 Not Modified to requests whose If-None-Match or
+        If-Modified-Since header matches the current snapshot.
+        """
+        snapshot = get_rates_snapshot()
+        last_modified = int(snapshot.last_modified.timestamp())
+
+        response = get_conditional_response(
+            request, etag=snapshot.etag, last_modified=last_modified
+        ) or HttpResponse(snapshot.body, content_type="application/json")
+        response["ETag"] = snapshot.etag
+        response["Last-Modified"] = http_date(last_modified)
+        # Shared caches may keep the response until the snapshot expires
+        response["Cache-Control"] = f"public, max-age={snapshot.max_age()}"
+        return response
+
+
+class CurrencyRatesBatchView(APIView):
+    """
+    API view for retrieving EUR to GBP conversion rates of many dates and months at once.
+
+    Observations are memoized in memory and in the database, so a request for
+    hundreds of dates costs at most a few ECB requests.
+    """
+
+    throttle_scope = FETCH_SCOPE
+
+    @extend_schema(
+        description="Get EUR to GBP conversion rates of many dates and months",
+        request=CurrencyRatesBatchValidator,
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "date": {"type": "string", "format": "date"},
+                                "month": {"type": "string"},
+                                "observation": {
+                                    "type": "string",
+                                    "nullable": True,
+                                    "description": "ECB period the rate was observed in",
+                                },
+                                "eur_to_gbp": {"type": "number", "nullable": True},
+                            },
+                        },
+                    },
+                    "upstream_requests": {
+                        "type": "integer",
+                        "description": "Number of requests made to the ECB",
+                    },
+                },
+            }
+        },
+    )
+    def post(self, request):
+        """
+        Get EUR to GBP conversion rates of many dates and months.
+
+        Parameters:
+        - dates: Dates answered with the reference rate of the last TARGET business day
+          on or before them
+        - months: Months answered with their average rate
+
+        Returns:
+        - 200 OK: With the rates in request order, null where not published yet
+        - 400 Bad Request: If no or too many dates and months are given
         """
-        # Get all currency rates
-        rates = get_currency_rates()
+        params = CurrencyRatesBatchValidator(data=request.data)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Return the data
-        return Response(rates)
+        return Response(
+            get_eur_to_gbp_rates(
+                dates=params.validated_data.get("dates", []),
+                months=params.validated_data.get("months", []),
+            )
+        )
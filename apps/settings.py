@@ -1,3 +1,4 @@
+import importlib.util
 import os
 from pathlib import Path
 
@@ -16,7 +17,12 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "unique-cache-name",
-    }
+    },
+    # Rate limiting counters, point it to a cache shared by all processes in production
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    },
 }
 
 # Application definition
@@ -33,10 +39,14 @@ INSTALLED_APPS = [
     # Local apps
     "apps.website_info",
     "apps.currency_rates",
+    "apps.core",
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.AdmissionControlMiddleware",
+    "apps.core.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -69,7 +79,7 @@ WSGI_APPLICATION = "apps.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("DATABASE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
@@ -99,6 +109,14 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# The collected static files are served by WhiteNoise when it is installed, as in the
+# production image, since gunicorn does not serve them
+if importlib.util.find_spec("whitenoise"):
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+        "whitenoise.middleware.WhiteNoiseMiddleware",
+    )
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -107,11 +125,140 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.core.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_THROTTLE_CLASSES": [
+        "apps.core.throttling.SlidingWindowRateThrottle",
+    ],
+    # Requests per client and endpoint, fetch is the budget of requests fetching upstream
+    "DEFAULT_THROTTLE_RATES": {
+        "read": os.environ.get("API_THROTTLE_READ_RATE", "600/min"),
+        "write": os.environ.get("API_THROTTLE_WRITE_RATE", "60/min"),
+        "fetch": os.environ.get("API_THROTTLE_FETCH_RATE", "30/min"),
+    },
+    # Number of reverse proxies in front of the API, whose X-Forwarded-For entries are trusted
+    "NUM_PROXIES": int(os.environ.get("API_NUM_PROXIES", "0")),
+}
+
+# JSON library used by the API renderer and parser: "auto" picks orjson or msgspec
+# when installed and falls back to the stdlib json module
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "auto")
+
+# Responses smaller than this are not worth compressing (never less than 200 bytes)
+API_COMPRESSION_MIN_SIZE = int(os.environ.get("API_COMPRESSION_MIN_SIZE", "1024"))
+
+# Cache alias of the rate limiting counters
+API_THROTTLE_CACHE = os.environ.get("API_THROTTLE_CACHE", "throttle")
+
+# Requests handled at once by a process, beyond which requests are rejected with 503 (0 disables)
+API_MAX_IN_FLIGHT = int(os.environ.get("API_MAX_IN_FLIGHT", "32"))
+
+# Seconds clients are asked to wait in the Retry-After header of rejected requests
+API_RETRY_AFTER = int(os.environ.get("API_RETRY_AFTER", "5"))
+
+# Profiling of a random sample of requests, aggregated by the aggregate_profiles command
+API_PROFILING = {
+    # Fraction of requests profiled, 0 disables profiling
+    "SAMPLE_RATE": float(os.environ.get("API_PROFILING_SAMPLE_RATE", "0")),
+    "DIR": Path(os.environ.get("API_PROFILING_DIR", BASE_DIR / "profiles")),
+    # Number of profiles kept, the oldest ones are removed first
+    "MAX_FILES": int(os.environ.get("API_PROFILING_MAX_FILES", "1000")),
+}
+
+# Recording and replay of the responses of upstream services, for running without the network
+UPSTREAM_CASSETTE = {
+    # "off", "record" to record real responses, or "replay" to answer from the recordings only
+    "MODE": os.environ.get("UPSTREAM_CASSETTE_MODE", "off"),
+    "PATH": Path(
+        os.environ.get("UPSTREAM_CASSETTE_PATH", BASE_DIR / "cassettes/upstream.jsonl.gz")
+    ),
+    # Delay added to every replayed response
+    "LATENCY_MS": float(os.environ.get("UPSTREAM_CASSETTE_LATENCY_MS", "0")),
+    # Fraction of replayed requests failing, with ERROR_STATUS or a connection error if unset
+    "ERROR_RATE": float(os.environ.get("UPSTREAM_CASSETTE_ERROR_RATE", "0")),
+    "ERROR_STATUS": (
+        int(os.environ["UPSTREAM_CASSETTE_ERROR_STATUS"])
+        if os.environ.get("UPSTREAM_CASSETTE_ERROR_STATUS")
+        else None
+    ),
+    # Seed of the failure sampling, so that runs fail the same requests
+    "SEED": os.environ.get("UPSTREAM_CASSETTE_SEED"),
 }
 
+# Website info settings
+WEBSITE_INFO_PAGE_CACHE = {
+    # Number of extraction results kept per process, 0 disables the cache
+    "MAX_ENTRIES": int(os.environ.get("WEBSITE_INFO_PAGE_CACHE_MAX_ENTRIES", "1024")),
+    # Upper bound for the estimated size of all cached results
+    "MAX_BYTES": int(os.environ.get("WEBSITE_INFO_PAGE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+}
+
+# Archive of fetched page bodies, so that stored websites can be extracted again
+# with the reextract_websites command without fetching them again
+WEBSITE_INFO_BODY_ARCHIVE = {
+    "ENABLED": bool(int(os.environ.get("WEBSITE_INFO_BODY_ARCHIVE", "0"))),
+    "DIR": Path(os.environ.get("WEBSITE_INFO_BODY_ARCHIVE_DIR", BASE_DIR / "archive")),
+}
+
+# Fetched pages whose decoded body is larger than this are rejected
+WEBSITE_INFO_MAX_PAGE_SIZE = int(
+    os.environ.get("WEBSITE_INFO_MAX_PAGE_SIZE", str(10 * 1024 * 1024))
+)
+
+# Number of rows fetched from the database at a time by streaming exports
+WEBSITE_INFO_EXPORT_CHUNK_SIZE = int(os.environ.get("WEBSITE_INFO_EXPORT_CHUNK_SIZE", "2000"))
+
+# Failed fetches are not retried before a backoff that doubles with every consecutive
+# failure of the URL, or of its domain when the server is unreachable. BASE 0 disables it.
+WEBSITE_INFO_FAILURE_BACKOFF = {
+    "BASE": int(os.environ.get("WEBSITE_INFO_FAILURE_BACKOFF_BASE", "60")),
+    "MAX": int(os.environ.get("WEBSITE_INFO_FAILURE_BACKOFF_MAX", str(24 * 3600))),
+}
+
+# Number of websites deleted per transaction by bulk deletes and the retention command
+WEBSITE_INFO_DELETE_CHUNK_SIZE = int(os.environ.get("WEBSITE_INFO_DELETE_CHUNK_SIZE", "500"))
+
+# Websites created more than this many days ago are purged by purge_websites, 0 keeps them
+WEBSITE_INFO_RETENTION_DAYS = int(os.environ.get("WEBSITE_INFO_RETENTION_DAYS", "0"))
+
+WEBSITE_INFO_JSON_COMPRESSION = {
+    # Store JSON values of at least this many bytes compressed, 0 disables compression
+    "MIN_SIZE": int(os.environ.get("WEBSITE_INFO_JSON_COMPRESSION_MIN_SIZE", "0")),
+    "LEVEL": int(os.environ.get("WEBSITE_INFO_JSON_COMPRESSION_LEVEL", "6")),
+}
+
+# Currency rates settings
+# Seconds the latest rates are served from a snapshot, the delay of the Bitcoin ticker
+CURRENCY_RATES_SNAPSHOT_TTL = int(os.environ.get("CURRENCY_RATES_SNAPSHOT_TTL", "900"))
+
+# Number of ECB observations kept in memory per process by the batch rates endpoint
+CURRENCY_RATES_OBSERVATION_CACHE_SIZE = int(
+    os.environ.get("CURRENCY_RATES_OBSERVATION_CACHE_SIZE", "10000")
+)
+
+# Maximum number of dates and months in one batch rates request
+CURRENCY_RATES_BATCH_MAX_ITEMS = int(os.environ.get("CURRENCY_RATES_BATCH_MAX_ITEMS", "1000"))
+
+# Requested dates further apart than this are fetched from the ECB in separate ranges
+CURRENCY_RATES_BATCH_MAX_GAP_DAYS = int(os.environ.get("CURRENCY_RATES_BATCH_MAX_GAP_DAYS", "366"))
+
+# Directory of the OpenAPI schema files written by the build_openapi_schema command,
+# the schema is generated on the first request when there is no file for the current VERSION
+OPENAPI_SCHEMA_DIR = os.environ.get("OPENAPI_SCHEMA_DIR", BASE_DIR / "openapi")
+
+# Seconds clients may cache the schema before revalidating it
+OPENAPI_SCHEMA_MAX_AGE = int(os.environ.get("OPENAPI_SCHEMA_MAX_AGE", "86400"))
+
 # drf-spectacular settings
 SPECTACULAR_SETTINGS = {
     "TITLE": "Market Info API",
@@ -1,6 +1,16 @@
 from django.contrib import admin
+from django.db import transaction
 
-from .models import WebsiteInfo
+from .models import DomainStats, FetchFailure, WebsiteAlias, WebsiteInfo
+from .rollups import record_websites_created, record_websites_deleted, refresh_domain_stats
+
+
+class WebsiteAliasInline(admin.TabularInline):
+    """Inline admin configuration for the WebsiteAlias model."""
+
+    model = WebsiteAlias
+    extra = 0
+    readonly_fields = ("created_at",)
 
 
 @admin.register(WebsiteInfo)
@@ -9,10 +19,69 @@ class WebsiteInfoAdmin(admin.ModelAdmin):
 
     list_display = ("url", "domain_name", "protocol", "stylesheets_count", "created_at")
     list_filter = ("protocol", "created_at")
-    search_fields = ("url", "domain_name", "title")
+    search_fields = ("url", "final_url", "domain_name", "title")
     readonly_fields = ("created_at", "updated_at")
     fieldsets = (
         (None, {"fields": ("url", "domain_name", "protocol")}),
+        ("Redirects", {"fields": ("final_url", "redirect_chain")}),
         ("Content Information", {"fields": ("title", "images", "stylesheets_count")}),
         ("Metadata", {"fields": ("created_at", "updated_at")}),
     )
+    inlines = (WebsiteAliasInline,)
+
+    # The rollup is updated in the transaction of the row change, so a failed
+    # update leaves neither of them changed
+
+    def save_model(self, request, obj, form, change):
+        previous_domain = form.initial.get("domain_name") if change else None
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if change:
+                refresh_domain_stats({previous_domain, obj.domain_name} - {None})
+            else:
+                record_websites_created([obj])
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            record_websites_deleted([obj])
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            websites = list(queryset)
+            super().delete_queryset(request, queryset)
+            record_websites_deleted(websites)
+
+
+@admin.register(DomainStats)
+class DomainStatsAdmin(admin.ModelAdmin):
+    """Admin configuration for the DomainStats model."""
+
+    list_display = (
+        "domain_name",
+        "page_count",
+        "avg_stylesheets_count",
+        "images_total",
+        "latest_updated_at",
+    )
+    search_fields = ("domain_name",)
+    readonly_fields = list_display + ("stylesheets_total",)
+
+
+@admin.register(FetchFailure)
+class FetchFailureAdmin(admin.ModelAdmin):
+    """Admin configuration for the FetchFailure model."""
+
+    list_display = (
+        "key",
+        "scope",
+        "error_class",
+        "status_code",
+        "failure_count",
+        "blocked_count",
+        "last_failed_at",
+        "retry_at",
+    )
+    list_filter = ("scope", "error_class")
+    search_fields = ("key",)
+    readonly_fields = ("first_failed_at", "last_failed_at", "failure_count", "blocked_count")
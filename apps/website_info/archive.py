@@ -0,0 +1,85 @@
+"""Content-addressed archive of fetched page bodies, for extracting them again later."""
+
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+
+def get_archive_dir():
+    """Get the directory of the body archive."""
+    return Path(settings.WEBSITE_INFO_BODY_ARCHIVE["DIR"])
+
+
+def get_body_path(directory, sha256):
+    """
+    Get the path of an archived body.
+
+    Bodies are spread over 256 subdirectories by the first two characters
+    of their hash, so that no directory holds millions of files.
+
+    Args:
+        directory (Path): Directory of the archive
+        sha256 (str): Hex SHA-256 of the body
+
+    Returns:
+        Path: Path of the compressed body
+    """
+    return Path(directory) / sha256[:2] / f"{sha256}.gz"
+
+
+def archive_body(text):
+    """
+    Store a page body in the archive, if WEBSITE_INFO_BODY_ARCHIVE is enabled.
+
+    Identical bodies are only stored once.
+
+    Args:
+        text (str): Decoded page body
+
+    Returns:
+        str: Hex SHA-256 of the body, None if the archive is disabled
+    """
+    if not settings.WEBSITE_INFO_BODY_ARCHIVE["ENABLED"]:
+        return None
+
+    body = text.encode("utf-8")
+    sha256 = hashlib.sha256(body).hexdigest()
+    path = get_body_path(get_archive_dir(), sha256)
+    if path.exists():
+        return sha256
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written aside under a unique name and renamed, so that readers never see
+    # a partial body and concurrent writers of the same body do not collide
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=f".{sha256}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(gzip.compress(body, compresslevel=6))
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    return sha256
+
+
+def read_body(directory, sha256):
+    """
+    Read an archived page body.
+
+    Args:
+        directory (Path): Directory of the archive
+        sha256 (str): Hex SHA-256 of the body
+
+    Returns:
+        str: Decoded page body, None if it is not archived
+    """
+    try:
+        return gzip.decompress(get_body_path(directory, sha256).read_bytes()).decode("utf-8")
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,128 @@
+"""Content-addressed cache for website extraction results."""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class PageCache:
+    """
+    Size-bounded LRU cache for page extraction results.
+
+    Entries are keyed by a hash of the fetched body only, so byte-identical
+    pages served from different URLs (redirect variants, query-string
+    variants, mirrors) are only parsed once. Cached results must therefore
+    not depend on the URL the body was fetched from.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024):
+        """
+        Initialize the page cache.
+
+        Args:
+            max_entries (int): Maximum number of cached results, 0 disables the cache
+            max_bytes (int): Maximum estimated size of all cached results in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(body):
+        """
+        Build the cache key for a page body.
+
+        Args:
+            body (bytes): Raw page body
+
+        Returns:
+            str: Hex digest identifying the body
+        """
+        return hashlib.sha256(body).hexdigest()
+
+    def get_or_parse(self, body, parse):
+        """
+        Return the cached result for a body or parse and cache it.
+
+        Args:
+            body (str): Page body
+            parse (callable): Function called without arguments on a miss
+
+        Returns:
+            dict: Extraction result, safe for the caller to modify
+        """
+        if not self.max_entries:
+            return parse()
+
+        raw_body = body.encode("utf-8") if isinstance(body, str) else body
+        key = self.make_key(raw_body)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.bytes_saved += len(raw_body)
+                return copy.deepcopy(entry[0])
+            self.misses += 1
+
+        result = parse()
+        self._store(key, copy.deepcopy(result))
+        return result
+
+    def _store(self, key, result):
+        """Store a result and evict the least recently used entries over the limits."""
+        size = len(repr(result))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+
+            self._entries[key] = (result, size)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.bytes_saved = 0
+
+    def stats(self):
+        """
+        Get cache usage statistics.
+
+        Returns:
+            dict: Entry count, size, hit ratio and bytes of HTML not reparsed
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes_saved": self.bytes_saved,
+            }
@@ -0,0 +1,76 @@
+"""Streaming exports of stored website information."""
+
+import csv
+import json
+
+from rest_framework import serializers
+
+from apps.core.renderers import json_dumps
+
+EXPORT_FIELDS = (
+    "id",
+    "url",
+    "final_url",
+    "redirect_chain",
+    "domain_name",
+    "protocol",
+    "title",
+    "images",
+    "stylesheets_count",
+    "created_at",
+    "updated_at",
+)
+
+DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+class Echo:
+    """File-like object returning what is written, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def _iter_rows(queryset, chunk_size):
+    """Yield rows as dicts with datetimes formatted like the API serializer."""
+    datetime_field = serializers.DateTimeField()
+    for row in queryset.values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        for name in DATETIME_FIELDS:
+            row[name] = datetime_field.to_representation(row[name])
+        yield row
+
+
+def iter_ndjson(queryset, chunk_size=2000):
+    """
+    Stream a queryset as newline-delimited JSON.
+
+    Args:
+        queryset (QuerySet): WebsiteInfo rows to export
+        chunk_size (int): Number of rows fetched from the database at a time
+
+    Yields:
+        bytes: One JSON document per row
+    """
+    for row in _iter_rows(queryset, chunk_size):
+        yield json_dumps(row) + b"\n"
+
+
+def iter_csv(queryset, chunk_size=2000):
+    """
+    Stream a queryset as CSV with a header row.
+
+    List fields are written as JSON arrays.
+
+    Args:
+        queryset (QuerySet): WebsiteInfo rows to export
+        chunk_size (int): Number of rows fetched from the database at a time
+
+    Yields:
+        str: One CSV line per row
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _iter_rows(queryset, chunk_size):
+        row["images"] = json.dumps(row["images"])
+        row["redirect_chain"] = json.dumps(row["redirect_chain"])
+        yield writer.writerow([row[name] for name in EXPORT_FIELDS])
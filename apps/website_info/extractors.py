@@ -0,0 +1,88 @@
+"""Helpers for extracting information from fetched website pages."""
+
+from functools import partial
+
+from django.conf import settings
+
+from .cache import PageCache
+from .resolvers import ImageUrlResolver, find_image_references
+
+page_cache = PageCache(
+    max_entries=settings.WEBSITE_INFO_PAGE_CACHE["MAX_ENTRIES"],
+    max_bytes=settings.WEBSITE_INFO_PAGE_CACHE["MAX_BYTES"],
+)
+
+
+def extract_page_info(html, url):
+    """
+    Extract page information, reusing the parse of identical page bodies.
+
+    Args:
+        html (str): Page body
+        url (str): URL the page was fetched from
+
+    Returns:
+        dict: Title, image URLs and stylesheets count of the page
+    """
+    # Only the URL-independent parse is cached, image references are resolved
+    # against the URL of every request
+    structure = page_cache.get_or_parse(html, partial(parse_page_structure, html))
+    return resolve_page_info(structure, url)
+
+
+def parse_page_info(html, url):
+    """
+    Parse a page body and extract its information.
+
+    Args:
+        html (str): Page body
+        url (str): URL the page was fetched from
+
+    Returns:
+        dict: Title, image URLs and stylesheets count of the page
+    """
+    return resolve_page_info(parse_page_structure(html), url)
+
+
+def parse_page_structure(html):
+    """
+    Parse the parts of a page body that do not depend on its URL.
+
+    Args:
+        html (str): Page body
+
+    Returns:
+        dict: Title, stylesheets count, <base href> and unresolved image references
+    """
+    # Imported on first use, so workers that never parse a page do not load it
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    base_href, image_refs = find_image_references(soup)
+
+    return {
+        "title": soup.title.text.strip() if soup.title else None,
+        "stylesheets_count": len(soup.find_all("link", rel="stylesheet")),
+        "base_href": base_href,
+        "image_refs": image_refs,
+    }
+
+
+def resolve_page_info(structure, url):
+    """
+    Resolve a parsed page structure against the URL it was fetched from.
+
+    Args:
+        structure (dict): Result of parse_page_structure
+        url (str): URL the page was fetched from
+
+    Returns:
+        dict: Title, image URLs and stylesheets count of the page
+    """
+    return {
+        "title": structure["title"],
+        "images": ImageUrlResolver(url).resolve_all(
+            structure["image_refs"], structure["base_href"]
+        ),
+        "stylesheets_count": structure["stylesheets_count"],
+    }
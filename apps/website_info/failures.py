@@ -0,0 +1,185 @@
+"""Memory of failed fetches, so unreachable websites are not fetched again right away."""
+
+import datetime
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import FetchFailure
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Failures to reach the server at all block every URL of its domain
+DOMAIN_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+MAX_MESSAGE_LENGTH = 1000
+
+
+def normalize_url(url):
+    """
+    Normalize a URL, so that spellings of the same URL share one failure record.
+
+    Args:
+        url (str): URL to normalize
+
+    Returns:
+        str: URL with a lowercase scheme and host, without default port and fragment
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def get_domain(url):
+    """Get the lowercase host of a URL."""
+    return (urlsplit(url.strip()).hostname or "").lower()
+
+
+def get_backoff(failure_count):
+    """
+    Get the time to wait before fetching again after consecutive failures.
+
+    Args:
+        failure_count (int): Number of consecutive failures
+
+    Returns:
+        timedelta: Backoff doubling with every failure, up to the configured maximum
+    """
+    base = settings.WEBSITE_INFO_FAILURE_BACKOFF["BASE"]
+    seconds = min(base * 2 ** (failure_count - 1), settings.WEBSITE_INFO_FAILURE_BACKOFF["MAX"])
+    return datetime.timedelta(seconds=seconds)
+
+
+def get_retry_after(exc):
+    """
+    Get the delay requested by the Retry-After header of a failed response, if any.
+
+    Args:
+        exc (requests.RequestException): Error raised by the fetch
+
+    Returns:
+        timedelta: Requested delay, up to the maximum backoff, None without a valid header
+    """
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    # isdigit() also accepts non-ASCII digits, which int() rejects
+    if not (retry_after.isascii() and retry_after.isdigit()):
+        return None
+    seconds = min(int(retry_after), settings.WEBSITE_INFO_FAILURE_BACKOFF["MAX"])
+    return datetime.timedelta(seconds=seconds)
+
+
+def find_active_failure(url, now=None):
+    """
+    Find a failure of a URL or of its domain whose backoff has not expired yet.
+
+    Counts the fetch it avoids, for the statistics.
+
+    Args:
+        url (str): Submitted URL
+        now (datetime): Current time, defaults to now
+
+    Returns:
+        FetchFailure: The failure retried last, None if the URL can be fetched
+    """
+    if not settings.WEBSITE_INFO_FAILURE_BACKOFF["BASE"]:
+        return None
+
+    failure = (
+        FetchFailure.objects.filter(
+            Q(scope=FetchFailure.SCOPE_URL, key=normalize_url(url))
+            | Q(scope=FetchFailure.SCOPE_DOMAIN, key=get_domain(url)),
+            retry_at__gt=now or timezone.now(),
+        )
+        .order_by("-retry_at")
+        .first()
+    )
+    if failure:
+        FetchFailure.objects.filter(pk=failure.pk).update(blocked_count=F("blocked_count") + 1)
+    return failure
+
+
+def record_failure(url, exc, now=None):
+    """
+    Remember a failed fetch of a URL, and of its whole domain if the server was unreachable.
+
+    Args:
+        url (str): Submitted URL
+        exc (requests.RequestException): Error raised by the fetch
+        now (datetime): Time of the attempt, defaults to now
+
+    Returns:
+        FetchFailure: The failure record of the URL
+    """
+    now = now or timezone.now()
+    response = getattr(exc, "response", None)
+    details = {
+        "error_class": type(exc).__name__,
+        "status_code": response.status_code if response is not None else None,
+        "message": str(exc)[:MAX_MESSAGE_LENGTH],
+    }
+
+    failure = _record(
+        FetchFailure.SCOPE_URL, normalize_url(url), details, get_retry_after(exc), now
+    )
+    if isinstance(exc, DOMAIN_ERRORS) and get_domain(url):
+        _record(FetchFailure.SCOPE_DOMAIN, get_domain(url), details, None, now)
+    return failure
+
+
+def _record(scope, key, details, retry_after, now):
+    """Count a failure of a URL or domain and push back its next retry."""
+    with transaction.atomic():
+        failure, _ = FetchFailure.objects.select_for_update().get_or_create(
+            scope=scope, key=key, defaults={"last_failed_at": now, "retry_at": now}
+        )
+        for field, value in details.items():
+            setattr(failure, field, value)
+        failure.failure_count += 1
+        failure.last_failed_at = now
+        # Servers asking to wait longer than the backoff with Retry-After are obeyed
+        backoff = get_backoff(failure.failure_count)
+        failure.retry_at = now + max(backoff, retry_after) if retry_after else now + backoff
+        failure.save()
+    return failure
+
+
+def clear_failures(url):
+    """
+    Forget the failures of a URL and its domain after a successful fetch.
+
+    Args:
+        url (str): Submitted URL
+    """
+    FetchFailure.objects.filter(
+        Q(scope=FetchFailure.SCOPE_URL, key=normalize_url(url))
+        | Q(scope=FetchFailure.SCOPE_DOMAIN, key=get_domain(url))
+    ).delete()
+
+
+def failure_stats(now=None):
+    """
+    Get statistics of the remembered failures.
+
+    Args:
+        now (datetime): Current time, defaults to now
+
+    Returns:
+        dict: Numbers of blocked URLs and domains, fetches avoided and active failures by error
+    """
+    active = FetchFailure.objects.filter(retry_at__gt=now or timezone.now())
+    by_scope = dict(active.order_by().values_list("scope").annotate(count=Count("id")))
+    by_error = active.order_by().values_list("error_class").annotate(count=Count("id"))
+    return {
+        "blocked_urls": by_scope.get(FetchFailure.SCOPE_URL, 0),
+        "blocked_domains": by_scope.get(FetchFailure.SCOPE_DOMAIN, 0),
+        "avoided_fetches": FetchFailure.objects.aggregate(total=Sum("blocked_count"))["total"] or 0,
+        "errors": dict(by_error.order_by("error_class")),
+    }
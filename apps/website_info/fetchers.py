@@ -0,0 +1,102 @@
+"""Fetching of website pages."""
+
+from dataclasses import dataclass, field
+
+import requests
+from django.conf import settings
+from urllib3.util.request import ACCEPT_ENCODING
+
+from apps.core.transport import cassette_enabled, mount_cassette
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    # gzip and deflate, plus br and zstd when brotli or zstandard are installed
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class PageTooLargeError(requests.RequestException):
+    """Raised when a decoded page body exceeds the configured size limit."""
+
+
+@dataclass
+class FetchedPage:
+    """A fetched page along with the redirects followed to reach it."""
+
+    url: str
+    final_url: str
+    text: str
+    redirect_chain: list = field(default_factory=list)
+    body_size: int = 0
+    transfer_size: int = 0
+
+
+def fetch_page(url, timeout=10):
+    """
+    Fetch a website page, following redirects.
+
+    The body is decoded while it is streamed, so a compressed response is
+    rejected as soon as its decoded size exceeds WEBSITE_INFO_MAX_PAGE_SIZE.
+
+    Args:
+        url (str): URL to fetch
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        FetchedPage: The page body, its final URL and the URLs that redirected to it
+
+    Raises:
+        requests.RequestException: If the page cannot be fetched or is too large
+    """
+    max_size = settings.WEBSITE_INFO_MAX_PAGE_SIZE
+    if cassette_enabled():
+        # Responses are recorded or replayed, bodies over the size limit are not recorded
+        with mount_cassette(requests.Session(), max_body_size=max_size) as session:
+            return _fetch(session.get, url, timeout, max_size)
+    return _fetch(requests.get, url, timeout, max_size)
+
+
+def _fetch(get, url, timeout, max_size):
+    """Fetch a page with the given get function, see fetch_page."""
+
+    with get(url, headers=HEADERS, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        body = _read_body(response, max_size)
+
+        return FetchedPage(
+            url=url,
+            final_url=response.url,
+            text=_decode_body(response, body),
+            redirect_chain=[redirect.url for redirect in response.history],
+            body_size=len(body),
+            transfer_size=response.raw.tell(),
+        )
+
+
+def _read_body(response, max_size):
+    """Read the decoded response body, enforcing the size limit."""
+
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise PageTooLargeError(
+                f"Page body exceeds {max_size} bytes", request=response.request, response=response
+            )
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+def _decode_body(response, body):
+    """Decode the response body the same way requests decodes Response.text."""
+
+    encoding = response.encoding or requests.compat.chardet.detect(body)["encoding"]
+    try:
+        return str(body, encoding or "utf-8", errors="replace")
+    except LookupError:
+        return str(body, "utf-8", errors="replace")
@@ -0,0 +1,48 @@
+"""Custom model fields for the website_info app."""
+
+import base64
+import json
+import zlib
+
+from django.conf import settings
+from django.db import models
+
+COMPRESSED_KEY = "$zlib"
+
+
+class CompressedJSONField(models.JSONField):
+    """
+    JSONField storing large values as zlib-compressed, base64-encoded JSON.
+
+    Values are compressed when their JSON encoding is at least
+    WEBSITE_INFO_JSON_COMPRESSION["MIN_SIZE"] bytes, 0 disables compression.
+    Compressed and plain values can be mixed in the same column, so the
+    setting can be toggled without migrating existing rows.
+
+    Compressed rows store an opaque object in the database, so JSON key and
+    index lookups and contains/contained_by filters no longer match them.
+    Only filter on this field with compression disabled.
+    """
+
+    def get_prep_value(self, value):
+        # Expressions, e.g. the Case of bulk_update(), prepare their own
+        # concrete values through this field
+        if hasattr(value, "resolve_expression"):
+            return value
+        value = super().get_prep_value(value)
+        min_size = settings.WEBSITE_INFO_JSON_COMPRESSION["MIN_SIZE"]
+        if not min_size or value is None:
+            return value
+
+        encoded = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(encoded) < min_size:
+            return value
+
+        compressed = zlib.compress(encoded, settings.WEBSITE_INFO_JSON_COMPRESSION["LEVEL"])
+        return {COMPRESSED_KEY: base64.b64encode(compressed).decode("ascii")}
+
+    def from_db_value(self, value, expression, connection):
+        value = super().from_db_value(value, expression, connection)
+        if isinstance(value, dict) and len(value) == 1 and COMPRESSED_KEY in value:
+            return json.loads(zlib.decompress(base64.b64decode(value[COMPRESSED_KEY])))
+        return value
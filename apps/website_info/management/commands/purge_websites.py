@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.website_info.models import WebsiteInfo
+from apps.website_info.retention import delete_websites
+
+
+class Command(BaseCommand):
+    """Delete stored websites older than the retention period, in short transactions."""
+
+    help = "Delete stored websites older than the retention period, in short transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.WEBSITE_INFO_RETENTION_DAYS,
+            help="Delete websites created more than this many days ago "
+            "(default: WEBSITE_INFO_RETENTION_DAYS)",
+        )
+        parser.add_argument("--domain", help="Only delete websites of this domain")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.WEBSITE_INFO_DELETE_CHUNK_SIZE,
+            help="Number of websites deleted per transaction",
+        )
+        parser.add_argument(
+            "--pause", type=float, default=0, help="Seconds to sleep between chunks"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count the websites that would be deleted"
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] <= 0 and not options["domain"]:
+            raise CommandError(
+                "No retention period is configured, pass --older-than-days or --domain"
+            )
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive")
+
+        queryset = WebsiteInfo.objects.all()
+        if options["older_than_days"] > 0:
+            cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+            queryset = queryset.filter(created_at__lt=cutoff)
+        if options["domain"]:
+            queryset = queryset.filter(domain_name=options["domain"])
+
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {queryset.count()} websites")
+            return
+
+        deleted = delete_websites(queryset, options["chunk_size"], options["pause"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} websites"))
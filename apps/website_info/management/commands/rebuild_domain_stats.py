@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.website_info.rollups import rebuild_domain_stats
+
+
+class Command(BaseCommand):
+    """Rebuild the per-domain statistics rollup from the stored websites."""
+
+    help = "Rebuild the per-domain statistics rollup from the stored websites"
+
+    def handle(self, *args, **options):
+        domain_count = rebuild_domain_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt statistics of {domain_count} domains"))
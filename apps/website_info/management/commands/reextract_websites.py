@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.website_info.archive import get_archive_dir
+from apps.website_info.models import WebsiteInfo
+from apps.website_info.reextraction import (
+    CheckpointMismatchError,
+    load_checkpoint,
+    reextract_websites,
+)
+
+
+class Command(BaseCommand):
+    """Extract stored websites again from their archived page bodies, resuming interrupted runs."""
+
+    help = (
+        "Extract stored websites again from their archived page bodies, "
+        "resuming interrupted runs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes extracting pages (default: number of CPUs)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Number of websites updated per transaction"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File the progress is saved to (default: reextract-checkpoint.json "
+            "in the body archive)",
+        )
+        parser.add_argument(
+            "--restart", action="store_true", help="Ignore the checkpoint of a previous run"
+        )
+        parser.add_argument("--domain", help="Only extract websites of this domain")
+
+    def handle(self, *args, **options):
+        if options["workers"] <= 0:
+            raise CommandError("--workers must be positive")
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be positive")
+
+        checkpoint = Path(options["checkpoint"] or get_archive_dir() / "reextract-checkpoint.json")
+        if options["restart"]:
+            checkpoint.unlink(missing_ok=True)
+        last_pk = load_checkpoint(checkpoint)["last_pk"]
+        if last_pk:
+            self.stdout.write(f"Resuming after website {last_pk}")
+
+        queryset = WebsiteInfo.objects.all()
+        if options["domain"]:
+            queryset = queryset.filter(domain_name=options["domain"])
+
+        def report(progress):
+            self.stdout.write(
+                f"Processed {progress['processed']} websites, updated {progress['updated']}"
+            )
+
+        run = partial(
+            reextract_websites,
+            queryset,
+            options["batch_size"],
+            checkpoint=checkpoint,
+            on_batch=report,
+        )
+        try:
+            if options["workers"] == 1:
+                progress = run()
+            else:
+                # Forked workers must not share the database connections of this process
+                connections.close_all()
+                with ProcessPoolExecutor(options["workers"], initializer=django.setup) as executor:
+                    progress = run(map_function=partial(executor.map, chunksize=16))
+        except CheckpointMismatchError as e:
+            raise CommandError(f"{e}, resume with the same options or pass --restart")
+
+        if progress["missing"]:
+            self.stderr.write(f"{progress['missing']} archived bodies are missing")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Extracted {progress['processed']} websites again, updated {progress['updated']}"
+            )
+        )
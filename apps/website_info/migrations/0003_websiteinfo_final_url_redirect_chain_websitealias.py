@@ -0,0 +1,49 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0002_alter_websiteinfo_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="websiteinfo",
+            name="final_url",
+            field=models.URLField(blank=True, db_index=True, max_length=2048, null=True),
+        ),
+        migrations.AddField(
+            model_name="websiteinfo",
+            name="redirect_chain",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name="WebsiteAlias",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("url", models.URLField(max_length=2048, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "website",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aliases",
+                        to="website_info.websiteinfo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Website Alias",
+                "verbose_name_plural": "Website Aliases",
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:35
+
+from django.db import migrations
+
+import apps.website_info.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0003_websiteinfo_final_url_redirect_chain_websitealias"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="websiteinfo",
+            name="images",
+            field=apps.website_info.fields.CompressedJSONField(default=list),
+        ),
+    ]
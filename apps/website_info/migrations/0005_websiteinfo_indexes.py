@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0004_alter_websiteinfo_images"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="websiteinfo",
+            index=models.Index(fields=["domain_name"], name="website_inf_domain__d26787_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="websiteinfo",
+            index=models.Index(fields=["created_at"], name="website_inf_created_334d5d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="websiteinfo",
+            index=models.Index(fields=["updated_at", "id"], name="website_inf_updated_e42b62_idx"),
+        ),
+    ]
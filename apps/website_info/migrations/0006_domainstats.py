@@ -0,0 +1,67 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:40
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def populate_domain_stats(apps, schema_editor):
+    WebsiteInfo = apps.get_model("website_info", "WebsiteInfo")
+    DomainStats = apps.get_model("website_info", "DomainStats")
+
+    images_totals = {}
+    for domain_name, images in WebsiteInfo.objects.values_list("domain_name", "images").iterator():
+        images_totals[domain_name] = images_totals.get(domain_name, 0) + len(images or [])
+
+    rows = (
+        WebsiteInfo.objects.order_by()
+        .values("domain_name")
+        .annotate(
+            page_count=Count("id"),
+            stylesheets_total=Sum("stylesheets_count"),
+            latest_updated_at=Max("updated_at"),
+        )
+    )
+    DomainStats.objects.bulk_create(
+        DomainStats(
+            domain_name=row["domain_name"],
+            page_count=row["page_count"],
+            stylesheets_total=row["stylesheets_total"] or 0,
+            avg_stylesheets_count=(row["stylesheets_total"] or 0) / row["page_count"],
+            images_total=images_totals.get(row["domain_name"], 0),
+            latest_updated_at=row["latest_updated_at"],
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0005_websiteinfo_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DomainStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("domain_name", models.CharField(max_length=255, unique=True)),
+                ("page_count", models.IntegerField(db_index=True, default=0)),
+                ("stylesheets_total", models.IntegerField(default=0)),
+                ("avg_stylesheets_count", models.FloatField(db_index=True, default=0)),
+                ("images_total", models.IntegerField(db_index=True, default=0)),
+                ("latest_updated_at", models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Domain Statistics",
+                "verbose_name_plural": "Domain Statistics",
+                "ordering": ["-page_count", "domain_name"],
+            },
+        ),
+        migrations.RunPython(populate_domain_stats, migrations.RunPython.noop),
+    ]
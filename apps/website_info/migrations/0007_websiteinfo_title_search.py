@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from apps.website_info.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0006_domainstats"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
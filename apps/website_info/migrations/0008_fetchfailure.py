@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0007_websiteinfo_title_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FetchFailure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(choices=[("url", "URL"), ("domain", "Domain")], max_length=10),
+                ),
+                ("key", models.CharField(max_length=2048)),
+                ("error_class", models.CharField(max_length=255)),
+                ("status_code", models.IntegerField(blank=True, null=True)),
+                ("message", models.TextField(blank=True)),
+                ("failure_count", models.IntegerField(default=0)),
+                ("blocked_count", models.IntegerField(default=0)),
+                ("first_failed_at", models.DateTimeField(auto_now_add=True)),
+                ("last_failed_at", models.DateTimeField()),
+                ("retry_at", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "Fetch Failure",
+                "verbose_name_plural": "Fetch Failures",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("scope", "key"), name="unique_fetch_failure_scope_key"
+                    )
+                ],
+            },
+        ),
+    ]
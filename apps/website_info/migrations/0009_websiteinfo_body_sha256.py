@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("website_info", "0008_fetchfailure"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="websiteinfo",
+            name="body_sha256",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -1,22 +1,96 @@
 from django.db import models
 
+from .fields import CompressedJSONField
+
 
 class WebsiteInfo(models.Model):
     """Model to store information about websites."""
 
     url = models.URLField(max_length=2048, unique=True)
+    final_url = models.URLField(max_length=2048, blank=True, null=True, db_index=True)
+    redirect_chain = models.JSONField(default=list, blank=True)
     domain_name = models.CharField(max_length=255)
     protocol = models.CharField(max_length=10)
     title = models.TextField(blank=True, null=True)
-    images = models.JSONField(default=list)
+    images = CompressedJSONField(default=list)
     stylesheets_count = models.IntegerField(default=0)
+    # SHA-256 of the page body in the body archive, if it was archived
+    body_sha256 = models.CharField(max_length=64, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["domain_name"]),
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["updated_at", "id"]),
+        ]
         verbose_name = "Website Information"
         verbose_name_plural = "Website Information"
 
     def __str__(self):
         return self.url
+
+
+class WebsiteAlias(models.Model):
+    """Model to store URLs known to redirect to a stored website."""
+
+    url = models.URLField(max_length=2048, unique=True)
+    website = models.ForeignKey(WebsiteInfo, on_delete=models.CASCADE, related_name="aliases")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Website Alias"
+        verbose_name_plural = "Website Aliases"
+
+    def __str__(self):
+        return self.url
+
+
+class DomainStats(models.Model):
+    """Model to store statistics aggregated over all stored pages of a domain."""
+
+    domain_name = models.CharField(max_length=255, unique=True)
+    page_count = models.IntegerField(default=0, db_index=True)
+    stylesheets_total = models.IntegerField(default=0)
+    avg_stylesheets_count = models.FloatField(default=0, db_index=True)
+    images_total = models.IntegerField(default=0, db_index=True)
+    latest_updated_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    class Meta:
+        ordering = ["-page_count", "domain_name"]
+        verbose_name = "Domain Statistics"
+        verbose_name_plural = "Domain Statistics"
+
+    def __str__(self):
+        return self.domain_name
+
+
+class FetchFailure(models.Model):
+    """Model to remember failed fetches of a URL or a whole domain until they are retried."""
+
+    SCOPE_URL = "url"
+    SCOPE_DOMAIN = "domain"
+    SCOPE_CHOICES = [(SCOPE_URL, "URL"), (SCOPE_DOMAIN, "Domain")]
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    key = models.CharField(max_length=2048)
+    error_class = models.CharField(max_length=255)
+    status_code = models.IntegerField(blank=True, null=True)
+    message = models.TextField(blank=True)
+    failure_count = models.IntegerField(default=0)
+    blocked_count = models.IntegerField(default=0)
+    first_failed_at = models.DateTimeField(auto_now_add=True)
+    last_failed_at = models.DateTimeField()
+    retry_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "key"], name="unique_fetch_failure_scope_key")
+        ]
+        verbose_name = "Fetch Failure"
+        verbose_name_plural = "Fetch Failures"
+
+    def __str__(self):
+        return f"{self.scope}: {self.key}"
@@ -0,0 +1,167 @@
+"""Extraction of stored websites again from their archived page bodies."""
+
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.db import transaction
+from django.utils import timezone
+
+from .archive import get_archive_dir, read_body
+from .extractors import parse_page_info
+from .models import WebsiteInfo
+from .rollups import record_websites_refreshed
+
+# Fields read for extracting a website again and for updating the domain statistics
+SELECTED_FIELDS = (
+    "id",
+    "url",
+    "final_url",
+    "domain_name",
+    "title",
+    "images",
+    "stylesheets_count",
+    "body_sha256",
+    "updated_at",
+)
+
+EXTRACTED_FIELDS = ("title", "images", "stylesheets_count")
+
+NO_PROGRESS = {"last_pk": 0, "processed": 0, "updated": 0, "missing": 0, "selection": None}
+
+
+class CheckpointMismatchError(ValueError):
+    """Raised when resuming from a checkpoint saved for other websites than selected."""
+
+
+def get_selection(queryset):
+    """Get a digest of the websites a queryset selects, saved with its checkpoint."""
+    return hashlib.sha256(str(queryset.query).encode("utf-8")).hexdigest()
+
+
+def reextract_page(task):
+    """
+    Extract the information of a page from its archived body.
+
+    Runs in worker processes, so it only reads the archive and never the database.
+
+    Args:
+        task (tuple): ID of the website, archive directory, SHA-256 of the body and page URL
+
+    Returns:
+        tuple: ID of the website and its extracted information, None if the body is missing
+    """
+    pk, directory, sha256, url = task
+    text = read_body(directory, sha256)
+    return pk, parse_page_info(text, url) if text is not None else None
+
+
+def load_checkpoint(path):
+    """
+    Load the progress of an interrupted run.
+
+    Args:
+        path (Path): Checkpoint file
+
+    Returns:
+        dict: Last processed website ID and counts, zero if there is no checkpoint
+    """
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return dict(NO_PROGRESS)
+
+
+def save_checkpoint(path, progress):
+    """Save the progress of a run, replacing the checkpoint file atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f".{path.name}.tmp")
+    temporary_path.write_text(json.dumps(progress))
+    os.replace(temporary_path, path)
+
+
+def reextract_websites(queryset, batch_size, map_function=map, checkpoint=None, on_batch=None):
+    """
+    Extract the information of archived websites again, in batches.
+
+    Websites are walked by primary key. Extraction runs through map_function,
+    e.g. the map of a process pool. Only websites whose information changed are
+    written, with one bulk update per batch, in the same transaction as their
+    domain statistics. After each batch the progress is saved to the checkpoint,
+    along with the selected websites, so an interrupted run of the same queryset
+    resumes after the last saved batch, and the checkpoint is removed once every
+    website was processed. Running again is harmless,
+    unchanged websites are not written.
+
+    Args:
+        queryset (QuerySet): Websites to extract again
+        batch_size (int): Number of websites per batch
+        map_function (callable): Function mapping reextract_page over the tasks of a batch
+        checkpoint (Path): Checkpoint file, None to always start from the first website
+        on_batch (callable): Called with the progress after each batch
+
+    Returns:
+        dict: Last processed website ID, and numbers of processed and updated websites
+            and of websites whose body is missing from the archive
+
+    Raises:
+        CheckpointMismatchError: If the checkpoint was saved for another queryset
+    """
+    progress = load_checkpoint(checkpoint) if checkpoint else dict(NO_PROGRESS)
+    queryset = queryset.exclude(body_sha256=None).order_by("pk").only(*SELECTED_FIELDS)
+
+    # Websites below the last ID of another selection were never processed
+    selection = get_selection(queryset)
+    if progress["last_pk"] and progress.get("selection") != selection:
+        raise CheckpointMismatchError(
+            f"Checkpoint {checkpoint} was saved for other websites than selected"
+        )
+    progress["selection"] = selection
+    directory = str(get_archive_dir())
+
+    while True:
+        websites = list(queryset.filter(pk__gt=progress["last_pk"])[:batch_size])
+        if not websites:
+            break
+
+        tasks = [
+            (website.pk, directory, website.body_sha256, website.final_url or website.url)
+            for website in websites
+        ]
+        results = dict(map_function(reextract_page, tasks))
+
+        now = timezone.now()
+        old_websites, new_websites = [], []
+        for website in websites:
+            info = results[website.pk]
+            if info is None:
+                progress["missing"] += 1
+                continue
+            if all(getattr(website, field) == info[field] for field in EXTRACTED_FIELDS):
+                continue
+
+            old_websites.append(copy.copy(website))
+            for field in EXTRACTED_FIELDS:
+                setattr(website, field, info[field])
+            # Updated rows are picked up by incremental exports
+            website.updated_at = now
+            new_websites.append(website)
+
+        with transaction.atomic():
+            WebsiteInfo.objects.bulk_update(new_websites, [*EXTRACTED_FIELDS, "updated_at"])
+            record_websites_refreshed(old_websites, new_websites)
+
+        progress["last_pk"] = websites[-1].pk
+        progress["processed"] += len(websites)
+        progress["updated"] += len(new_websites)
+        if checkpoint:
+            save_checkpoint(checkpoint, progress)
+        if on_batch:
+            on_batch(progress)
+
+    if checkpoint:
+        Path(checkpoint).unlink(missing_ok=True)
+    return progress
@@ -0,0 +1,183 @@
+"""Resolution of image references found in website pages."""
+
+from urllib.parse import urljoin
+
+# Attributes holding a single image reference, in order of preference
+SOURCE_ATTRIBUTES = ("src", "data-src", "data-lazy-src", "data-original")
+
+# Attributes holding a list of image candidates
+SRCSET_ATTRIBUTES = ("srcset", "data-srcset")
+
+
+def parse_srcset(srcset):
+    """
+    Split a srcset attribute into its candidate URLs.
+
+    Args:
+        srcset (str): Value of a srcset attribute, e.g. "a.png 1x, b.png 2x"
+
+    Returns:
+        list: Candidate URLs without their width or density descriptors
+    """
+    candidates = []
+    position = 0
+    length = len(srcset)
+
+    while position < length:
+        # Skip the whitespace and commas separating candidates
+        while position < length and (srcset[position].isspace() or srcset[position] == ","):
+            position += 1
+        if position >= length:
+            break
+
+        start = position
+        while position < length and not srcset[position].isspace():
+            position += 1
+        url = srcset[start:position]
+
+        if url.endswith(","):
+            url = url.rstrip(",")
+        else:
+            # Skip the descriptors up to the next candidate
+            comma = srcset.find(",", position)
+            position = length if comma == -1 else comma + 1
+
+        if url:
+            candidates.append(url)
+
+    return candidates
+
+
+class ImageUrlResolver:
+    """
+    Resolver turning the image references of a page into absolute URLs.
+
+    References are resolved with urljoin semantics against the page URL or its
+    <base href>. Resolved references are memoized, so repeated relative paths
+    are only joined once per page.
+    """
+
+    def __init__(self, page_url, max_data_uri_length=0):
+        """
+        Initialize the resolver.
+
+        Args:
+            page_url (str): URL the page was fetched from
+            max_data_uri_length (int): Longest data URI to keep, 0 skips all data URIs
+        """
+        self.page_url = page_url
+        self.base_url = page_url
+        self.max_data_uri_length = max_data_uri_length
+        self._resolved = {}
+
+    def set_base_href(self, href):
+        """
+        Use the href of a <base> element for resolving references.
+
+        Args:
+            href (str): Value of the href attribute, possibly relative to the page URL
+        """
+        self.base_url = urljoin(self.page_url, href.strip())
+        self._resolved.clear()
+
+    def resolve(self, reference):
+        """
+        Resolve a single image reference.
+
+        Args:
+            reference (str): Image reference as found in the page
+
+        Returns:
+            str: Absolute image URL
+            None: If the reference is empty, not an http(s) URL or a skipped data URI
+        """
+        try:
+            return self._resolved[reference]
+        except KeyError:
+            pass
+
+        url = reference.strip()
+        if not url:
+            resolved = None
+        elif url[:5].lower() == "data:":
+            resolved = url if len(url) <= self.max_data_uri_length else None
+        elif url.startswith(("http://", "https://")):
+            # Absolute URLs need no joining
+            resolved = url
+        else:
+            resolved = urljoin(self.base_url, url)
+            if not resolved.startswith(("http://", "https://")):
+                resolved = None
+
+        self._resolved[reference] = resolved
+        return resolved
+
+    def resolve_images(self, soup):
+        """
+        Resolve all images of a page.
+
+        Args:
+            soup (BeautifulSoup): Parsed page
+
+        Returns:
+            list: Unique absolute image URLs in document order
+        """
+        base_href, references = find_image_references(soup)
+        return self.resolve_all(references, base_href)
+
+    def resolve_all(self, references, base_href=None):
+        """
+        Resolve the image references of a page.
+
+        Args:
+            references (list): Image references in document order
+            base_href (str): Value of the <base href> of the page, if any
+
+        Returns:
+            list: Unique absolute image URLs in document order
+        """
+        if base_href:
+            self.set_base_href(base_href)
+
+        image_urls = {}
+        for reference in references:
+            url = self.resolve(reference)
+            if url:
+                image_urls[url] = None
+
+        return list(image_urls)
+
+
+def find_image_references(soup):
+    """
+    Collect the image references of a page in a single pass over the document.
+
+    Handles <base href>, the src, data-src and other lazy-loading attributes
+    of <img> elements and the srcset candidates of <img> and <source>
+    elements. The references are returned unresolved, so they do not depend
+    on the URL the page was fetched from.
+
+    Args:
+        soup (BeautifulSoup): Parsed page
+
+    Returns:
+        tuple: The <base href> of the page or None, and the non-empty image
+            references in document order
+    """
+    tags = soup.find_all(("base", "img", "source"))
+
+    # Only the first <base> element with an href applies to the document
+    base_href = next((tag["href"] for tag in tags if tag.name == "base" and tag.get("href")), None)
+
+    references = []
+    for tag in tags:
+        if tag.name == "base":
+            continue
+        if tag.name == "img":
+            references.extend(tag.get(name) for name in SOURCE_ATTRIBUTES)
+        for name in SRCSET_ATTRIBUTES:
+            srcset = tag.get(name)
+            if srcset:
+                references.extend(parse_srcset(srcset))
+
+    return base_href, [reference for reference in references if reference]
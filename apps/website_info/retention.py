@@ -0,0 +1,46 @@
+"""Chunked deletion of stored websites."""
+
+import time
+
+from django.db import transaction
+
+from .models import WebsiteInfo
+from .rollups import record_websites_deleted
+
+# Fields needed to update the per-domain statistics of deleted websites
+ROLLUP_FIELDS = ("id", "domain_name", "stylesheets_count", "images", "updated_at")
+
+
+def delete_websites(queryset, chunk_size, pause=0):
+    """
+    Delete websites in chunks of bounded size, each in its own short transaction.
+
+    Every chunk removes its websites from the per-domain statistics in the same
+    transaction, so readers never see statistics of deleted pages and no lock is
+    held for longer than one chunk.
+
+    Args:
+        queryset (QuerySet): WebsiteInfo rows to delete
+        chunk_size (int): Maximum number of websites deleted per transaction
+        pause (float): Seconds to sleep between chunks, to leave room for other writers
+
+    Returns:
+        int: Number of deleted websites
+    """
+    queryset = queryset.order_by("pk").only(*ROLLUP_FIELDS)
+    deleted = 0
+    last_pk = None
+    while True:
+        chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        with transaction.atomic():
+            websites = list(chunk_queryset[:chunk_size])
+            if not websites:
+                return deleted
+
+            WebsiteInfo.objects.filter(pk__in=[website.pk for website in websites]).delete()
+            record_websites_deleted(websites)
+
+        deleted += len(websites)
+        last_pk = websites[-1].pk
+        if pause and len(websites) == chunk_size:
+            time.sleep(pause)
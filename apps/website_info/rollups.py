@@ -0,0 +1,149 @@
+"""Maintenance of the per-domain statistics rollup."""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+
+from .models import DomainStats, WebsiteInfo
+
+
+def _group_by_domain(websites):
+    """Sum the page, stylesheet and image counts of websites per domain."""
+    totals = defaultdict(lambda: {"pages": 0, "stylesheets": 0, "images": 0, "latest": None})
+    for website in websites:
+        total = totals[website.domain_name]
+        total["pages"] += 1
+        total["stylesheets"] += website.stylesheets_count
+        total["images"] += len(website.images or [])
+        if website.updated_at and (total["latest"] is None or website.updated_at > total["latest"]):
+            total["latest"] = website.updated_at
+    return totals
+
+
+def _apply_delta(domain_name, pages, stylesheets, images, latest=None, recompute_latest=False):
+    """Add signed page, stylesheet and image counts to the statistics of a domain."""
+    with transaction.atomic():
+        stats, _ = DomainStats.objects.select_for_update().get_or_create(domain_name=domain_name)
+        stats.page_count += pages
+        if stats.page_count <= 0:
+            stats.delete()
+            return
+
+        stats.stylesheets_total += stylesheets
+        stats.images_total += images
+        stats.avg_stylesheets_count = stats.stylesheets_total / stats.page_count
+        if recompute_latest:
+            stats.latest_updated_at = WebsiteInfo.objects.filter(domain_name=domain_name).aggregate(
+                latest=Max("updated_at")
+            )["latest"]
+        elif latest and (stats.latest_updated_at is None or latest > stats.latest_updated_at):
+            stats.latest_updated_at = latest
+        stats.save()
+
+
+def record_websites_created(websites):
+    """
+    Add newly stored websites to the statistics of their domains.
+
+    Args:
+        websites (iterable): Created WebsiteInfo instances
+    """
+    for domain_name, total in _group_by_domain(websites).items():
+        _apply_delta(
+            domain_name, total["pages"], total["stylesheets"], total["images"], total["latest"]
+        )
+
+
+def record_websites_deleted(websites):
+    """
+    Remove deleted websites from the statistics of their domains.
+
+    Must be called after the rows have been deleted.
+
+    Args:
+        websites (iterable): Deleted WebsiteInfo instances
+    """
+    for domain_name, total in _group_by_domain(websites).items():
+        _apply_delta(
+            domain_name,
+            -total["pages"],
+            -total["stylesheets"],
+            -total["images"],
+            recompute_latest=True,
+        )
+
+
+def record_websites_refreshed(old_websites, new_websites):
+    """
+    Replace the counts of refreshed websites in the statistics of their domains.
+
+    Must be called after the refreshed rows have been saved.
+
+    Args:
+        old_websites (iterable): WebsiteInfo instances as they were before the refresh
+        new_websites (iterable): The same websites after the refresh
+    """
+    empty = {"pages": 0, "stylesheets": 0, "images": 0, "latest": None}
+    old_totals = _group_by_domain(old_websites)
+    new_totals = _group_by_domain(new_websites)
+    for domain_name in old_totals.keys() | new_totals.keys():
+        old = old_totals.get(domain_name, empty)
+        new = new_totals.get(domain_name, empty)
+        _apply_delta(
+            domain_name,
+            new["pages"] - old["pages"],
+            new["stylesheets"] - old["stylesheets"],
+            new["images"] - old["images"],
+            new["latest"],
+            # Pages moved to another domain may have held the latest update
+            recompute_latest=new["pages"] < old["pages"],
+        )
+
+
+def refresh_domain_stats(domain_names):
+    """
+    Recompute the statistics of the given domains from their stored pages.
+
+    Args:
+        domain_names (iterable): Domains to recompute
+    """
+    for domain_name in set(domain_names):
+        pages = WebsiteInfo.objects.filter(domain_name=domain_name).order_by()
+        stats = pages.aggregate(
+            page_count=Count("id"),
+            stylesheets_total=Sum("stylesheets_count"),
+            latest_updated_at=Max("updated_at"),
+        )
+        if not stats["page_count"]:
+            DomainStats.objects.filter(domain_name=domain_name).delete()
+            continue
+
+        # The length of the images JSON field cannot be computed portably in SQL
+        images_total = sum(len(images) for images in pages.values_list("images", flat=True))
+
+        DomainStats.objects.update_or_create(
+            domain_name=domain_name,
+            defaults={
+                "page_count": stats["page_count"],
+                "stylesheets_total": stats["stylesheets_total"] or 0,
+                "avg_stylesheets_count": (stats["stylesheets_total"] or 0) / stats["page_count"],
+                "images_total": images_total,
+                "latest_updated_at": stats["latest_updated_at"],
+            },
+        )
+
+
+def rebuild_domain_stats():
+    """
+    Rebuild the statistics of all domains from the stored pages.
+
+    Returns:
+        int: Number of domains in the rebuilt rollup
+    """
+    domain_names = set(
+        WebsiteInfo.objects.order_by().values_list("domain_name", flat=True).distinct()
+    )
+    DomainStats.objects.exclude(domain_name__in=domain_names).delete()
+    refresh_domain_stats(domain_names)
+    return len(domain_names)
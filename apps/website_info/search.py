@@ -0,0 +1,142 @@
+"""Full-text search over stored website titles."""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+TABLE = "website_info_websiteinfo"
+FTS_TABLE = "website_info_websiteinfo_fts"
+POSTGRES_INDEX = "website_info_websiteinfo_title_search"
+POSTGRES_VECTOR = "to_tsvector('simple'::regconfig, COALESCE(\"title\", ''))"
+
+# The SQLite index is an external-content FTS5 table kept in sync by triggers.
+# Migrations that rebuild the website table on SQLite drop its triggers and must
+# call install_search_index() again.
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title,
+        content='{TABLE}',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF title ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO {FTS_TABLE}(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# The expression index stays in sync with the table without triggers
+POSTGRES_INSTALL = [
+    f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON {TABLE} USING GIN ({POSTGRES_VECTOR})",
+]
+
+POSTGRES_UNINSTALL = [f"DROP INDEX IF EXISTS {POSTGRES_INDEX}"]
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def install_search_index(schema_editor):
+    """
+    Create the title search index for the database vendor, if it supports one.
+
+    Args:
+        schema_editor (BaseDatabaseSchemaEditor): Schema editor of a migration
+    """
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(schema_editor):
+    """
+    Drop the title search index.
+
+    Args:
+        schema_editor (BaseDatabaseSchemaEditor): Schema editor of a migration
+    """
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def search_websites(queryset, query):
+    """
+    Filter a WebsiteInfo queryset by a prefix search on titles, best matches first.
+
+    Every word of the query must match the start of a word in the title. SQLite
+    uses the FTS5 index ranked by BM25, PostgreSQL the tsvector index ranked by
+    ts_rank, other databases fall back to an unranked substring scan.
+
+    Args:
+        queryset (QuerySet): WebsiteInfo rows to search
+        query (str): Search text
+
+    Returns:
+        QuerySet: Matching rows annotated with search_rank, higher is better
+    """
+    terms = TERM_RE.findall(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        # Join the FTS table, so the planner starts from the MATCH and bm25() is
+        # computed once per matching row
+        match = " ".join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            select={"search_rank": f"-bm25({FTS_TABLE})"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {TABLE}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        ).order_by("-search_rank", "-created_at")
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return (
+            queryset.filter(
+                RawSQL(
+                    f"{POSTGRES_VECTOR} @@ to_tsquery('simple', %s)",
+                    [tsquery],
+                    output_field=BooleanField(),
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"ts_rank({POSTGRES_VECTOR}, to_tsquery('simple', %s))",
+                    [tsquery],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-search_rank", "-created_at")
+        )
+
+    for term in terms:
+        queryset = queryset.filter(title__icontains=term)
+    return queryset.annotate(search_rank=Value(0.0)).order_by("-created_at")
@@ -3,7 +3,7 @@ from urllib.parse import urlparse
 import validators
 from rest_framework import serializers
 
-from .models import WebsiteInfo
+from .models import DomainStats, WebsiteInfo
 
 
 class URLValidator(serializers.Serializer):
@@ -18,6 +18,43 @@ class URLValidator(serializers.Serializer):
         return value
 
 
+class WebsiteInfoExportValidator(serializers.Serializer):
+    """Serializer for validating the query parameters of a website information export."""
+
+    output = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    domain_name = serializers.CharField(max_length=255, required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    updated_since = serializers.DateTimeField(
+        required=False, help_text="Only export entries updated after this cursor"
+    )
+
+
+class WebsiteInfoBulkDeleteValidator(serializers.Serializer):
+    """Serializer for validating the selection of a bulk delete."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=1000,
+        help_text="Only delete entries with these IDs",
+    )
+    domain_name = serializers.CharField(
+        max_length=255, required=False, help_text="Only delete entries of this domain"
+    )
+    created_before = serializers.DateTimeField(
+        required=False, help_text="Only delete entries created before this time"
+    )
+
+    def validate(self, attrs):
+        """Validate that at least one filter is given, so the table is never wiped by accident."""
+        if not attrs:
+            raise serializers.ValidationError(
+                "At least one of ids, domain_name or created_before is required."
+            )
+        return attrs
+
+
 class WebsiteInfoSerializer(serializers.ModelSerializer):
     # Explicitly define images as a ListField to ensure proper OpenAPI schema
     images = serializers.ListField(
@@ -31,6 +68,8 @@ class WebsiteInfoSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "url",
+            "final_url",
+            "redirect_chain",
             "domain_name",
             "protocol",
             "title",
@@ -50,3 +89,16 @@ class WebsiteInfoSerializer(serializers.ModelSerializer):
         if not validators.url(value):
             raise serializers.ValidationError("Invalid URL format.")
         return value
+
+
+class DomainStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DomainStats
+        fields = [
+            "domain_name",
+            "page_count",
+            "avg_stylesheets_count",
+            "images_total",
+            "latest_updated_at",
+        ]
+        read_only_fields = fields
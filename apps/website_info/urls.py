@@ -1,6 +1,6 @@
 from django.urls import re_path
 
-from .views import WebsiteInfoView
+from .views import DomainStatsView, WebsiteInfoView
 
 urlpatterns = [
     # List and create
@@ -9,6 +9,26 @@ urlpatterns = [
         WebsiteInfoView.as_view({"get": "list", "post": "create"}),
         name="websiteinfo-list",
     ),
+    # Bulk delete
+    re_path(
+        r"^website-info/bulk-delete/?$",
+        WebsiteInfoView.as_view({"post": "bulk_delete"}),
+        name="websiteinfo-bulk-delete",
+    ),
+    # Per-domain statistics
+    re_path(r"^website-info/domains/?$", DomainStatsView.as_view(), name="websiteinfo-domains"),
+    # Streaming export
+    re_path(
+        r"^website-info/export/?$",
+        WebsiteInfoView.as_view({"get": "export"}),
+        name="websiteinfo-export",
+    ),
+    # Extraction statistics
+    re_path(
+        r"^website-info/stats/?$",
+        WebsiteInfoView.as_view({"get": "stats"}),
+        name="websiteinfo-stats",
+    ),
     # Retrieve, update, and destroy
     re_path(
         r"^website-info/(?P<pk>[^/.]+)/?$",
@@ -1,12 +1,33 @@
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
-from rest_framework import status, viewsets
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import filters, generics, serializers, status, viewsets
 from rest_framework.response import Response
 
-from .models import WebsiteInfo
-from .serializers import URLValidator, WebsiteInfoSerializer
+from apps.core.throttling import FETCH_SCOPE
+
+from .archive import archive_body
+from .exporters import iter_csv, iter_ndjson
+from .extractors import extract_page_info, page_cache
+from .failures import clear_failures, failure_stats, find_active_failure, record_failure
+from .fetchers import fetch_page
+from .models import DomainStats, WebsiteAlias, WebsiteInfo
+from .retention import delete_websites
+from .rollups import record_websites_created, record_websites_deleted
+from .search import search_websites
+from .serializers import (
+    DomainStatsSerializer,
+    URLValidator,
+    WebsiteInfoBulkDeleteValidator,
+    WebsiteInfoExportValidator,
+    WebsiteInfoSerializer,
+)
 
 
 class WebsiteInfoView(viewsets.ModelViewSet):
@@ -18,16 +39,35 @@ class WebsiteInfoView(viewsets.ModelViewSet):
     - Create new website information by providing a URL
     - Retrieve specific website information by ID
     - Delete specific website information by ID
+    - Delete website information in bulk by IDs, domain or creation time
     """
 
     queryset = WebsiteInfo.objects.all()
     serializer_class = WebsiteInfoSerializer
-
+    # Creating fetches the page, so it gets its own, smaller budget
+    throttle_scopes = {"create": FETCH_SCOPE}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        query = self.request.query_params.get("q")
+        if self.action == "list" and query is not None:
+            queryset = search_websites(queryset, query)
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q", str, description="Only list entries whose title matches these words"
+            )
+        ]
+    )
     def list(self, request, *args, **kwargs):
         """
         List all website information entries.
 
         Returns a paginated list of all website information entries in the database.
+        With the q parameter, only entries whose title contains words starting with
+        every word of the query are listed, best matches first.
         """
 
         return super().list(request, *args, **kwargs)
@@ -50,23 +90,176 @@ class WebsiteInfoView(viewsets.ModelViewSet):
 
         return super().destroy(request, *args, **kwargs)
 
+    @extend_schema(
+        description="Delete website information in bulk",
+        request=WebsiteInfoBulkDeleteValidator,
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "deleted": {"type": "integer", "description": "Number of deleted entries"}
+                },
+            }
+        },
+    )
+    def bulk_delete(self, request, *args, **kwargs):
+        """
+        Delete website information entries in bulk.
+
+        Deletes every entry matching all the given filters, in chunks of
+        WEBSITE_INFO_DELETE_CHUNK_SIZE entries, each in its own short transaction,
+        so large deletes do not block readers.
+
+        Parameters:
+        - ids: Only delete entries with these IDs
+        - domain_name: Only delete entries of this domain
+        - created_before: Only delete entries created before this time
+
+        Returns:
+        - 200 OK: With the number of deleted entries
+        - 400 Bad Request: If no filter is given or a filter is invalid
+        """
+
+        params = WebsiteInfoBulkDeleteValidator(data=request.data)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = params.validated_data
+
+        queryset = WebsiteInfo.objects.all()
+        if "ids" in params:
+            queryset = queryset.filter(pk__in=params["ids"])
+        if "domain_name" in params:
+            queryset = queryset.filter(domain_name=params["domain_name"])
+        if "created_before" in params:
+            queryset = queryset.filter(created_at__lt=params["created_before"])
+
+        deleted = delete_websites(queryset, settings.WEBSITE_INFO_DELETE_CHUNK_SIZE)
+        return Response({"deleted": deleted})
+
+    @extend_schema(
+        description="Get website extraction statistics",
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "page_cache": {
+                        "type": "object",
+                        "description": "Hit ratio, size and bytes saved by the page cache",
+                    },
+                    "fetch_failures": {
+                        "type": "object",
+                        "description": "URLs and domains not fetched again until their backoff "
+                        "expires, fetches avoided and blocking failures by error",
+                    },
+                },
+            }
+        },
+    )
+    def stats(self, request, *args, **kwargs):
+        """
+        Get website extraction statistics.
+
+        Returns usage statistics of the content-addressed page cache, including
+        the hit ratio and the number of HTML bytes that did not need reparsing,
+        and of the failure registry, including the number of blocked URLs and
+        domains and the number of fetches it avoided.
+        """
+
+        return Response({"page_cache": page_cache.stats(), "fetch_failures": failure_stats()})
+
+    @extend_schema(
+        description="Stream all website information as NDJSON or CSV",
+        parameters=[WebsiteInfoExportValidator],
+        responses={(200, "application/x-ndjson"): str, (200, "text/csv"): str},
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Export website information entries.
+
+        Streams every matching entry as newline-delimited JSON or CSV without
+        pagination, keeping memory usage constant regardless of the table size.
+        Entries are ordered by update time, and the X-Export-Cursor response header
+        holds the value to pass as updated_since for the next incremental export.
+
+        Parameters:
+        - output: "ndjson" (default) or "csv"
+        - domain_name: Only export entries of this domain
+        - created_after, created_before: Only export entries created in this range
+        - updated_since: Only export entries updated after this cursor
+        """
+
+        params = WebsiteInfoExportValidator(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = params.validated_data
+
+        queryset = WebsiteInfo.objects.order_by("updated_at", "id")
+        if "domain_name" in params:
+            queryset = queryset.filter(domain_name=params["domain_name"])
+        if "created_after" in params:
+            queryset = queryset.filter(created_at__gte=params["created_after"])
+        if "created_before" in params:
+            queryset = queryset.filter(created_at__lt=params["created_before"])
+        if "updated_since" in params:
+            queryset = queryset.filter(updated_at__gt=params["updated_since"])
+
+        # Fix the upper bound, so rows updated during the export are picked up by the next one
+        cursor = queryset.aggregate(cursor=Max("updated_at"))["cursor"]
+        if cursor is not None:
+            queryset = queryset.filter(updated_at__lte=cursor)
+
+        chunk_size = settings.WEBSITE_INFO_EXPORT_CHUNK_SIZE
+        if params["output"] == "csv":
+            response = StreamingHttpResponse(
+                iter_csv(queryset, chunk_size), content_type="text/csv; charset=utf-8"
+            )
+            response["Content-Disposition"] = 'attachment; filename="website-info.csv"'
+        else:
+            response = StreamingHttpResponse(
+                iter_ndjson(queryset, chunk_size), content_type="application/x-ndjson"
+            )
+
+        cursor = cursor or params.get("updated_since")
+        if cursor is not None:
+            response["X-Export-Cursor"] = serializers.DateTimeField().to_representation(cursor)
+        return response
+
+    def perform_content_negotiation(self, request, force=False):
+        # Exports are not rendered by DRF, so any Accept header is fine
+        return super().perform_content_negotiation(request, force=force or self.action == "export")
+
+    def perform_destroy(self, instance):
+        # The rollup is updated in the same transaction, so it never misses a delete
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            record_websites_deleted([instance])
+
     def create(self, request, *args, **kwargs):
         """
         Create a new website information entry.
 
         Fetches the provided URL, extracts information such as domain name, protocol,
-        title, images, and stylesheets count, and stores it in the database.
+        title, images, and stylesheets count, and stores it in the database. Only the
+        submitted URL is validated, the extracted information is stored as-is.
 
-        If the URL already exists in the database, returns the existing entry instead
-        of creating a new one.
+        If the URL already exists in the database, or is known to redirect to a stored
+        page, returns the existing entry instead of creating a new one. URLs that turn
+        out to redirect to a stored page are remembered and resolved without a fetch
+        on the next submission.
+
+        Failed fetches are remembered per URL, and per domain when the server cannot
+        be reached. Until a backoff that doubles with every consecutive failure has
+        expired, the remembered error is returned without fetching again, along with
+        a Retry-After header.
 
         Parameters:
         - url: The URL to fetch and extract information from
 
         Returns:
         - 201 Created: If a new entry was created
-        - 200 OK: If the URL already exists
-        - 400 Bad Request: If the URL is invalid or cannot be fetched
+        - 200 OK: If the URL already exists or redirects to an existing entry
+        - 400 Bad Request: If the URL is invalid or cannot be fetched, or the page
+          it leads to is too long to store
         - 500 Internal Server Error: If an error occurs during processing
         """
 
@@ -77,23 +270,53 @@ class WebsiteInfoView(viewsets.ModelViewSet):
 
         url = url_validator.validated_data["url"]
 
-        # Check if URL already exists
-        existing_info = WebsiteInfo.objects.filter(url=url).first()
+        # Check if URL already exists, either directly or as a known redirect alias
+        existing_info = self._find_existing_website_info(url)
         if existing_info:
             serializer = self.get_serializer(existing_info)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
-        try:
-            website_info = self._extract_website_info(url)
-
-            # Create WebsiteInfo object
-            serializer = self.get_serializer(data=website_info)
-            serializer.is_valid(raise_exception=True)
-            self.perform_create(serializer)
+        # The URL or its domain failed recently, so do not wait for it again
+        failure = find_active_failure(url)
+        if failure:
+            return self._failure_response(failure)
 
+        try:
+            page = fetch_page(url)
+            clear_failures(url)
+
+            # The URL redirects to an already stored page, so remember it as an alias
+            existing_info = self._find_website_info_by_final_url(page.final_url)
+            if existing_info:
+                self._register_aliases(existing_info, [url, *page.redirect_chain, page.final_url])
+                serializer = self.get_serializer(existing_info)
+                return Response(serializer.data, status=status.HTTP_200_OK)
+
+            # The URL was validated above and the rest comes from the extractor, which
+            # only yields absolute image URLs, so the entry is not validated again
+            website_info_data = self._extract_website_info(page)
+            error = self._check_lengths(website_info_data)
+            if error:
+                return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                with transaction.atomic():
+                    website_info = WebsiteInfo.objects.create(**website_info_data)
+                    record_websites_created([website_info])
+                    self._register_aliases(website_info, [*page.redirect_chain, page.final_url])
+            except IntegrityError:
+                # A concurrent request for the same URL stored it first
+                existing_info = WebsiteInfo.objects.filter(url=website_info_data["url"]).first()
+                if not existing_info:
+                    raise
+                serializer = self.get_serializer(existing_info)
+                return Response(serializer.data, status=status.HTTP_200_OK)
+
+            serializer = self.get_serializer(website_info)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         except requests.RequestException as e:
+            record_failure(url, e)
             return Response(
                 {"error": f"Failed to fetch URL: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST
             )
@@ -103,52 +326,118 @@ class WebsiteInfoView(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _extract_website_info(self, url):
-        """Extract information from the website."""
+    def _failure_response(self, failure):
+        """Build the response to a URL whose last fetch failed, without fetching it."""
 
-        # Parse URL
-        parsed_url = urlparse(url)
-        domain_name = parsed_url.netloc
-        protocol = parsed_url.scheme
+        retry_after = max(int((failure.retry_at - timezone.now()).total_seconds()), 1)
+        return Response(
+            {
+                "error": f"Failed to fetch URL: {failure.message}",
+                "retry_at": serializers.DateTimeField().to_representation(failure.retry_at),
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+            headers={"Retry-After": str(retry_after)},
+        )
 
-        # Fetch website content
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+    def _find_existing_website_info(self, url):
+        """Find a stored website by its URL or by a URL known to redirect to it."""
+
+        existing_info = WebsiteInfo.objects.filter(url=url).first()
+        if existing_info:
+            return existing_info
 
-        # Parse HTML
-        soup = BeautifulSoup(response.text, "html.parser")
+        alias = WebsiteAlias.objects.select_related("website").filter(url=url).first()
+        return alias.website if alias else None
 
-        # Return website info
+    def _find_website_info_by_final_url(self, final_url):
+        """Find a stored website whose page was reached at the given final URL."""
+
+        return (
+            WebsiteInfo.objects.filter(final_url=final_url).first()
+            or WebsiteInfo.objects.filter(url=final_url).first()
+        )
+
+    def _register_aliases(self, website_info, urls):
+        """Record URLs that lead to the stored website so they resolve without a fetch."""
+
+        aliases = [
+            WebsiteAlias(url=alias_url, website=website_info)
+            for alias_url in dict.fromkeys(urls)
+            if alias_url != website_info.url and len(alias_url) <= 2048
+        ]
+        WebsiteAlias.objects.bulk_create(aliases, ignore_conflicts=True)
+
+    def _check_lengths(self, website_info_data):
+        """Get the error of extracted values too long for their columns, None if they fit."""
+
+        for field_name in ("final_url", "domain_name", "protocol"):
+            max_length = WebsiteInfo._meta.get_field(field_name).max_length
+            if len(website_info_data[field_name] or "") > max_length:
+                return (
+                    f"Failed to process website: the {field_name.replace('_', ' ')} "
+                    f"of the page is longer than {max_length} characters"
+                )
+        return None
+
+    def _extract_website_info(self, page):
+        """Extract information from the fetched website page."""
+
+        # Domain name and protocol describe the page after following redirects
+        parsed_url = urlparse(page.final_url)
+
+        # Return website info, identical page bodies are only parsed once
         return {
-            "url": url,
-            "domain_name": domain_name,
-            "protocol": protocol,
-            "title": soup.title.text.strip() if soup.title else None,
-            "images": self._extract_image_url(soup, protocol, domain_name),
-            "stylesheets_count": len(soup.find_all("link", rel="stylesheet")),
+            "url": page.url,
+            "final_url": page.final_url,
+            "redirect_chain": page.redirect_chain,
+            "domain_name": parsed_url.netloc,
+            "protocol": parsed_url.scheme,
+            "body_sha256": archive_body(page.text),
+            **extract_page_info(page.text, page.final_url),
         }
 
-    def _extract_image_url(self, soup, protocol, domain_name):
-        """Extract and normalize image URLs from the soup."""
 
-        image_urls = []
-        for img in soup.find_all("img"):
-            src = img.get("src")
-            if not src:
-                continue
+class DomainStatsView(generics.ListAPIView):
+    """
+    API endpoint for per-domain website statistics.
 
-            # Normalize image URL
-            if src.startswith("//"):
-                src = f"{protocol}:{src}"
-            elif src.startswith("/"):
-                src = f"{protocol}://{domain_name}{src}"
-            elif not src.startswith(("http://", "https://")):
-                src = f"{protocol}://{domain_name}/{src}"
+    Lists the page count, average stylesheets count, total images and latest
+    update of every domain, read from a rollup maintained as pages are stored,
+    refreshed and deleted.
 
-            image_urls.append(src)
+    Parameters:
+    - search: Only list domains containing this text
+    - min_pages: Only list domains with at least this many pages
+    - ordering: Sort by domain_name, page_count, avg_stylesheets_count, images_total
+      or latest_updated_at, prefixed with "-" for descending order
+    """
 
-        return image_urls
+    queryset = DomainStats.objects.all()
+    serializer_class = DomainStatsSerializer
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["domain_name"]
+    ordering_fields = [
+        "domain_name",
+        "page_count",
+        "avg_stylesheets_count",
+        "images_total",
+        "latest_updated_at",
+    ]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "min_pages", int, description="Only list domains with at least this many pages"
+            )
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        min_pages = self.request.query_params.get("min_pages")
+        if min_pages is not None:
+            min_pages = serializers.IntegerField(min_value=0).run_validation(min_pages)
+            queryset = queryset.filter(page_count__gte=min_pages)
+        return queryset
@@ -0,0 +1,171 @@
+"""
+Benchmark the cold start time and memory of an application process.
+
+Starts fresh Python processes that load the WSGI application and serve a first
+request, with and without warming up the request path, and reports the time
+to the first response, the resident memory and which heavy modules were
+loaded. When gunicorn is installed, also starts the production server with
+and without preloading and reports the time until it answers and the RSS and
+PSS (memory shared with other processes counted proportionally) per worker.
+RSS and PSS are read from /proc and are only reported on Linux.
+
+Usage:
+    python benchmarks/bench_cold_start.py [workers]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("bs4", "drf_spectacular.views", "rest_framework.serializers")
+
+PROCESS_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+from apps.wsgi import application
+loaded = time.perf_counter()
+if {warm_up}:
+    from apps.core.startup import warm_up
+    warm_up()
+ready = time.perf_counter()
+from django.test import Client
+response = Client().get("/api/website-info")
+answered = time.perf_counter()
+print(json.dumps({{
+    "status": response.status_code,
+    "load_ms": (loaded - start) * 1000,
+    "warm_up_ms": (ready - loaded) * 1000,
+    "first_request_ms": (answered - ready) * 1000,
+    "modules": [name for name in {modules!r} if name in sys.modules],
+}}))
+"""
+
+
+def read_memory(pid):
+    """Return the RSS and PSS of a process in MiB, None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            fields = dict(line.split(":", 1) for line in smaps if ":" in line)
+    except OSError:
+        return None, None
+    rss = int(fields["Rss"].split()[0]) / 1024
+    pss = int(fields["Pss"].split()[0]) / 1024
+    return rss, pss
+
+
+def child_pids(pid):
+    """Return the PIDs of the child processes of a process."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            return [int(child) for child in children.read().split()]
+    except OSError:
+        return []
+
+
+def bench_process(env, warm_up):
+    """Start a Python process loading the application and serving one request."""
+    script = PROCESS_SCRIPT.format(warm_up=warm_up, modules=HEAVY_MODULES)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, check=True
+    ).stdout
+    result = json.loads(output.decode().strip().splitlines()[-1])
+    result["total_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def bench_gunicorn(env, workers, preload, port):
+    """Start gunicorn, wait until it answers and measure the memory of its workers."""
+    env = env | {
+        "GUNICORN_WORKERS": str(workers),
+        "GUNICORN_PRELOAD": str(int(preload)),
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_ACCESS_LOG": "",
+        "GUNICORN_MAX_REQUESTS": "0",
+    }
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "apps.wsgi:application"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}/api/website-info"
+                ) as response:
+                    response.read()
+                break
+            except OSError:
+                if time.perf_counter() - start > 30:
+                    raise RuntimeError("gunicorn did not start within 30 seconds")
+                time.sleep(0.01)
+        answered_ms = (time.perf_counter() - start) * 1000
+
+        # Let every worker finish booting before measuring it
+        time.sleep(1)
+        memory = [read_memory(pid) for pid in child_pids(server.pid)]
+        return answered_ms, read_memory(server.pid), memory
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def format_memory(memory):
+    rss, pss = memory
+    return "n/a" if rss is None else f"RSS {rss:.1f} MiB, PSS {pss:.1f} MiB"
+
+
+def main(workers):
+    with tempfile.TemporaryDirectory() as directory:
+        env = os.environ | {
+            "DJANGO_SETTINGS_MODULE": "apps.settings",
+            "DATABASE_PATH": str(Path(directory) / "bench.sqlite3"),
+            "DEBUG": "0",
+        }
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "-v", "0"], cwd=ROOT, env=env, check=True
+        )
+
+        print(
+            f"{'process':<22} {'load ms':>9} {'warm-up ms':>11} {'1st request ms':>15} "
+            f"{'total ms':>9}  heavy modules loaded"
+        )
+        for warm_up in (False, True):
+            results = [bench_process(env, warm_up) for _ in range(3)]
+            best = min(results, key=lambda result: result["total_ms"])
+            name = "warmed up" if warm_up else "lazy"
+            print(
+                f"{name:<22} {best['load_ms']:>9.1f} {best['warm_up_ms']:>11.1f} "
+                f"{best['first_request_ms']:>15.1f} {best['total_ms']:>9.1f}  "
+                f"{', '.join(best['modules']) or '-'}"
+            )
+
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:
+            print("gunicorn is not installed, skipping the server benchmark")
+            return
+
+        print()
+        print(f"gunicorn with {workers} workers")
+        for index, preload in enumerate((False, True)):
+            answered_ms, master, memory = bench_gunicorn(env, workers, preload, 8700 + index)
+            print(f"preload={preload}: first response after {answered_ms:.0f} ms")
+            print(f"  master:  {format_memory(master)}")
+            for pid_index, worker_memory in enumerate(memory):
+                print(f"  worker {pid_index}: {format_memory(worker_memory)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
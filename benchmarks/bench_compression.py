@@ -0,0 +1,99 @@
+"""
+Benchmark compression of fetched pages, API responses and stored image lists.
+
+Reports the bytes on the wire and the CPU cost of compressing and
+decompressing with each available codec. brotli and zstd are only
+measured when the brotli or zstandard packages are installed.
+
+Usage:
+    python benchmarks/bench_compression.py [image_count]
+"""
+
+import gzip
+import json
+import sys
+import time
+import zlib
+
+
+def build_payloads(image_count):
+    """Build a representative page body, images list and API list response."""
+    images = [
+        f"https://cdn.example.com/media/2025/03/photo-{index}-1024x768.jpg"
+        for index in range(image_count)
+    ]
+    html = "<html><head><title>Example</title>{}</head><body>{}</body></html>".format(
+        '<link rel="stylesheet" href="/static/site.css">' * 5,
+        "".join(f'<div class="item"><img src="{image}" alt="Photo"></div>' for image in images),
+    )
+    website_info = {
+        "url": "https://example.com/gallery",
+        "domain_name": "example.com",
+        "protocol": "https",
+        "title": "Example",
+        "images": images,
+        "stylesheets_count": 5,
+    }
+    response = {"count": 10, "next": None, "previous": None, "results": [website_info] * 10}
+
+    return {
+        "page body": html.encode("utf-8"),
+        "images field": json.dumps(images, separators=(",", ":")).encode("utf-8"),
+        "API list page": json.dumps(response, separators=(",", ":")).encode("utf-8"),
+    }
+
+
+def get_codecs():
+    """Return the available codecs as (name, compress, decompress) tuples."""
+    codecs = [
+        ("gzip-1", lambda data: gzip.compress(data, 1), gzip.decompress),
+        ("gzip-6", lambda data: gzip.compress(data, 6), gzip.decompress),
+        ("zlib-6", lambda data: zlib.compress(data, 6), zlib.decompress),
+    ]
+
+    try:
+        import brotli
+
+        codecs.append(("br-5", lambda data: brotli.compress(data, quality=5), brotli.decompress))
+    except ImportError:
+        print("brotli is not installed, skipping br")
+
+    try:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor(level=3)
+        decompressor = zstandard.ZstdDecompressor()
+        codecs.append(("zstd-3", compressor.compress, decompressor.decompress))
+    except ImportError:
+        print("zstandard is not installed, skipping zstd")
+
+    return codecs
+
+
+def measure(function, data, repeat=20):
+    """Return the result and the average CPU time of a function in milliseconds."""
+    start = time.process_time()
+    for _ in range(repeat):
+        result = function(data)
+    return result, (time.process_time() - start) * 1000 / repeat
+
+
+def main(image_count):
+    """Run the benchmark for each payload and codec."""
+    codecs = get_codecs()
+    print(
+        f"{'payload':<14} {'codec':<7} {'raw bytes':>10} {'wire bytes':>10} "
+        f"{'ratio':>6} {'comp ms':>8} {'decomp ms':>9}"
+    )
+    for payload_name, data in build_payloads(image_count).items():
+        for codec_name, compress, decompress in codecs:
+            compressed, compress_ms = measure(compress, data)
+            _, decompress_ms = measure(decompress, compressed)
+            print(
+                f"{payload_name:<14} {codec_name:<7} {len(data):>10} {len(compressed):>10} "
+                f"{len(data) / len(compressed):>6.1f} {compress_ms:>8.2f} {decompress_ms:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,86 @@
+"""
+Benchmark the CPU time of creating website information from image-heavy pages.
+
+Builds a temporary SQLite database with the project migrations and posts
+URLs through the API with the fetch replaced by a prepared page. The page
+cache is warmed with the page, so the time measured is image URL
+resolution, validation, saving and serialization only.
+
+Usage:
+    python benchmarks/bench_create_path.py [image_count ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.settings")
+
+from django.conf import settings  # noqa: E402
+
+DATABASE = Path(tempfile.mkdtemp()) / "bench.sqlite3"
+settings.DATABASES["default"]["NAME"] = DATABASE
+settings.ALLOWED_HOSTS = ["testserver"]
+# Only the create path is measured, not the rate limits
+settings.REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.website_info.extractors import extract_page_info  # noqa: E402
+from apps.website_info.fetchers import FetchedPage  # noqa: E402
+
+PAGE_URL = "https://example.com/gallery"
+REQUESTS = 50
+
+
+def build_page(image_count):
+    """Build a page with absolute and relative images."""
+    tags = "".join(
+        (
+            f'<img src="/media/photo-{index}.jpg">'
+            if index % 2
+            else f'<img src="https://cdn.example.com/images/{index}/large.webp">'
+        )
+        for index in range(image_count)
+    )
+    return f"<html><head><title>Gallery</title></head><body>{tags}</body></html>"
+
+
+def main(image_counts):
+    """Post query-string variants of pages of each size and report the time per request."""
+    call_command("migrate", verbosity=0)
+    client = APIClient()
+
+    print(f"{'images':>8} {'ms/request':>11} {'cpu ms/request':>15}")
+    for image_count in image_counts:
+        html = build_page(image_count)
+
+        def fetch_page(url, timeout=10):
+            return FetchedPage(url=url, final_url=url, text=html)
+
+        urls = [f"{PAGE_URL}/{image_count}?variant={index}" for index in range(REQUESTS)]
+        extract_page_info(html, PAGE_URL)
+
+        with patch("apps.website_info.views.fetch_page", fetch_page):
+            start, cpu_start = time.perf_counter(), time.process_time()
+            for url in urls:
+                response = client.post("/api/website-info", {"url": url}, format="json")
+                assert response.status_code == 201, response.content
+            elapsed = (time.perf_counter() - start) * 1000 / REQUESTS
+            cpu = (time.process_time() - cpu_start) * 1000 / REQUESTS
+
+        print(f"{image_count:>8} {elapsed:>11.2f} {cpu:>15.2f}")
+
+    DATABASE.unlink()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 200, 1000, 5000])
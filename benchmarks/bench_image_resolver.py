@@ -0,0 +1,60 @@
+"""
+Benchmark image URL resolution on pages with thousands of images.
+
+Usage:
+    python benchmarks/bench_image_resolver.py [image_count ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.website_info.resolvers import ImageUrlResolver  # noqa: E402
+
+PAGE_URL = "https://example.com/blog/post"
+
+
+def build_page(image_count):
+    """Build a page mixing relative, absolute, srcset, lazy and data URI images."""
+    tags = []
+    for index in range(image_count):
+        kind = index % 5
+        if kind == 0:
+            # Repeated relative paths, e.g. icons and spacers
+            tags.append(f'<img src="img/icon-{index % 20}.png">')
+        elif kind == 1:
+            tags.append(f'<img src="/media/photo-{index}.jpg">')
+        elif kind == 2:
+            tags.append(f'<img data-src="https://cdn.example.com/lazy-{index}.jpg">')
+        elif kind == 3:
+            tags.append(f'<img srcset="thumb-{index}.jpg 1x, thumb-{index}@2x.jpg 2x">')
+        else:
+            tags.append('<img src="data:image/gif;base64,R0lGODlhAQABAAAAACw=">')
+    return f"<html><body>{''.join(tags)}</body></html>"
+
+
+def main(image_counts):
+    """Run the benchmark for each page size."""
+    print(f"{'images':>8} {'parse ms':>10} {'resolve ms':>11} {'us/image':>9} {'unique':>8}")
+    for image_count in image_counts:
+        html = build_page(image_count)
+
+        start = time.perf_counter()
+        soup = BeautifulSoup(html, "html.parser")
+        parsed = time.perf_counter()
+        urls = ImageUrlResolver(PAGE_URL).resolve_images(soup)
+        resolved = time.perf_counter()
+
+        resolve_ms = (resolved - parsed) * 1000
+        print(
+            f"{image_count:>8} {(parsed - start) * 1000:>10.1f} {resolve_ms:>11.1f} "
+            f"{resolve_ms * 1000 / image_count:>9.2f} {len(urls):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,75 @@
+"""
+Benchmark JSON encoding of representative WebsiteInfo list pages.
+
+Compares the DRF JSONRenderer with the FastJSONRenderer for every
+installed JSON backend.
+
+Usage:
+    python benchmarks/bench_json_render.py [images_per_site ...]
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.settings")
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.core.renderers import FastJSONRenderer, load_json_backend  # noqa: E402
+
+
+def build_page(images_per_site, page_size=10):
+    """Build a paginated WebsiteInfo list response."""
+    results = [
+        {
+            "id": index,
+            "url": f"https://example{index}.com/blog/post",
+            "final_url": f"https://www.example{index}.com/blog/post",
+            "redirect_chain": [f"https://example{index}.com/blog/post"],
+            "domain_name": f"www.example{index}.com",
+            "protocol": "https",
+            "title": f"Example Domain {index} – Blog",
+            "images": [
+                f"https://cdn.example{index}.com/media/photo-{image}.jpg"
+                for image in range(images_per_site)
+            ],
+            "stylesheets_count": 4,
+            "created_at": "2025-03-09T12:05:00.123000Z",
+            "updated_at": "2025-03-09T12:05:00.123000Z",
+        }
+        for index in range(page_size)
+    ]
+    return {"count": 1000, "next": None, "previous": None, "results": results}
+
+
+def measure(renderer, data, number=50):
+    """Return the average encode time of a renderer in milliseconds."""
+    return timeit.timeit(lambda: renderer.render(data), number=number) * 1000 / number
+
+
+def main(image_counts):
+    """Run the benchmark for each page size."""
+    backends = [name for name in ("orjson", "msgspec") if load_json_backend(name).name == name]
+    print(
+        f"{'images':>7} {'bytes':>9} {'drf ms':>8}" + "".join(f" {b + ' ms':>11}" for b in backends)
+    )
+    for image_count in image_counts:
+        data = build_page(image_count)
+        baseline = JSONRenderer().render(data)
+        row = f"{image_count:>7} {len(baseline):>9} {measure(JSONRenderer(), data):>8.3f}"
+        for backend in backends:
+            with override_settings(JSON_BACKEND=backend):
+                assert FastJSONRenderer().render(data) == baseline
+                row += f" {measure(FastJSONRenderer(), data):>11.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,96 @@
+"""
+Benchmark title search against a large WebsiteInfo table.
+
+Builds a temporary SQLite database with the project migrations, fills it
+with generated titles and compares the indexed search with a substring scan.
+
+Usage:
+    python benchmarks/bench_title_search.py [row_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.settings")
+
+from django.conf import settings  # noqa: E402
+
+DATABASE = Path(tempfile.mkdtemp()) / "bench.sqlite3"
+settings.DATABASES["default"]["NAME"] = DATABASE
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from apps.website_info.models import WebsiteInfo  # noqa: E402
+from apps.website_info.search import search_websites  # noqa: E402
+
+WORDS = (
+    "bitcoin market price news blog travel recipe weather sport music finance crypto "
+    "shop review guide photo video game health science school football garden home"
+).split()
+
+QUERIES = ["bitcoin", "bitcoin price", "foot", "garden recipe review", "rarewordxyz"]
+
+
+def populate(row_count, batch_size=20000):
+    """Insert rows with random titles of three to eight words."""
+    rng = random.Random(42)
+    for start in range(0, row_count, batch_size):
+        WebsiteInfo.objects.bulk_create(
+            WebsiteInfo(
+                url=f"https://site{index}.example.com/",
+                domain_name=f"site{index % 5000}.example.com",
+                protocol="https",
+                title=" ".join(rng.choices(WORDS, k=rng.randint(3, 8)))
+                + (" rarewordxyz" if index % 100000 == 0 else ""),
+            )
+            for index in range(start, min(start + batch_size, row_count))
+        )
+
+
+def measure(function, repeat=3):
+    """Return the result and the best wall time of a function in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, min(timings)
+
+
+def main(row_count):
+    """Build the table and run each query with both strategies."""
+    call_command("migrate", verbosity=0)
+    start = time.perf_counter()
+    populate(row_count)
+    print(f"Inserted {row_count} rows in {time.perf_counter() - start:.1f}s ({DATABASE})")
+
+    print(f"{'query':<24} {'matches':>8} {'fts page ms':>12} {'scan page ms':>13}")
+    for query in QUERIES:
+
+        def indexed():
+            queryset = search_websites(WebsiteInfo.objects.all(), query)
+            return queryset.count(), list(queryset[:10])
+
+        def scan():
+            queryset = WebsiteInfo.objects.all()
+            for term in query.split():
+                queryset = queryset.filter(title__icontains=term)
+            return queryset.count(), list(queryset[:10])
+
+        (count, _), indexed_ms = measure(indexed)
+        _, scan_ms = measure(scan)
+        print(f"{query:<24} {count:>8} {indexed_ms:>12.1f} {scan_ms:>13.1f}")
+
+    DATABASE.unlink()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
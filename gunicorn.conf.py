@@ -0,0 +1,43 @@
+"""Gunicorn configuration of the production server, tuned with environment variables."""
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Requests wait on fetched websites and rate APIs, so every worker process serves
+# them from a pool of threads. Caches are per process, fewer workers share more.
+workers = int(os.environ.get("GUNICORN_WORKERS", str(os.cpu_count() or 1)))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+
+# Pages are fetched with a 10 seconds timeout, ECB rates with a 30 seconds one
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# Restart workers after this many requests to bound memory growth, 0 disables restarts
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Load the application once in the master, workers share its memory and start faster
+preload_app = bool(int(os.environ.get("GUNICORN_PRELOAD", "1")))
+
+# Access log file, "-" for stdout, empty to disable it
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    """Import the request path in the master before the workers are forked."""
+    if preload_app:
+        from apps.core.startup import warm_up
+
+        warm_up()
+
+
+def post_worker_init(worker):
+    """Import the request path before the first request when the app is not preloaded."""
+    from apps.core.startup import warm_up
+
+    warm_up()
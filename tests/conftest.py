@@ -0,0 +1,13 @@
+"""Fixtures shared by all tests."""
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def throttle_cache():
+    """Start every test with the full rate limits, instead of what earlier tests left."""
+    caches[settings.API_THROTTLE_CACHE].clear()
+    yield
+    caches[settings.API_THROTTLE_CACHE].clear()
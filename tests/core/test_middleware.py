@@ -0,0 +1,76 @@
+"""Tests for the project-wide middleware."""
+
+import gzip
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from apps.core.middleware import AdmissionControlMiddleware, CompressionMiddleware
+
+
+def get_response(content):
+    """Return a middleware wrapping a view that responds with the given content."""
+    return CompressionMiddleware(lambda request: HttpResponse(content))
+
+
+class TestCompressionMiddleware:
+    """Tests for the CompressionMiddleware."""
+
+    @override_settings(API_COMPRESSION_MIN_SIZE=1024)
+    def test_compresses_large_responses(self):
+        """Test that responses above the threshold are gzip-compressed."""
+        content = b'{"images": []}' * 100
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+        response = get_response(content)(request)
+
+        assert response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.content) == content
+
+    @override_settings(API_COMPRESSION_MIN_SIZE=1024)
+    def test_skips_small_responses(self):
+        """Test that responses below the threshold are sent uncompressed."""
+        content = b'{"images": []}' * 50
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+        response = get_response(content)(request)
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == content
+
+
+class TestAdmissionControlMiddleware:
+    """Tests for the AdmissionControlMiddleware."""
+
+    @override_settings(API_MAX_IN_FLIGHT=1, API_RETRY_AFTER=7)
+    def test_sheds_requests_beyond_limit(self):
+        """Test that requests are rejected while the limit of in-flight requests is reached."""
+        responses = []
+
+        def view(request):
+            if not responses:
+                # A request arriving while this one is handled
+                responses.append(middleware(RequestFactory().get("/")))
+            return HttpResponse("ok")
+
+        middleware = AdmissionControlMiddleware(view)
+
+        assert middleware(RequestFactory().get("/")).content == b"ok"
+        assert responses[0].status_code == 503
+        assert responses[0]["Retry-After"] == "7"
+        # The slot is free again once the response is complete
+        assert middleware(RequestFactory().get("/")).content == b"ok"
+
+    @pytest.mark.django_db
+    @override_settings(API_MAX_IN_FLIGHT=1)
+    def test_streaming_response_holds_slot(self):
+        """Test that streaming responses only free their slot once closed."""
+        middleware = AdmissionControlMiddleware(lambda request: StreamingHttpResponse(iter([b"a"])))
+
+        response = middleware(RequestFactory().get("/"))
+        assert middleware(RequestFactory().get("/")).status_code == 503
+
+        assert b"".join(response) == b"a"
+        response.close()
+        assert middleware(RequestFactory().get("/")).status_code == 200
@@ -0,0 +1,105 @@
+"""Tests for the profiling of sampled requests."""
+
+import cProfile
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.core.middleware import ProfilingMiddleware
+from apps.core.profiling import aggregate_profiles, list_profiles, prune_profiles, save_profile
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    """Profile every request into an empty directory."""
+    settings.API_PROFILING = {"SAMPLE_RATE": 1, "DIR": tmp_path, "MAX_FILES": 3}
+    return tmp_path
+
+
+def make_profile():
+    """Return a profiler that ran some code."""
+    profiler = cProfile.Profile()
+    profiler.runcall(sorted, range(100))
+    return profiler
+
+
+class TestProfilingMiddleware:
+    """Tests for the ProfilingMiddleware."""
+
+    def test_disabled(self, settings):
+        """Test that the middleware is removed from the chain when the sample rate is 0."""
+        settings.API_PROFILING = {**settings.API_PROFILING, "SAMPLE_RATE": 0}
+
+        with pytest.raises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: HttpResponse())
+
+    def test_saves_profile(self, profile_dir):
+        """Test that sampled requests are profiled into a file named by their endpoint."""
+        middleware = ProfilingMiddleware(lambda request: HttpResponse("ok"))
+
+        response = middleware(RequestFactory().post("/"))
+
+        assert response.content == b"ok"
+        [path] = profile_dir.iterdir()
+        assert path.name.startswith("POST_unresolved_")
+        assert path.suffix == ".prof"
+
+    def test_save_error_keeps_response(self, profile_dir, caplog):
+        """Test that a profile that cannot be written is logged and the response kept."""
+        middleware = ProfilingMiddleware(lambda request: HttpResponse("ok"))
+
+        with patch("apps.core.middleware.save_profile", side_effect=OSError("disk full")):
+            response = middleware(RequestFactory().get("/"))
+
+        assert response.status_code == 200
+        assert "Failed to save the profile of GET /" in caplog.text
+
+
+class TestProfiles:
+    """Tests for the storage and aggregation of profiles."""
+
+    def test_retention(self, profile_dir):
+        """Test that only the newest profiles are kept."""
+        request = RequestFactory().get("/")
+        paths = [save_profile(make_profile(), request, 0.01) for _ in range(5)]
+        (profile_dir / "notes.prof").write_text("")
+
+        assert sorted(profile_dir.iterdir()) == sorted(paths[2:] + [profile_dir / "notes.prof"])
+
+        assert prune_profiles(profile_dir, 0) == 0
+        assert list(profile_dir.iterdir()) == [profile_dir / "notes.prof"]
+
+    def test_lists_directory_only_over_limit(self, settings, profile_dir):
+        """Test that the directory is listed once, then only when it goes over the limit."""
+        settings.API_PROFILING = {**settings.API_PROFILING, "MAX_FILES": 10}
+        request = RequestFactory().get("/")
+
+        with patch("apps.core.profiling.list_profiles", wraps=list_profiles) as mock_list:
+            for _ in range(11):
+                save_profile(make_profile(), request, 0.01)
+
+        # Counted on the first save, then pruned to 9 on the eleventh
+        assert mock_list.call_count == 2
+        assert len(list(profile_dir.iterdir())) == 9
+
+    def test_aggregate(self, profile_dir):
+        """Test that profiles are merged by endpoint and reported by the command."""
+        request = RequestFactory().get("/")
+        save_profile(make_profile(), request, 0.02)
+        save_profile(make_profile(), request, 0.04)
+
+        [(key, profile)] = aggregate_profiles(profile_dir).items()
+        assert key == "GET unresolved"
+        assert profile["requests"] == 2
+        assert profile["duration"] == pytest.approx(0.06)
+        assert aggregate_profiles(profile_dir, endpoint="websiteinfo") == {}
+
+        out = StringIO()
+        call_command("aggregate_profiles", top=3, sort="tottime", stdout=out)
+        assert "GET unresolved: 2 requests, 30.0 ms on average" in out.getvalue()
+        assert "sorted" in out.getvalue()
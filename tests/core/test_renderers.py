@@ -0,0 +1,104 @@
+"""Tests for the fast JSON renderer and parser."""
+
+import io
+import uuid
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.renderers import FastJSONParser, FastJSONRenderer, load_json_backend
+from apps.website_info.models import WebsiteInfo
+from apps.website_info.serializers import WebsiteInfoSerializer
+
+BACKENDS = ["orjson", "msgspec", "json"]
+
+GOLDEN_CORPUS = [
+    {"bitcoin_eur": 50000.0, "eur_to_gbp": 1.1764705882352942, "bitcoin_gbp": 42500.123},
+    {"bitcoin_eur": None, "eur_to_gbp": None, "bitcoin_gbp": None},
+    {"count": 0, "next": None, "previous": None, "results": []},
+    {"title": "Café – ünïcode 日本語 😀", "escaped": 'quote " backslash \\ tab \t'},
+    {"title": "line\u2028paragraph\u2029separators"},
+    {"id": uuid.UUID("12345678-1234-5678-1234-567812345678"), "price": Decimal("1.5")},
+    {1: "integer key", "nested": {"list": [1, 2.5, True, False, None, -0.0]}},
+    [0.1, 1e15, 123456.789, 2**53],
+    {"big": 2**64, "negative": -(2**70), "nested": [{"id": 10**30}]},
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def json_backend(request, settings):
+    """Configure each installed JSON backend in turn."""
+    if load_json_backend(request.param).name != request.param:
+        pytest.skip(f"{request.param} is not installed")
+    settings.JSON_BACKEND = request.param
+    return request.param
+
+
+class TestFastJSONRenderer:
+    """Tests for the FastJSONRenderer."""
+
+    @pytest.mark.parametrize("data", GOLDEN_CORPUS)
+    def test_golden_corpus_is_byte_compatible(self, json_backend, data):
+        """Test that the output is byte-compatible with the DRF renderer."""
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.django_db
+    def test_website_info_page_is_byte_compatible(self, json_backend):
+        """Test that a serialized WebsiteInfo page is byte-compatible with the DRF renderer."""
+        for index in range(3):
+            WebsiteInfo.objects.create(
+                url=f"https://example.com/{index}",
+                domain_name="example.com",
+                protocol="https",
+                title=f"Example Domain {index}",
+                images=[f"https://example.com/image{image}.jpg" for image in range(50)],
+                stylesheets_count=index,
+            )
+        data = {
+            "count": 3,
+            "results": WebsiteInfoSerializer(WebsiteInfo.objects.all(), many=True).data,
+        }
+
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_floats_are_rejected(self, json_backend, value):
+        """Test that NaN and Infinity raise like the strict DRF renderer, not render as null."""
+        data = {"rate": None, "values": [1.0, {"nested": value}]}
+
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render(data)
+
+    def test_indented_output_falls_back(self, json_backend):
+        """Test that indented output matches the DRF renderer."""
+        data = GOLDEN_CORPUS[0]
+        media_type = "application/json; indent=4"
+
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(
+            data, media_type
+        )
+
+    def test_none_renders_empty_body(self, json_backend):
+        """Test that no data renders an empty body."""
+        assert FastJSONRenderer().render(None) == b""
+
+
+class TestFastJSONParser:
+    """Tests for the FastJSONParser."""
+
+    def test_parse(self, json_backend):
+        """Test that parsing matches the DRF parser."""
+        body = '{"url": "https://example.com/café", "ids": [1, 2.5, null]}'.encode("utf-8")
+
+        assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    @pytest.mark.parametrize("body", [b'{"url": ', b'{"value": NaN}'])
+    def test_invalid_json(self, json_backend, body):
+        """Test that invalid and non-strict JSON is rejected."""
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(body))
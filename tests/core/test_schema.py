@@ -0,0 +1,88 @@
+"""Tests for the precomputed OpenAPI schema."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.schema import generate_schema, get_code_hash, get_schema_path, load_schema
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    """Point OPENAPI_SCHEMA_DIR to an empty directory and forget loaded schemas."""
+    load_schema.cache_clear()
+    with override_settings(OPENAPI_SCHEMA_DIR=tmp_path):
+        yield tmp_path
+    load_schema.cache_clear()
+
+
+class TestSchema:
+    """Tests for the build_openapi_schema command and the schema view."""
+
+    def test_build_command(self, schema_dir):
+        """Test that the command writes the schema of the current version in every format."""
+        call_command("build_openapi_schema")
+
+        assert get_schema_path("yaml").parent == schema_dir
+        assert get_schema_path("yaml").name == f"openapi-0.1.0-{get_code_hash()}.yaml"
+        schema = json.loads(get_schema_path("json").read_bytes())
+        assert "/api/website-info/" in schema["paths"]
+
+    def test_build_command_removes_stale_schemas(self, schema_dir):
+        """Test that schema files built from other code are removed."""
+        (schema_dir / "openapi-0.1.0.yaml").write_bytes(b"stale")
+        (schema_dir / "openapi-0.1.0-000000000000.json").write_bytes(b"stale")
+
+        call_command("build_openapi_schema")
+
+        assert sorted(path.name for path in schema_dir.iterdir()) == [
+            get_schema_path("json").name,
+            get_schema_path("yaml").name,
+        ]
+
+    def test_ignores_schema_of_other_code(self, schema_dir):
+        """Test that a schema file built from other code is not served."""
+        (schema_dir / "openapi-0.1.0.yaml").write_bytes(b"stale")
+        (schema_dir / "openapi-0.1.0-000000000000.yaml").write_bytes(b"stale")
+
+        response = APIClient().get(reverse("schema"))
+
+        assert response.status_code == 200
+        assert response.content != b"stale"
+
+    def test_serves_precomputed_schema(self, schema_dir):
+        """Test that the schema file is served from memory with an ETag and cache headers."""
+        get_schema_path("yaml").write_bytes(b"openapi: 3.0.3\n")
+        client = APIClient()
+
+        with patch("apps.core.schema.generate_schema") as mock_generate:
+            response = client.get(reverse("schema"))
+            get_schema_path("yaml").unlink()
+            cached = client.get(reverse("schema"))
+
+        mock_generate.assert_not_called()
+        assert response.status_code == 200
+        assert response.content == cached.content == b"openapi: 3.0.3\n"
+        assert response["Content-Type"] == "application/vnd.oai.openapi"
+        assert response["Cache-Control"] == "public, max-age=86400"
+        assert response["ETag"]
+
+        not_modified = client.get(reverse("schema"), HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified.status_code == 304
+
+    def test_generates_missing_schema(self, schema_dir):
+        """Test that the schema is generated once when there is no file, in JSON on request."""
+        client = APIClient()
+
+        with patch("apps.core.schema.generate_schema", wraps=generate_schema) as mock_generate:
+            response = client.get(reverse("schema"), {"format": "json"})
+            client.get(reverse("schema"), HTTP_ACCEPT="application/json")
+
+        mock_generate.assert_called_once()
+        assert response["Content-Type"] == "application/vnd.oai.openapi+json"
+        assert "/api/website-info/" in json.loads(response.content)["paths"]
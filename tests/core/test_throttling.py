@@ -0,0 +1,85 @@
+"""Tests for the API rate limiting."""
+
+import pytest
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.core.throttling import FETCH_SCOPE, SlidingWindowRateThrottle
+
+
+class View:
+    """Stand-in for a view, with the throttle attributes of the API views."""
+
+    def __init__(self, action=None, throttle_scope=None, throttle_scopes=None):
+        self.action = action
+        self.throttle_scope = throttle_scope
+        self.throttle_scopes = throttle_scopes or {}
+
+
+@pytest.fixture(autouse=True)
+def throttle_rates(settings):
+    """Set small rates, the counters are cleared for every test by the throttle_cache fixture."""
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {"read": "10/min", "write": None, "fetch": "2/min"},
+    }
+
+
+def make_request(method="get", ip="10.0.0.1"):
+    """Return an anonymous request from the given address."""
+    factory = APIRequestFactory()
+    return Request(getattr(factory, method)("/api/resource", REMOTE_ADDR=ip))
+
+
+def allow(now, request=None, view=None):
+    """Return whether a request at the given time is allowed, and the throttle."""
+    throttle = SlidingWindowRateThrottle()
+    throttle.timer = lambda: now
+    allowed = throttle.allow_request(request or make_request(), view or View())
+    return allowed, throttle
+
+
+class TestSlidingWindowRateThrottle:
+    """Tests for the SlidingWindowRateThrottle."""
+
+    def test_limits_requests_in_window(self):
+        """Test that requests beyond the rate are rejected with the time to wait."""
+        assert all(allow(6000 + i)[0] for i in range(10))
+
+        allowed, throttle = allow(6010)
+
+        assert not allowed
+        # The 10 requests of this window only stop counting after the next one
+        assert throttle.wait() == pytest.approx(50)
+
+    def test_weights_previous_window(self):
+        """Test that the requests of the previous window count by their overlap."""
+        for _ in range(10):
+            assert allow(6030)[0]
+
+        # Only a quarter of the previous window overlaps at the end of the next window
+        assert not allow(6060)[0]
+        assert [allow(6105)[0] for _ in range(9)] == [True] * 8 + [False]
+
+    def test_budgets_by_scope_and_client(self):
+        """Test that scopes and clients have separate budgets, and unset rates no limit."""
+        fetch_view = View(action="create", throttle_scopes={"create": FETCH_SCOPE})
+        post = make_request("post")
+
+        assert [allow(6000, post, fetch_view)[0] for _ in range(3)] == [True, True, False]
+        assert allow(6000, make_request("post", ip="10.0.0.2"), fetch_view)[0]
+        assert allow(6000, make_request())[0]
+        assert all(allow(6000, post)[0] for _ in range(20))
+
+    @pytest.mark.django_db
+    def test_api_rejects_with_retry_after(self):
+        """Test that throttled API requests are answered with 429 and Retry-After."""
+        client = APIClient()
+        url = reverse("websiteinfo-list")
+
+        responses = [client.post(url, {"url": "not a url"}, format="json") for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [400, 400, 429]
+        assert int(responses[2]["Retry-After"]) > 0
+        assert client.get(url).status_code == 200
@@ -0,0 +1,128 @@
+"""Tests for the recording and replay of upstream responses."""
+
+import io
+from unittest.mock import patch
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from apps.core.transport import CassetteMissError, get_cassette
+from apps.currency_rates.clients import BlockchainApiClient
+from apps.website_info.fetchers import PageTooLargeError, fetch_page
+
+RESPONSES = {
+    "http://example.com/": (301, {"Location": "https://example.com/"}, b""),
+    "https://example.com/": (200, {"Content-Type": "text/html; charset=utf-8"}, b"<p>\xc3\xa9</p>"),
+    "https://blockchain.info/ticker": (
+        200,
+        {"Content-Type": "application/json"},
+        b'{"EUR": {"15m": 1.5}}',
+    ),
+}
+
+
+@pytest.fixture
+def cassette(settings, tmp_path):
+    """Record to and replay from an empty cassette."""
+
+    def configure(mode, **options):
+        settings.UPSTREAM_CASSETTE = {
+            "MODE": mode,
+            "PATH": tmp_path / "upstream.jsonl.gz",
+            "LATENCY_MS": 0,
+            "ERROR_RATE": 0,
+            "ERROR_STATUS": None,
+            "SEED": 1,
+            **options,
+        }
+        # A new process loads the cassette again
+        get_cassette.cache_clear()
+
+    yield configure
+    get_cassette.cache_clear()
+
+
+def network_send(adapter, request, **kwargs):
+    """Answer requests like the upstream services would."""
+    status, headers, body = RESPONSES[request.url]
+    raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False)
+    return adapter.build_response(request, raw)
+
+
+class TestCassette:
+    """Tests for the CassetteAdapter."""
+
+    def test_record_and_replay(self, cassette):
+        """Test that recorded pages and API responses are replayed without the network."""
+        cassette("record")
+        with patch.object(HTTPAdapter, "send", autospec=True, side_effect=network_send):
+            recorded_page = fetch_page("http://example.com/")
+            recorded_price = BlockchainApiClient().get_bitcoin_price_eur()
+
+        cassette("replay")
+        with patch.object(HTTPAdapter, "send", side_effect=AssertionError("network used")):
+            page = fetch_page("http://example.com/")
+            price = BlockchainApiClient().get_bitcoin_price_eur()
+
+        assert page == recorded_page
+        assert page.final_url == "https://example.com/"
+        assert page.redirect_chain == ["http://example.com/"]
+        assert page.text == "<p>é</p>"
+        assert price == recorded_price == 1.5
+
+    def test_large_body_not_recorded(self, cassette, settings):
+        """Test that a body over the page size limit is rejected before it is recorded."""
+        settings.WEBSITE_INFO_MAX_PAGE_SIZE = 4
+        cassette("record")
+
+        with patch.object(HTTPAdapter, "send", autospec=True, side_effect=network_send):
+            with pytest.raises(PageTooLargeError):
+                fetch_page("https://example.com/")
+
+        assert not settings.UPSTREAM_CASSETTE["PATH"].exists()
+
+    def test_session_closed(self, cassette):
+        """Test that the session of a recorded fetch is closed with its connections."""
+        cassette("record")
+
+        with patch.object(HTTPAdapter, "send", autospec=True, side_effect=network_send):
+            with patch.object(requests.Session, "close", autospec=True) as mock_close:
+                fetch_page("https://example.com/")
+
+        mock_close.assert_called_once()
+
+    def test_unrecorded_request(self, cassette):
+        """Test that requests missing from the cassette fail like unreachable servers."""
+        cassette("replay")
+
+        with pytest.raises(CassetteMissError):
+            fetch_page("https://example.com/")
+        assert BlockchainApiClient().get_bitcoin_price_eur() is None
+
+    def test_latency_and_errors(self, cassette):
+        """Test that replays are delayed, and fail with injected errors."""
+        cassette("record")
+        with patch.object(HTTPAdapter, "send", autospec=True, side_effect=network_send):
+            fetch_page("https://example.com/")
+
+        cassette("replay", LATENCY_MS=250, ERROR_RATE=1, ERROR_STATUS=503)
+        with patch("apps.core.transport.time.sleep") as mock_sleep:
+            with pytest.raises(requests.HTTPError) as error:
+                fetch_page("https://example.com/")
+        mock_sleep.assert_called_once_with(0.25)
+        assert error.value.response.status_code == 503
+
+        cassette("replay", ERROR_RATE=1)
+        with pytest.raises(requests.ConnectionError):
+            fetch_page("https://example.com/")
+
+        cassette("replay", ERROR_RATE=0.5)
+        outcomes = []
+        for _ in range(20):
+            try:
+                outcomes.append(fetch_page("https://example.com/").text)
+            except requests.ConnectionError:
+                outcomes.append(None)
+        assert None in outcomes and "<p>é</p>" in outcomes
@@ -0,0 +1,36 @@
+"""Tests for the project-wide view helpers."""
+
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.views import lazy_view
+
+
+class TestLazyView:
+    """Tests for lazy_view."""
+
+    def test_imports_view_on_first_request(self):
+        """Test that the view class is only imported once, on the first request."""
+        with patch("apps.core.views.import_string") as mock_import:
+            mock_import.return_value.as_view.return_value = lambda request: HttpResponse("ok")
+
+            view = lazy_view("some.module.View", url_name="schema")
+            mock_import.assert_not_called()
+
+            request = RequestFactory().get("/")
+            assert view(request).content == b"ok"
+            assert view(request).content == b"ok"
+
+        mock_import.assert_called_once_with("some.module.View")
+        mock_import.return_value.as_view.assert_called_once_with(url_name="schema")
+
+    def test_documentation_view(self):
+        """Test that the lazily imported documentation view is served."""
+        response = APIClient().get(reverse("swagger-ui"))
+
+        assert response.status_code == 200
+        assert reverse("schema").encode() in response.content
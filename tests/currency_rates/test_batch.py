@@ -0,0 +1,188 @@
+"""Tests for the batch lookup of currency rates."""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.currency_rates.batch import (
+    ObservationCache,
+    get_eur_to_gbp_rates,
+    group_ranges,
+    observation_cache,
+    resolve_observation,
+)
+from apps.currency_rates.clients import EcbApiClient
+from apps.currency_rates.models import EcbObservation
+from apps.currency_rates.periods import DAILY, MONTHLY
+
+NOW = datetime.datetime(2025, 3, 10, 12, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_observation_cache():
+    """Start every test with an empty observation cache."""
+    observation_cache.clear()
+    yield
+    observation_cache.clear()
+
+
+def make_client(series):
+    """Return an ECB client mock answering every range with the given series."""
+    client = MagicMock(spec=EcbApiClient)
+    client.get_eur_to_gbp_series.return_value = series
+    return client
+
+
+class TestObservationCache:
+    """Tests for the ObservationCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used observation is evicted beyond the limit."""
+        cache = ObservationCache(2)
+        cache.set("a", 1.0)
+        cache.set("b", 2.0)
+        cache.get("a")
+        cache.set("c", 3.0)
+
+        assert cache.get("a") == 1.0
+        assert cache.get("b") is None
+        assert cache.get("c") == 3.0
+
+
+class TestResolution:
+    """Tests for the resolution of requested dates to ECB observations."""
+
+    def test_weekend_and_holiday(self):
+        """Test that dates without reference rate use the previous business day."""
+        # Saturday and Sunday
+        assert resolve_observation(DAILY, datetime.date(2025, 3, 8), NOW) == datetime.date(
+            2025, 3, 7
+        )
+        # New Year's Day
+        assert resolve_observation(DAILY, datetime.date(2025, 1, 1), NOW) == datetime.date(
+            2024, 12, 31
+        )
+
+    def test_unpublished(self):
+        """Test that observations not published yet are not resolved."""
+        assert resolve_observation(DAILY, datetime.date(2025, 3, 10), NOW) is None
+        assert resolve_observation(MONTHLY, datetime.date(2025, 3, 1), NOW) is None
+        assert resolve_observation(MONTHLY, datetime.date(2025, 2, 1), NOW) == datetime.date(
+            2025, 2, 1
+        )
+
+    def test_group_ranges(self):
+        """Test that days are only split into several ranges at large gaps."""
+        days = [datetime.date(2025, 1, 1), datetime.date(2025, 1, 5), datetime.date(2025, 3, 1)]
+
+        assert group_ranges(days, 30) == [
+            (datetime.date(2025, 1, 1), datetime.date(2025, 1, 5)),
+            (datetime.date(2025, 3, 1), datetime.date(2025, 3, 1)),
+        ]
+        assert group_ranges(days, None) == [(datetime.date(2025, 1, 1), datetime.date(2025, 3, 1))]
+        assert group_ranges([], None) == []
+
+
+@pytest.mark.django_db
+class TestGetEurToGbpRates:
+    """Tests for get_eur_to_gbp_rates."""
+
+    def test_one_request_per_frequency(self):
+        """Test that many dates and months are fetched with one ECB request per frequency."""
+        dates = [datetime.date(2025, 1, 2) + datetime.timedelta(days=i) for i in range(60)]
+        series = {
+            (datetime.date(2025, 1, 2) + datetime.timedelta(days=i)).isoformat(): 0.8
+            for i in range(60)
+        }
+        client = make_client(series)
+
+        result = get_eur_to_gbp_rates(
+            dates=dates, months=[datetime.date(2025, 1, 1)], now=NOW, client=client
+        )
+
+        assert result["upstream_requests"] == 2
+        assert len(result["results"]) == 61
+        assert result["results"][0] == {
+            "date": "2025-01-02",
+            "observation": "2025-01-02",
+            "eur_to_gbp": 0.8,
+        }
+        assert result["results"][-1]["month"] == "2025-01"
+        client.get_eur_to_gbp_series.assert_any_call(DAILY, "2025-01-02", "2025-02-28")
+        client.get_eur_to_gbp_series.assert_any_call(MONTHLY, "2025-01", "2025-01")
+
+    def test_memoized_observations(self):
+        """Test that observations are served from memory, then from the database."""
+        client = make_client({"2025-03-07": 0.85})
+        saturday = datetime.date(2025, 3, 8)
+
+        first = get_eur_to_gbp_rates(dates=[saturday], now=NOW, client=client)
+        second = get_eur_to_gbp_rates(dates=[saturday], now=NOW, client=client)
+        observation_cache.clear()
+        with patch.object(EcbObservation.objects, "bulk_create") as mock_create:
+            third = get_eur_to_gbp_rates(dates=[saturday], now=NOW, client=client)
+
+        client.get_eur_to_gbp_series.assert_called_once_with(DAILY, "2025-03-07", "2025-03-07")
+        mock_create.assert_not_called()
+        assert first["results"] == second["results"] == third["results"]
+        assert first["results"][0]["observation"] == "2025-03-07"
+        assert (second["upstream_requests"], third["upstream_requests"]) == (0, 0)
+        assert EcbObservation.objects.get(frequency=DAILY, period="2025-03-07").eur_to_gbp == 0.85
+
+    def test_unpublished_and_failed(self):
+        """Test that unpublished and unavailable observations are answered with null."""
+        client = make_client(None)
+
+        result = get_eur_to_gbp_rates(
+            dates=[datetime.date(2025, 3, 7), datetime.date(2025, 3, 10)], now=NOW, client=client
+        )
+
+        assert client.get_eur_to_gbp_series.call_count == 1
+        assert [item["eur_to_gbp"] for item in result["results"]] == [None, None]
+        assert result["results"][1]["observation"] is None
+        assert not EcbObservation.objects.exists()
+
+
+@pytest.mark.django_db
+class TestCurrencyRatesBatchView:
+    """Tests for the CurrencyRatesBatchView."""
+
+    def test_batch(self):
+        """Test that dates and months are converted and passed to the batch lookup."""
+        with patch("apps.currency_rates.views.get_eur_to_gbp_rates") as mock_rates:
+            mock_rates.return_value = {"results": [], "upstream_requests": 0}
+
+            response = APIClient().post(
+                reverse("currency-rates-batch"),
+                {"dates": ["2025-01-02"], "months": ["2024-12"]},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"results": [], "upstream_requests": 0}
+        mock_rates.assert_called_once_with(
+            dates=[datetime.date(2025, 1, 2)], months=[datetime.date(2024, 12, 1)]
+        )
+
+    def test_invalid(self, settings):
+        """Test that empty, malformed and too large batches are rejected."""
+        settings.CURRENCY_RATES_BATCH_MAX_ITEMS = 2
+        client = APIClient()
+        url = reverse("currency-rates-batch")
+
+        assert client.post(url, {}, format="json").status_code == status.HTTP_400_BAD_REQUEST
+        assert (
+            client.post(url, {"months": ["2025-13"]}, format="json").status_code
+            == status.HTTP_400_BAD_REQUEST
+        )
+        assert (
+            client.post(
+                url, {"dates": ["2025-01-02", "2025-01-03", "2025-01-06"]}, format="json"
+            ).status_code
+            == status.HTTP_400_BAD_REQUEST
+        )
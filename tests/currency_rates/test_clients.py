@@ -2,7 +2,10 @@
 
 from unittest.mock import patch
 
+from django.core.cache import cache
+
 from apps.currency_rates.clients import BlockchainApiClient, EcbApiClient
+from apps.currency_rates.periods import FINAL_TIMEOUT
 
 
 class TestBlockchainApiClient:
@@ -64,8 +67,53 @@ class TestEcbApiClient:
                 ]
             }
 
+            cache.clear()
             client = EcbApiClient()
             result = client.get_eur_to_gbp_rate()
 
             assert result == 1 / 0.7  # EUR to GBP rate is reciprocal
             mock_request.assert_called_once()
+
+    @patch("apps.currency_rates.clients.EcbApiClient._make_request")
+    def test_get_eur_to_gbp_rate_cached_per_period(self, mock_request):
+        """Test that the rate is fetched once per ECB period and cached until it changes."""
+        mock_request.return_value = {
+            "dataSets": [{"series": {"0:0:0:0:0": {"observations": {"0": [0.8]}}}}]
+        }
+        cache.clear()
+
+        client = EcbApiClient()
+        with patch("apps.currency_rates.clients.cache.set", wraps=cache.set) as mock_set:
+            first = client.get_eur_to_gbp_rate(
+                {"start_date": "2020-02-01", "end_date": "2020-02-29"}
+            )
+            second = client.get_eur_to_gbp_rate(
+                {"start_date": "2020-02-03", "end_date": "2020-02-14"}
+            )
+
+        assert first == second == 1 / 0.8
+        mock_request.assert_called_once()
+        assert mock_request.call_args.kwargs["params"]["startPeriod"] == "2020-02"
+        mock_set.assert_called_once_with(
+            "ecb_eur_gbp_rate_M_2020-02_2020-02", 1 / 0.8, FINAL_TIMEOUT
+        )
+
+    @patch("apps.currency_rates.clients.EcbApiClient._make_request")
+    def test_get_eur_to_gbp_series(self, mock_request):
+        """Test that the observations of a range are mapped to their periods."""
+        mock_request.return_value = {
+            "dataSets": [{"series": {"0:0:0:0:0": {"observations": {"0": [0.8], "2": [0.5]}}}}],
+            "structure": {
+                "dimensions": {
+                    "observation": [
+                        {"values": [{"id": "2025-01"}, {"id": "2025-02"}, {"id": "2025-03"}]}
+                    ]
+                }
+            },
+        }
+
+        result = EcbApiClient().get_eur_to_gbp_series("M", "2025-01", "2025-03")
+
+        assert result == {"2025-01": 1 / 0.8, "2025-03": 1 / 0.5}
+        assert mock_request.call_args.args == ("EXR/M.GBP.EUR.SP00.A",)
+        assert mock_request.call_args.kwargs["params"]["endPeriod"] == "2025-03"
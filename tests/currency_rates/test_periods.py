@@ -0,0 +1,111 @@
+"""Tests for the ECB period resolver."""
+
+import datetime
+
+import pytest
+
+from apps.currency_rates.periods import (
+    DAILY,
+    ECB_TIMEZONE,
+    FINAL_TIMEOUT,
+    MONTHLY,
+    easter_sunday,
+    is_target_business_day,
+    resolve_latest,
+    resolve_range,
+)
+
+
+def cet(*args):
+    """Build an aware datetime in the ECB time zone."""
+    return datetime.datetime(*args, tzinfo=ECB_TIMEZONE)
+
+
+class TestTargetCalendar:
+    """Tests for the TARGET holiday calendar."""
+
+    @pytest.mark.parametrize(
+        "year, expected",
+        [(2000, "2000-04-23"), (2008, "2008-03-23"), (2024, "2024-03-31"), (2025, "2025-04-20")],
+    )
+    def test_easter_sunday(self, year, expected):
+        """Test the computation of Easter Sunday."""
+        assert easter_sunday(year).isoformat() == expected
+
+    @pytest.mark.parametrize(
+        "day, expected",
+        [
+            ("2025-04-17", True),  # Maundy Thursday
+            ("2025-04-18", False),  # Good Friday
+            ("2025-04-21", False),  # Easter Monday
+            ("2025-05-01", False),  # Labour Day
+            ("2025-12-24", True),
+            ("2025-12-26", False),
+            ("2025-03-08", False),  # Saturday
+        ],
+    )
+    def test_is_target_business_day(self, day, expected):
+        """Test that weekends and TARGET holidays are not business days."""
+        assert is_target_business_day(datetime.date.fromisoformat(day)) is expected
+
+
+class TestResolveLatest:
+    """Tests for resolve_latest."""
+
+    def test_monthly_is_stable_within_a_month(self):
+        """Test that the latest monthly rate resolves to the same period all month."""
+        first = resolve_latest(MONTHLY, cet(2025, 3, 3, 17))
+        last = resolve_latest(MONTHLY, cet(2025, 3, 31, 23))
+
+        assert first == last
+        assert (first.start_period, first.end_period) == ("2025-02", "2025-02")
+        # The March average is published on the first business day of April
+        assert first.expires_at == cet(2025, 4, 1, 16)
+
+    def test_monthly_before_publication(self):
+        """Test that the previous month is not used before its average is published."""
+        # January 1 is a TARGET holiday, the December average follows on January 2
+        period = resolve_latest(MONTHLY, cet(2025, 1, 2, 10))
+
+        assert period.start_period == "2024-11"
+        assert period.expires_at == cet(2025, 1, 2, 16)
+
+    def test_daily_over_easter(self):
+        """Test that the daily rate of Maundy Thursday is used until Easter Tuesday."""
+        period = resolve_latest(DAILY, cet(2025, 4, 19, 12))
+
+        assert period.start == period.end == datetime.date(2025, 4, 17)
+        assert period.expires_at == cet(2025, 4, 22, 16)
+        assert resolve_latest(DAILY, cet(2025, 4, 22, 15, 59)) == period
+
+    def test_daily_after_publication(self):
+        """Test that the daily rate of today is used once it is published."""
+        period = resolve_latest(DAILY, cet(2025, 3, 7, 16, 30))
+
+        assert period.end_period == "2025-03-07"
+        # Published on Friday, so the next rate follows on Monday
+        assert period.expires_at == cet(2025, 3, 10, 16)
+
+
+class TestResolveRange:
+    """Tests for resolve_range."""
+
+    def test_monthly_range_widened_to_months(self):
+        """Test that date ranges within the same months share one period."""
+        now = cet(2025, 3, 10, 12)
+        period = resolve_range(MONTHLY, datetime.date(2025, 2, 1), datetime.date(2025, 2, 28), now)
+
+        assert period == resolve_range(
+            MONTHLY, datetime.date(2025, 2, 10), datetime.date(2025, 2, 12), now
+        )
+        assert period.cache_key == "M_2025-02_2025-02"
+        assert period.expires_at is None
+        assert period.timeout(now) == FINAL_TIMEOUT
+
+    def test_unpublished_range_expires(self):
+        """Test that a range still missing observations expires at the next publication."""
+        now = cet(2025, 3, 10, 12)
+        period = resolve_range(DAILY, datetime.date(2025, 3, 3), datetime.date(2025, 3, 14), now)
+
+        assert period.expires_at == cet(2025, 3, 10, 16)
+        assert period.timeout(now) == 4 * 3600
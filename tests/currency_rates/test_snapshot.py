@@ -0,0 +1,94 @@
+"""Tests for the snapshot of the latest currency rates."""
+
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from apps.currency_rates import snapshot as snapshot_module
+from apps.currency_rates.snapshot import build_snapshot, clear_rates_snapshot, get_rates_snapshot
+
+# Long before the next monthly ECB publication
+NOW = datetime.datetime(2025, 3, 10, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+RATES = {"bitcoin_eur": 50000.0, "eur_to_gbp": 1.2, "bitcoin_gbp": 41666.7}
+
+
+@pytest.fixture(autouse=True)
+def rates_snapshot():
+    """Start and end with no rates snapshot."""
+    clear_rates_snapshot()
+    yield
+    clear_rates_snapshot()
+
+
+class TestBuildSnapshot:
+    """Tests for build_snapshot."""
+
+    def test_render(self, settings):
+        """Test that the rates are rendered with validators and expire after the TTL."""
+        settings.CURRENCY_RATES_SNAPSHOT_TTL = 900
+
+        snapshot = build_snapshot(RATES, now=NOW)
+
+        assert snapshot.body == b'{"bitcoin_eur":50000.0,"eur_to_gbp":1.2,"bitcoin_gbp":41666.7}'
+        assert snapshot.etag.startswith('"')
+        assert snapshot.last_modified == NOW.replace(microsecond=0)
+        assert snapshot.expires_at == NOW + datetime.timedelta(seconds=900)
+        assert snapshot.max_age(NOW) == 900
+
+    def test_unchanged_rates_keep_validators(self):
+        """Test that a refresh with the same rates keeps the ETag and Last-Modified."""
+        previous = build_snapshot(RATES, now=NOW)
+        later = NOW + datetime.timedelta(minutes=20)
+
+        unchanged = build_snapshot(dict(RATES), previous=previous, now=later)
+        changed = build_snapshot({**RATES, "bitcoin_eur": 51000.0}, previous=previous, now=later)
+
+        assert (unchanged.etag, unchanged.last_modified) == (previous.etag, previous.last_modified)
+        assert unchanged.expires_at > previous.expires_at
+        assert changed.etag != previous.etag
+        assert changed.last_modified == later.replace(microsecond=0)
+
+    def test_expiry(self):
+        """Test that missing rates are retried soon, and the ECB publication ends the snapshot."""
+        assert build_snapshot({**RATES, "bitcoin_eur": None}, now=NOW).max_age(NOW) == 60
+
+        # The February average is published on the first business day of March at 16:00 CET
+        before_publication = datetime.datetime(2025, 3, 3, 14, 55, tzinfo=datetime.timezone.utc)
+        snapshot = build_snapshot(RATES, now=before_publication)
+        assert snapshot.max_age(before_publication) == 300
+
+
+class TestGetRatesSnapshot:
+    """Tests for get_rates_snapshot."""
+
+    @patch("apps.currency_rates.snapshot.get_currency_rates", return_value=RATES)
+    def test_refreshes_expired_snapshot(self, mock_get_rates):
+        """Test that the rates are only fetched again once the snapshot expired."""
+        first = get_rates_snapshot(NOW)
+        assert get_rates_snapshot(NOW + datetime.timedelta(minutes=10)) is first
+        mock_get_rates.assert_called_once()
+
+        refreshed = get_rates_snapshot(NOW + datetime.timedelta(minutes=20))
+        assert refreshed is not first
+        assert refreshed.etag == first.etag
+        assert mock_get_rates.call_count == 2
+
+    @patch("apps.currency_rates.snapshot.get_currency_rates", return_value=RATES)
+    def test_serves_expired_snapshot_while_refreshing(self, mock_get_rates):
+        """Test that other threads get the expired snapshot while one thread refreshes it."""
+        first = get_rates_snapshot(NOW)
+
+        with snapshot_module._refresh_lock:
+            assert get_rates_snapshot(NOW + datetime.timedelta(hours=1)) is first
+        mock_get_rates.assert_called_once()
+
+    @patch("apps.currency_rates.snapshot.get_currency_rates", return_value=RATES)
+    def test_shared_snapshot(self, mock_get_rates):
+        """Test that a snapshot rendered by another process is used from the cache."""
+        first = get_rates_snapshot(NOW)
+        # A process that has not rendered the rates itself
+        snapshot_module._current = None
+
+        assert get_rates_snapshot(NOW).body == first.body
+        mock_get_rates.assert_called_once()
@@ -7,6 +7,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.currency_rates.snapshot import clear_rates_snapshot
+
 
 @pytest.fixture
 def api_client():
@@ -14,13 +16,22 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture
+def rates_snapshot():
+    """Start and end with no rates snapshot."""
+    clear_rates_snapshot()
+    yield
+    clear_rates_snapshot()
+
+
 @pytest.mark.django_db
+@pytest.mark.usefixtures("rates_snapshot")
 class TestCurrencyRatesView:
     """Tests for the CurrencyRatesView."""
 
     def test_get_currency_rates(self, api_client):
         """Test getting currency rates."""
-        with patch("apps.currency_rates.services.get_currency_rates") as mock_get_rates:
+        with patch("apps.currency_rates.snapshot.get_currency_rates") as mock_get_rates:
             mock_get_rates.return_value = {
                 "bitcoin_eur": 50000.0,
                 "eur_to_gbp": 0.7,
@@ -36,3 +47,25 @@ class TestCurrencyRatesView:
                 "eur_to_gbp": 0.7,
                 "bitcoin_gbp": 50000.0 * 0.7,
             }
+
+    def test_get_currency_rates_from_snapshot(self, api_client):
+        """Test that the rates are rendered once and revalidated with their ETag."""
+        url = reverse("currency-rates")
+        with patch("apps.currency_rates.snapshot.get_currency_rates") as mock_get_rates:
+            mock_get_rates.return_value = {
+                "bitcoin_eur": 1.0,
+                "eur_to_gbp": 2.0,
+                "bitcoin_gbp": 0.5,
+            }
+
+            response = api_client.get(url)
+            not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            since = api_client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        mock_get_rates.assert_called_once()
+        assert response["Content-Type"] == "application/json"
+        assert response["Cache-Control"].startswith("public, max-age=")
+        assert 0 < int(response["Cache-Control"].split("=")[1]) <= 900
+        assert not_modified.status_code == since.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+        assert not_modified["ETag"] == response["ETag"]
@@ -0,0 +1,85 @@
+"""Tests for the WebsiteInfo page cache."""
+
+from unittest.mock import Mock
+
+from apps.website_info.cache import PageCache
+
+
+class TestPageCache:
+    """Tests for the PageCache."""
+
+    def test_repeat_body_skips_parsing(self):
+        """Test that an identical body is only parsed once."""
+        cache = PageCache(max_entries=10)
+        parse = Mock(return_value={"title": "Example", "images": [], "stylesheets_count": 1})
+
+        first = cache.get_or_parse("<html></html>", parse)
+        second = cache.get_or_parse("<html></html>", parse)
+
+        assert first == second
+        parse.assert_called_once_with()
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["bytes_saved"] == len("<html></html>")
+
+    def test_different_bodies_are_parsed_separately(self):
+        """Test that different bodies do not share a cache entry."""
+        cache = PageCache(max_entries=10)
+        parse = Mock(return_value={"images": []})
+
+        cache.get_or_parse("<html>a</html>", parse)
+        cache.get_or_parse("<html>b</html>", parse)
+
+        assert parse.call_count == 2
+
+    def test_cached_result_is_not_shared(self):
+        """Test that modifying a returned result does not change the cached entry."""
+        cache = PageCache(max_entries=10)
+        parse = Mock(return_value={"images": ["https://example.com/a.png"]})
+
+        result = cache.get_or_parse("<html></html>", parse)
+        result["images"].append("https://example.com/b.png")
+
+        cached = cache.get_or_parse("<html></html>", parse)
+        assert cached["images"] == ["https://example.com/a.png"]
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test that the least recently used entry is evicted when the cache is full."""
+        cache = PageCache(max_entries=2)
+        parse = Mock(return_value={"images": []})
+
+        cache.get_or_parse("a", parse)
+        cache.get_or_parse("b", parse)
+        cache.get_or_parse("a", parse)
+        cache.get_or_parse("c", parse)
+        cache.get_or_parse("a", parse)
+        cache.get_or_parse("b", parse)
+
+        assert parse.call_count == 4
+        assert cache.stats()["evictions"] == 2
+
+    def test_evicts_by_size(self):
+        """Test that entries are evicted once the size limit is exceeded."""
+        result = {"images": ["https://example.com/image.png"] * 10}
+        cache = PageCache(max_entries=10, max_bytes=len(repr(result)) + 1)
+        parse = Mock(return_value=result)
+
+        cache.get_or_parse("a", parse)
+        cache.get_or_parse("b", parse)
+
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] <= stats["max_bytes"]
+
+    def test_disabled_cache_always_parses(self):
+        """Test that a cache without entries parses every body."""
+        cache = PageCache(max_entries=0)
+        parse = Mock(return_value={"images": []})
+
+        cache.get_or_parse("a", parse)
+        cache.get_or_parse("a", parse)
+
+        assert parse.call_count == 2
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,97 @@
+"""Tests for the WebsiteInfo export endpoint."""
+
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.website_info.models import WebsiteInfo
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client for testing."""
+    return APIClient()
+
+
+@pytest.fixture
+def websites():
+    """Create and return WebsiteInfo instances on two domains."""
+    return [
+        WebsiteInfo.objects.create(
+            url=f"https://{domain}/{index}",
+            domain_name=domain,
+            protocol="https",
+            title=f"Page {index}",
+            images=[f"https://{domain}/image{index}.jpg"],
+            stylesheets_count=index,
+        )
+        for index, domain in enumerate(["example.com", "example.com", "example.org"])
+    ]
+
+
+def read_ndjson(response):
+    """Return the documents of a streamed NDJSON response."""
+    content = b"".join(response.streaming_content)
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db
+class TestWebsiteInfoExport:
+    """Tests for the streaming export of WebsiteInfo entries."""
+
+    def test_export_ndjson(self, api_client, websites):
+        """Test exporting all entries as newline-delimited JSON."""
+        response = api_client.get(reverse("websiteinfo-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = read_ndjson(response)
+        assert [row["url"] for row in rows] == [website.url for website in websites]
+        assert rows[0]["images"] == ["https://example.com/image0.jpg"]
+        assert rows[0]["created_at"].endswith("Z")
+
+    def test_export_csv(self, api_client, websites):
+        """Test exporting all entries as CSV."""
+        response = api_client.get(reverse("websiteinfo-export"), {"output": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/csv")
+        content = b"".join(response.streaming_content).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 3
+        assert rows[2]["domain_name"] == "example.org"
+        assert json.loads(rows[2]["images"]) == ["https://example.org/image2.jpg"]
+
+    def test_export_filters(self, api_client, websites):
+        """Test filtering the export by domain name."""
+        response = api_client.get(reverse("websiteinfo-export"), {"domain_name": "example.org"})
+
+        assert [row["url"] for row in read_ndjson(response)] == ["https://example.org/2"]
+
+    def test_export_updated_since_cursor(self, api_client, websites):
+        """Test that the cursor of an export only returns entries updated afterwards."""
+        url = reverse("websiteinfo-export")
+        response = api_client.get(url)
+        read_ndjson(response)
+        cursor = response["X-Export-Cursor"]
+
+        response = api_client.get(url, {"updated_since": cursor})
+        assert read_ndjson(response) == []
+        assert response["X-Export-Cursor"] == cursor
+
+        websites[0].title = "Updated"
+        websites[0].save()
+        response = api_client.get(url, {"updated_since": cursor})
+        assert [row["title"] for row in read_ndjson(response)] == ["Updated"]
+
+    def test_export_invalid_parameters(self, api_client):
+        """Test that invalid export parameters are rejected."""
+        response = api_client.get(reverse("websiteinfo-export"), {"output": "xml"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "output" in response.data
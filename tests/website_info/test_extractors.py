@@ -0,0 +1,92 @@
+"""Tests for the WebsiteInfo extractors."""
+
+from unittest.mock import patch
+
+from apps.website_info.extractors import (
+    extract_page_info,
+    page_cache,
+    parse_page_info,
+    parse_page_structure,
+)
+
+HTML = """
+<html>
+  <head>
+    <title> Example Domain </title>
+    <link rel="stylesheet" href="/style.css">
+  </head>
+  <body><img src="/image1.jpg"><img src="https://cdn.example.com/image2.jpg"></body>
+</html>
+"""
+
+
+class TestExtractors:
+    """Tests for the page extraction helpers."""
+
+    def test_parse_page_info(self):
+        """Test extracting the title, images and stylesheets count from a page."""
+        result = parse_page_info(HTML, "https://example.com")
+
+        assert result == {
+            "title": "Example Domain",
+            "images": ["https://example.com/image1.jpg", "https://cdn.example.com/image2.jpg"],
+            "stylesheets_count": 1,
+        }
+
+    def test_extract_page_info_reuses_identical_pages(self):
+        """Test that an identical page fetched from the same URL is only parsed once."""
+        page_cache.clear()
+
+        with patch(
+            "apps.website_info.extractors.parse_page_structure", wraps=parse_page_structure
+        ) as mock_parse:
+            first = extract_page_info(HTML, "https://example.com/?utm_source=a")
+            second = extract_page_info(HTML, "https://example.com/?utm_source=a")
+
+        assert first == second
+        mock_parse.assert_called_once()
+        assert page_cache.stats()["hits"] == 1
+
+    def test_extract_page_info_reuses_pages_across_urls(self):
+        """Test that an identical page fetched from different URLs is only parsed once."""
+        page_cache.clear()
+
+        with patch(
+            "apps.website_info.extractors.parse_page_structure", wraps=parse_page_structure
+        ) as mock_parse:
+            first = extract_page_info(HTML, "https://example.com/")
+            second = extract_page_info(HTML, "https://mirror.example.org/gallery/")
+
+        mock_parse.assert_called_once()
+        assert page_cache.stats()["hits"] == 1
+        assert first["images"] == [
+            "https://example.com/image1.jpg",
+            "https://cdn.example.com/image2.jpg",
+        ]
+        assert second["images"] == [
+            "https://mirror.example.org/image1.jpg",
+            "https://cdn.example.com/image2.jpg",
+        ]
+
+    def test_extract_page_info_resolves_query_string_variants_separately(self):
+        """Test that query-string variants resolve references against their own query."""
+        page_cache.clear()
+        html = '<html><body><img src="#large"></body></html>'
+
+        first = extract_page_info(html, "https://example.com/image?id=1")
+        second = extract_page_info(html, "https://example.com/image?id=2")
+
+        assert first["images"] == ["https://example.com/image?id=1#large"]
+        assert second["images"] == ["https://example.com/image?id=2#large"]
+        assert page_cache.stats()["hits"] == 1
+
+    def test_extract_page_info_applies_cached_base_href(self):
+        """Test that a cached <base href> is applied to the URL of every request."""
+        page_cache.clear()
+        html = '<html><head><base href="static/"></head><body><img src="a.png"></body></html>'
+
+        first = extract_page_info(html, "https://example.com/one/")
+        second = extract_page_info(html, "https://example.com/two/")
+
+        assert first["images"] == ["https://example.com/one/static/a.png"]
+        assert second["images"] == ["https://example.com/two/static/a.png"]
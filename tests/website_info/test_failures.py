@@ -0,0 +1,180 @@
+"""Tests for the failure registry of website fetches."""
+
+import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.website_info.failures import (
+    clear_failures,
+    failure_stats,
+    find_active_failure,
+    normalize_url,
+    record_failure,
+)
+from apps.website_info.fetchers import FetchedPage
+from apps.website_info.models import FetchFailure
+
+BACKOFF = {"BASE": 60, "MAX": 3600}
+
+
+@pytest.fixture(autouse=True)
+def backoff(settings):
+    """Use a short, predictable backoff."""
+    settings.WEBSITE_INFO_FAILURE_BACKOFF = BACKOFF
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client for testing."""
+    return APIClient()
+
+
+def http_error(status_code, headers=None):
+    """Build the error raised for a response with the given status."""
+    response = Mock(status_code=status_code, headers=headers or {})
+    return requests.HTTPError(f"{status_code} Error", response=response)
+
+
+class TestNormalizeUrl:
+    """Tests for normalize_url."""
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("HTTPS://Example.COM", "https://example.com/"),
+            ("https://example.com:443/a?b=1#top", "https://example.com/a?b=1"),
+            ("http://example.com:8080/A", "http://example.com:8080/A"),
+        ],
+    )
+    def test_normalize_url(self, url, expected):
+        """Test that spellings of the same URL are normalized to one."""
+        assert normalize_url(url) == expected
+
+
+@pytest.mark.django_db
+class TestFailureRegistry:
+    """Tests for recording and finding failures."""
+
+    def test_backoff_grows_with_failures(self):
+        """Test that the backoff doubles with every failure, up to the maximum."""
+        now = timezone.now()
+        delays = []
+        for _ in range(8):
+            failure = record_failure("https://example.com/a", http_error(500), now)
+            delays.append((failure.retry_at - now).total_seconds())
+
+        assert delays == [60, 120, 240, 480, 960, 1920, 3600, 3600]
+        assert failure.status_code == 500
+        assert failure.error_class == "HTTPError"
+        assert not FetchFailure.objects.filter(scope=FetchFailure.SCOPE_DOMAIN).exists()
+
+    def test_active_failure_expires(self):
+        """Test that a failure blocks the URL until its backoff expires."""
+        now = timezone.now()
+        record_failure("https://example.com/a", http_error(404), now)
+
+        assert find_active_failure("https://EXAMPLE.com/a#x", now) is not None
+        assert find_active_failure("https://example.com/b", now) is None
+        assert find_active_failure("https://example.com/a", now + datetime.timedelta(61)) is None
+
+    def test_unreachable_server_blocks_domain(self):
+        """Test that connection errors block every URL of the domain."""
+        record_failure("https://down.example/a", requests.ConnectTimeout("timed out"))
+
+        failure = find_active_failure("https://down.example/other")
+
+        assert failure.scope == FetchFailure.SCOPE_DOMAIN
+        assert failure.error_class == "ConnectTimeout"
+
+    def test_retry_after_header(self):
+        """Test that a longer delay requested with Retry-After is obeyed."""
+        now = timezone.now()
+        error = http_error(429, {"Retry-After": "600"})
+
+        failure = record_failure("https://example.com/a", error, now)
+
+        assert failure.retry_at == now + datetime.timedelta(seconds=600)
+
+    def test_retry_after_header_is_capped(self):
+        """Test that a huge Retry-After waits no longer than the maximum backoff."""
+        now = timezone.now()
+        error = http_error(503, {"Retry-After": "999999999999"})
+
+        failure = record_failure("https://example.com/a", error, now)
+
+        assert failure.retry_at == now + datetime.timedelta(seconds=BACKOFF["MAX"])
+
+    @pytest.mark.parametrize("retry_after", ["soon", "-5", "1.5", "\u00b2", ""])
+    def test_malformed_retry_after_header(self, retry_after):
+        """Test that a malformed Retry-After falls back to the backoff."""
+        now = timezone.now()
+        error = http_error(503, {"Retry-After": retry_after})
+
+        failure = record_failure("https://example.com/a", error, now)
+
+        assert failure.retry_at == now + datetime.timedelta(seconds=BACKOFF["BASE"])
+
+    def test_clear_and_stats(self):
+        """Test the statistics and that a successful fetch clears the failures."""
+        record_failure("https://down.example/a", requests.ConnectionError("refused"))
+        record_failure("https://example.com/a", http_error(503))
+        find_active_failure("https://down.example/b")
+
+        assert failure_stats() == {
+            "blocked_urls": 2,
+            "blocked_domains": 1,
+            "avoided_fetches": 1,
+            "errors": {"ConnectionError": 2, "HTTPError": 1},
+        }
+
+        clear_failures("https://down.example/a")
+        assert failure_stats()["blocked_domains"] == 0
+
+
+@pytest.mark.django_db
+class TestCreateWithFailures:
+    """Tests for the failure registry in WebsiteInfoView.create."""
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_failure_returned_without_fetch(self, mock_fetch, api_client):
+        """Test that a recently failed URL is not fetched again."""
+        mock_fetch.side_effect = requests.Timeout("Read timed out")
+        url = reverse("websiteinfo-list")
+
+        first = api_client.post(url, {"url": "https://slow.example/"}, format="json")
+        second = api_client.post(url, {"url": "https://slow.example/"}, format="json")
+
+        assert first.status_code == second.status_code == status.HTTP_400_BAD_REQUEST
+        assert second.data["error"] == "Failed to fetch URL: Read timed out"
+        assert 0 < int(second["Retry-After"]) <= 60
+        mock_fetch.assert_called_once()
+
+        stats = api_client.get(reverse("websiteinfo-stats")).data["fetch_failures"]
+        assert stats["avoided_fetches"] == 1
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_success_clears_failure(self, mock_fetch, api_client):
+        """Test that a URL fetched after its backoff has expired is forgotten."""
+        record_failure(
+            "https://example.com/",
+            http_error(500),
+            timezone.now() - datetime.timedelta(hours=1),
+        )
+        mock_fetch.return_value = FetchedPage(
+            url="https://example.com/",
+            final_url="https://example.com/",
+            text="<html><title>Example</title></html>",
+        )
+
+        response = api_client.post(
+            reverse("websiteinfo-list"), {"url": "https://example.com/"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not FetchFailure.objects.exists()
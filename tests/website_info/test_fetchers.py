@@ -0,0 +1,70 @@
+"""Tests for the WebsiteInfo fetchers."""
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from django.test import override_settings
+
+from apps.website_info.fetchers import HEADERS, PageTooLargeError, fetch_page
+
+
+def make_response(url, chunks, history=(), encoding="utf-8"):
+    """Build a mocked streamed response."""
+    response = MagicMock(url=url, history=list(history), encoding=encoding)
+    response.__enter__.return_value = response
+    response.iter_content.return_value = iter(chunks)
+    response.raw.tell.return_value = 42
+    return response
+
+
+class TestFetchPage:
+    """Tests for fetch_page."""
+
+    @patch("apps.website_info.fetchers.requests.get")
+    def test_records_redirect_chain(self, mock_get):
+        """Test that the final URL and the redirects followed are recorded."""
+        mock_get.return_value = make_response(
+            "https://www.example.com/",
+            [b"<html>", b"</html>"],
+            history=[Mock(url="http://example.com/"), Mock(url="https://example.com/")],
+        )
+
+        page = fetch_page("http://example.com")
+
+        assert page.url == "http://example.com"
+        assert page.final_url == "https://www.example.com/"
+        assert page.redirect_chain == ["http://example.com/", "https://example.com/"]
+        assert page.text == "<html></html>"
+        assert page.body_size == len("<html></html>")
+        assert page.transfer_size == 42
+        mock_get.return_value.raise_for_status.assert_called_once()
+
+    @patch("apps.website_info.fetchers.requests.get")
+    def test_negotiates_compression(self, mock_get):
+        """Test that compressed transfer is requested and the body is streamed."""
+        mock_get.return_value = make_response("https://example.com/", [b"<html></html>"])
+
+        fetch_page("https://example.com")
+
+        assert "gzip" in HEADERS["Accept-Encoding"]
+        mock_get.assert_called_once_with(
+            "https://example.com", headers=HEADERS, timeout=10, stream=True
+        )
+
+    @patch("apps.website_info.fetchers.requests.get")
+    def test_detects_missing_encoding(self, mock_get):
+        """Test that the body encoding is detected when the server does not send one."""
+        mock_get.return_value = make_response(
+            "https://example.com/", ["<html>café</html>".encode("utf-8")], encoding=None
+        )
+
+        assert fetch_page("https://example.com").text == "<html>café</html>"
+
+    @override_settings(WEBSITE_INFO_MAX_PAGE_SIZE=10)
+    @patch("apps.website_info.fetchers.requests.get")
+    def test_rejects_large_decoded_body(self, mock_get):
+        """Test that a body decoding to more than the size limit is rejected."""
+        mock_get.return_value = make_response("https://example.com/", [b"<html>", b"</html>"])
+
+        with pytest.raises(PageTooLargeError):
+            fetch_page("https://example.com")
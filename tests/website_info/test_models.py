@@ -1,10 +1,19 @@
 """Tests for the WebsiteInfo models."""
 
 import pytest
+from django.db import connection
+from django.test import override_settings
 
 from apps.website_info.models import WebsiteInfo
 
 
+def fetch_stored_images(pk):
+    """Read the images column of a row as stored in the database."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT images FROM website_info_websiteinfo WHERE id = %s", [pk])
+        return cursor.fetchone()[0]
+
+
 @pytest.mark.django_db
 class TestWebsiteInfoModel:
     """Tests for the WebsiteInfo model."""
@@ -28,3 +37,51 @@ class TestWebsiteInfoModel:
         assert website_info.stylesheets_count == 2
         assert website_info.created_at is not None
         assert website_info.updated_at is not None
+
+    @override_settings(WEBSITE_INFO_JSON_COMPRESSION={"MIN_SIZE": 100, "LEVEL": 6})
+    def test_large_images_are_stored_compressed(self):
+        """Test that large image lists are stored compressed and read back transparently."""
+        images = [f"https://example.com/image{index}.jpg" for index in range(100)]
+        website_info = WebsiteInfo.objects.create(
+            url="https://example.com", domain_name="example.com", protocol="https", images=images
+        )
+
+        stored = fetch_stored_images(website_info.id)
+
+        assert '"$zlib"' in stored
+        assert len(stored) < len(str(images))
+        assert WebsiteInfo.objects.get(id=website_info.id).images == images
+        assert WebsiteInfo.objects.values_list("images", flat=True).get() == images
+
+    @override_settings(WEBSITE_INFO_JSON_COMPRESSION={"MIN_SIZE": 100, "LEVEL": 6})
+    def test_bulk_update_compresses_large_images(self):
+        """Test that bulk_update stores large image lists compressed."""
+        websites = [
+            WebsiteInfo.objects.create(
+                url=f"https://example.com/{index}", domain_name="example.com", protocol="https"
+            )
+            for index in range(2)
+        ]
+        for index, website_info in enumerate(websites):
+            website_info.images = [f"https://example.com/{index}/{n}.jpg" for n in range(100)]
+
+        WebsiteInfo.objects.bulk_update(websites, ["images"])
+
+        for website_info in websites:
+            assert '"$zlib"' in fetch_stored_images(website_info.id)
+            assert WebsiteInfo.objects.get(id=website_info.id).images == website_info.images
+
+    @override_settings(WEBSITE_INFO_JSON_COMPRESSION={"MIN_SIZE": 100, "LEVEL": 6})
+    def test_queryset_update_compresses_large_images(self):
+        """Test that QuerySet.update() stores large image lists compressed."""
+        website_info = WebsiteInfo.objects.create(
+            url="https://example.com", domain_name="example.com", protocol="https"
+        )
+        images = [f"https://example.com/image{index}.jpg" for index in range(100)]
+
+        WebsiteInfo.objects.filter(id=website_info.id).update(images=images)
+
+        stored = fetch_stored_images(website_info.id)
+
+        assert '"$zlib"' in stored
+        assert WebsiteInfo.objects.get(id=website_info.id).images == images
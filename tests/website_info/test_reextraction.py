@@ -0,0 +1,304 @@
+"""Tests for the body archive and the extraction of stored websites again."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.website_info.archive import archive_body, get_body_path, read_body
+from apps.website_info.fetchers import FetchedPage
+from apps.website_info.models import DomainStats, WebsiteInfo
+from apps.website_info.reextraction import (
+    CheckpointMismatchError,
+    reextract_websites,
+    save_checkpoint,
+)
+from apps.website_info.rollups import record_websites_created
+
+PAGE = (
+    "<html><head><title>{title}</title>"
+    '<link rel="stylesheet" href="/a.css"><link rel="stylesheet" href="/b.css"></head>'
+    '<body><img src="/logo.png"></body></html>'
+)
+
+
+@pytest.fixture
+def archive(settings, tmp_path):
+    """Enable the body archive in a temporary directory."""
+    settings.WEBSITE_INFO_BODY_ARCHIVE = {"ENABLED": True, "DIR": tmp_path / "archive"}
+    return tmp_path / "archive"
+
+
+def interrupt(progress):
+    """Interrupt a run after its first batch."""
+    raise KeyboardInterrupt
+
+
+def create_archived_website(index, html, title=None, images=(), stylesheets_count=0):
+    """Create a website whose body is archived, with possibly stale information."""
+    website = WebsiteInfo.objects.create(
+        url=f"https://example.com/{index}",
+        domain_name="example.com",
+        protocol="https",
+        title=title,
+        images=list(images),
+        stylesheets_count=stylesheets_count,
+        body_sha256=archive_body(html),
+    )
+    record_websites_created([website])
+    return website
+
+
+class TestArchive:
+    """Tests for the body archive."""
+
+    def test_disabled(self, settings):
+        """Test that nothing is archived unless the archive is enabled."""
+        settings.WEBSITE_INFO_BODY_ARCHIVE = {"ENABLED": False, "DIR": "unused"}
+        assert archive_body("<html></html>") is None
+
+    def test_roundtrip_and_deduplication(self, archive):
+        """Test that bodies are stored compressed, once per content."""
+        sha256 = archive_body("<html>é</html>")
+
+        assert archive_body("<html>é</html>") == sha256
+        assert len(list(archive.rglob("*.gz"))) == 1
+        assert get_body_path(archive, sha256).parent.name == sha256[:2]
+        assert read_body(archive, sha256) == "<html>é</html>"
+
+    def test_read_missing(self, archive):
+        """Test that a body missing from the archive reads as None."""
+        assert read_body(archive, "0" * 64) is None
+
+    def test_concurrent_writers_of_same_body(self, archive):
+        """Test that a body archived by another writer before the rename is stored once."""
+        replace = os.replace
+        calls = []
+
+        def replace_after_concurrent_write(source, destination):
+            # The first writer is overtaken by a second one between writing and renaming
+            calls.append(source)
+            if len(calls) == 1:
+                archive_body("<html></html>")
+            replace(source, destination)
+
+        with patch("apps.website_info.archive.os.replace", replace_after_concurrent_write):
+            sha256 = archive_body("<html></html>")
+
+        assert len(calls) == 2
+        assert calls[0] != calls[1]
+        assert read_body(archive, sha256) == "<html></html>"
+        assert [path.name for path in archive.rglob("*") if path.is_file()] == [f"{sha256}.gz"]
+
+    def test_failed_write_leaves_no_temporary_file(self, archive):
+        """Test that the temporary file is removed when a body cannot be stored."""
+        with patch("apps.website_info.archive.os.replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                archive_body("<html></html>")
+
+        assert not [path for path in archive.rglob("*") if path.is_file()]
+
+
+@pytest.mark.django_db
+class TestReextractWebsites:
+    """Tests for reextract_websites."""
+
+    def test_updates_changed_websites_only(self, archive):
+        """Test that only stale websites are written, along with their domain statistics."""
+        stale = create_archived_website(1, PAGE.format(title="New"), title="Old")
+        current = create_archived_website(
+            2,
+            PAGE.format(title="Same"),
+            title="Same",
+            images=["https://example.com/logo.png"],
+            stylesheets_count=2,
+        )
+        unarchived = WebsiteInfo.objects.create(
+            url="https://example.com/3", domain_name="example.com", protocol="https"
+        )
+        current_updated_at = WebsiteInfo.objects.get(pk=current.pk).updated_at
+
+        progress = reextract_websites(WebsiteInfo.objects.all(), batch_size=1)
+
+        assert progress["last_pk"] == current.pk
+        assert (progress["processed"], progress["updated"], progress["missing"]) == (2, 1, 0)
+        stale.refresh_from_db()
+        assert stale.title == "New"
+        assert stale.images == ["https://example.com/logo.png"]
+        assert stale.stylesheets_count == 2
+        assert WebsiteInfo.objects.get(pk=current.pk).updated_at == current_updated_at
+        assert WebsiteInfo.objects.get(pk=unarchived.pk).title is None
+
+        stats = DomainStats.objects.get(domain_name="example.com")
+        assert stats.stylesheets_total == 4
+        assert stats.images_total == 2
+
+        # Running again changes nothing
+        assert reextract_websites(WebsiteInfo.objects.all(), batch_size=10)["updated"] == 0
+
+    def test_reports_missing_bodies(self, archive):
+        """Test that websites whose body was removed from the archive are counted and kept."""
+        website = create_archived_website(1, PAGE.format(title="New"), title="Old")
+        get_body_path(archive, website.body_sha256).unlink()
+
+        progress = reextract_websites(WebsiteInfo.objects.all(), batch_size=10)
+
+        assert progress["missing"] == 1
+        assert progress["updated"] == 0
+        assert WebsiteInfo.objects.get(pk=website.pk).title == "Old"
+
+    def test_resumes_from_checkpoint(self, archive, tmp_path):
+        """Test that an interrupted run resumes after the checkpoint and removes it once done."""
+        done = create_archived_website(1, PAGE.format(title="New"), title="Old")
+        pending = create_archived_website(2, PAGE.format(title="New"), title="Old")
+        checkpoint = tmp_path / "checkpoint.json"
+
+        with pytest.raises(KeyboardInterrupt):
+            reextract_websites(
+                WebsiteInfo.objects.all(), batch_size=1, checkpoint=checkpoint, on_batch=interrupt
+            )
+        WebsiteInfo.objects.filter(pk=done.pk).update(title="Old")
+        batches = []
+
+        progress = reextract_websites(
+            WebsiteInfo.objects.all(), batch_size=10, checkpoint=checkpoint, on_batch=batches.append
+        )
+
+        assert progress["processed"] == 2
+        assert len(batches) == 1
+        assert WebsiteInfo.objects.get(pk=done.pk).title == "Old"
+        assert WebsiteInfo.objects.get(pk=pending.pk).title == "New"
+        assert not checkpoint.exists()
+
+    def test_refuses_checkpoint_of_other_websites(self, archive, tmp_path):
+        """Test that a checkpoint is not resumed for another selection of websites."""
+        create_archived_website(1, PAGE.format(title="New"), title="Old")
+        create_archived_website(2, PAGE.format(title="New"), title="Old")
+        checkpoint = tmp_path / "checkpoint.json"
+
+        with pytest.raises(KeyboardInterrupt):
+            reextract_websites(
+                WebsiteInfo.objects.filter(domain_name="example.com"),
+                batch_size=1,
+                checkpoint=checkpoint,
+                on_batch=interrupt,
+            )
+
+        with pytest.raises(CheckpointMismatchError):
+            reextract_websites(WebsiteInfo.objects.all(), batch_size=1, checkpoint=checkpoint)
+        assert checkpoint.exists()
+
+    def test_saves_checkpoint_per_batch(self, archive, tmp_path):
+        """Test that the progress is saved after every batch."""
+        first = create_archived_website(1, PAGE.format(title="New"), title="Old")
+        create_archived_website(2, PAGE.format(title="New"), title="Old")
+        checkpoint = tmp_path / "checkpoint.json"
+        saved = []
+
+        def on_batch(progress):
+            saved.append(json.loads(checkpoint.read_text()))
+
+        reextract_websites(
+            WebsiteInfo.objects.all(), batch_size=1, checkpoint=checkpoint, on_batch=on_batch
+        )
+
+        assert saved[0]["last_pk"] == first.pk
+        assert (saved[0]["processed"], saved[0]["updated"], saved[0]["missing"]) == (1, 1, 0)
+
+    def test_updates_compressed_images(self, archive, settings):
+        """Test that stale websites are written with JSON compression enabled."""
+        settings.WEBSITE_INFO_JSON_COMPRESSION = {"MIN_SIZE": 1, "LEVEL": 6}
+        website = create_archived_website(1, PAGE.format(title="New"), title="Old")
+
+        progress = reextract_websites(WebsiteInfo.objects.all(), batch_size=10)
+
+        assert progress["updated"] == 1
+        website.refresh_from_db()
+        assert website.title == "New"
+        assert website.images == ["https://example.com/logo.png"]
+
+
+@pytest.mark.django_db
+class TestReextractWebsitesCommand:
+    """Tests for the reextract_websites command."""
+
+    def test_command(self, archive, capsys):
+        """Test that the command extracts the archived websites of a domain again."""
+        website = create_archived_website(1, PAGE.format(title="New"), title="Old")
+
+        call_command("reextract_websites", "--workers", "1", "--domain", "example.com")
+
+        assert WebsiteInfo.objects.get(pk=website.pk).title == "New"
+        assert "Extracted 1 websites again, updated 1" in capsys.readouterr().out
+        assert not (archive / "reextract-checkpoint.json").exists()
+
+    def test_command_with_worker_processes(self, archive, capsys):
+        """Test that the command extracts websites in a pool of worker processes."""
+        websites = [
+            create_archived_website(index, PAGE.format(title=f"New {index}"), title="Old")
+            for index in range(3)
+        ]
+
+        call_command("reextract_websites", "--workers", "2")
+
+        for index, website in enumerate(websites):
+            assert WebsiteInfo.objects.get(pk=website.pk).title == f"New {index}"
+        assert "Extracted 3 websites again, updated 3" in capsys.readouterr().out
+
+    def test_restart_ignores_checkpoint(self, archive, capsys):
+        """Test that --restart starts over from the first website."""
+        website = create_archived_website(1, PAGE.format(title="New"), title="Old")
+        save_checkpoint(
+            archive / "reextract-checkpoint.json",
+            {"last_pk": website.pk, "processed": 1, "updated": 0, "missing": 0},
+        )
+
+        call_command("reextract_websites", "--workers", "1", "--restart")
+
+        assert WebsiteInfo.objects.get(pk=website.pk).title == "New"
+
+    def test_refuses_checkpoint_of_other_domain(self, archive):
+        """Test that a run of another domain does not resume the checkpoint."""
+        create_archived_website(1, PAGE.format(title="New"), title="Old")
+        create_archived_website(2, PAGE.format(title="New"), title="Old")
+        with pytest.raises(KeyboardInterrupt):
+            reextract_websites(
+                WebsiteInfo.objects.all(),
+                batch_size=1,
+                checkpoint=archive / "reextract-checkpoint.json",
+                on_batch=interrupt,
+            )
+
+        with pytest.raises(CommandError, match="--restart"):
+            call_command("reextract_websites", "--workers", "1", "--domain", "example.com")
+
+    def test_invalid_batch_size(self, archive):
+        """Test that a non-positive batch size is rejected."""
+        with pytest.raises(CommandError):
+            call_command("reextract_websites", "--batch-size", "0")
+
+
+@pytest.mark.django_db
+class TestCreateArchivesBody:
+    """Tests for archiving the body of created websites."""
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_archives_body(self, mock_fetch, archive):
+        """Test that the body of a created website is archived under its hash."""
+        html = PAGE.format(title="Archived")
+        mock_fetch.return_value = FetchedPage(
+            url="https://example.com/", final_url="https://example.com/", text=html
+        )
+
+        response = APIClient().post(
+            reverse("websiteinfo-list"), {"url": "https://example.com/"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        website = WebsiteInfo.objects.get()
+        assert read_body(archive, website.body_sha256) == html
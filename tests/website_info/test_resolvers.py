@@ -0,0 +1,69 @@
+"""Tests for the WebsiteInfo image URL resolvers."""
+
+from bs4 import BeautifulSoup
+
+from apps.website_info.resolvers import ImageUrlResolver, parse_srcset
+
+
+class TestParseSrcset:
+    """Tests for the srcset parser."""
+
+    def test_candidates_with_descriptors(self):
+        """Test splitting candidates with width and density descriptors."""
+        assert parse_srcset("a.png 1x, b.png 2x,c.png 640w") == ["a.png", "b.png", "c.png"]
+
+    def test_candidate_urls_with_commas(self):
+        """Test that commas inside candidate URLs are preserved."""
+        assert parse_srcset("img/a,b.png 1x, img/c.png") == ["img/a,b.png", "img/c.png"]
+
+
+class TestImageUrlResolver:
+    """Tests for the ImageUrlResolver."""
+
+    def resolve(self, html, url="https://example.com/blog/post", **kwargs):
+        """Resolve the images of an HTML snippet."""
+        return ImageUrlResolver(url, **kwargs).resolve_images(BeautifulSoup(html, "html.parser"))
+
+    def test_relative_to_page_path(self):
+        """Test that relative references resolve against the page path."""
+        html = '<img src="img/a.png"><img src="/b.png"><img src="//cdn.example.com/c.png">'
+
+        assert self.resolve(html) == [
+            "https://example.com/blog/img/a.png",
+            "https://example.com/b.png",
+            "https://cdn.example.com/c.png",
+        ]
+
+    def test_base_href(self):
+        """Test that references resolve against the document base URL."""
+        html = '<head><base href="/static/"></head><img src="a.png">'
+
+        assert self.resolve(html) == ["https://example.com/static/a.png"]
+
+    def test_lazy_loading_and_srcset(self):
+        """Test that lazy-loading attributes and srcset candidates are collected."""
+        html = """
+            <img data-src="lazy.png" srcset="small.png 1x, large.png 2x">
+            <picture><source srcset="hero.webp"><img src="hero.png"></picture>
+        """
+
+        assert self.resolve(html) == [
+            "https://example.com/blog/lazy.png",
+            "https://example.com/blog/small.png",
+            "https://example.com/blog/large.png",
+            "https://example.com/blog/hero.webp",
+            "https://example.com/blog/hero.png",
+        ]
+
+    def test_duplicates_are_removed(self):
+        """Test that each image URL is only returned once."""
+        html = '<img src="a.png"><img src="/blog/a.png"><img src="a.png">'
+
+        assert self.resolve(html) == ["https://example.com/blog/a.png"]
+
+    def test_data_uris(self):
+        """Test that data URIs are skipped unless they fit the size cap."""
+        html = '<img src="data:image/gif;base64,R0lGOD"><img src="javascript:void(0)">'
+
+        assert self.resolve(html) == []
+        assert self.resolve(html, max_data_uri_length=100) == ["data:image/gif;base64,R0lGOD"]
@@ -0,0 +1,140 @@
+"""Tests for bulk and retention deletes of websites."""
+
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.website_info.models import DomainStats, WebsiteAlias, WebsiteInfo
+from apps.website_info.retention import delete_websites
+from apps.website_info.rollups import record_websites_created
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client for testing."""
+    return APIClient()
+
+
+def create_websites(domain_name, count, age_days=0):
+    """Create websites of a domain, created the given number of days ago."""
+    websites = [
+        WebsiteInfo.objects.create(
+            url=f"https://{domain_name}/{age_days}/{index}",
+            domain_name=domain_name,
+            protocol="https",
+            images=["https://example.com/a.png"],
+            stylesheets_count=2,
+        )
+        for index in range(count)
+    ]
+    WebsiteInfo.objects.filter(pk__in=[website.pk for website in websites]).update(
+        created_at=timezone.now() - timedelta(days=age_days)
+    )
+    record_websites_created(websites)
+    return websites
+
+
+@pytest.mark.django_db
+class TestDeleteWebsites:
+    """Tests for delete_websites."""
+
+    def test_deletes_in_chunks(self):
+        """Test that all matching websites are deleted and the rollup follows every chunk."""
+        old = create_websites("old.com", 5, age_days=30)
+        create_websites("new.com", 2)
+        WebsiteAlias.objects.create(url="https://old.com/alias", website=old[0])
+
+        queryset = WebsiteInfo.objects.filter(domain_name="old.com")
+        assert delete_websites(queryset, chunk_size=2) == 5
+
+        assert set(WebsiteInfo.objects.values_list("domain_name", flat=True)) == {"new.com"}
+        assert not WebsiteAlias.objects.exists()
+        assert not DomainStats.objects.filter(domain_name="old.com").exists()
+        assert DomainStats.objects.get(domain_name="new.com").page_count == 2
+
+    def test_nothing_to_delete(self):
+        """Test that an empty selection deletes nothing."""
+        assert delete_websites(WebsiteInfo.objects.all(), chunk_size=10) == 0
+
+
+@pytest.mark.django_db
+class TestPurgeWebsitesCommand:
+    """Tests for the purge_websites management command."""
+
+    def test_purges_old_websites(self):
+        """Test that websites older than the retention period are deleted."""
+        create_websites("example.com", 3, age_days=30)
+        create_websites("example.com", 2)
+
+        call_command("purge_websites", "--older-than-days=7", "--chunk-size=2")
+
+        assert WebsiteInfo.objects.count() == 2
+        assert DomainStats.objects.get(domain_name="example.com").page_count == 2
+
+    def test_dry_run(self):
+        """Test that a dry run deletes nothing."""
+        create_websites("example.com", 3, age_days=30)
+
+        call_command("purge_websites", "--older-than-days=7", "--dry-run")
+
+        assert WebsiteInfo.objects.count() == 3
+
+    @override_settings(WEBSITE_INFO_RETENTION_DAYS=0)
+    def test_requires_retention_period(self):
+        """Test that the command refuses to run without a retention period or domain."""
+        with pytest.raises(CommandError):
+            call_command("purge_websites", "--older-than-days=0")
+
+
+@pytest.mark.django_db
+class TestBulkDeleteView:
+    """Tests for the bulk delete endpoint."""
+
+    @override_settings(WEBSITE_INFO_DELETE_CHUNK_SIZE=2)
+    def test_bulk_delete_by_ids(self, api_client):
+        """Test deleting websites by IDs."""
+        websites = create_websites("example.com", 4)
+
+        response = api_client.post(
+            reverse("websiteinfo-bulk-delete"),
+            {"ids": [website.pk for website in websites[:3]]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"deleted": 3}
+        assert list(WebsiteInfo.objects.values_list("pk", flat=True)) == [websites[3].pk]
+        assert DomainStats.objects.get(domain_name="example.com").page_count == 1
+
+    def test_bulk_delete_by_domain_and_age(self, api_client):
+        """Test that all filters must match for a website to be deleted."""
+        create_websites("example.com", 2, age_days=30)
+        create_websites("example.com", 1)
+        create_websites("other.com", 1, age_days=30)
+
+        response = api_client.post(
+            reverse("websiteinfo-bulk-delete"),
+            {
+                "domain_name": "example.com",
+                "created_before": (timezone.now() - timedelta(days=7)).isoformat(),
+            },
+            format="json",
+        )
+
+        assert response.data == {"deleted": 2}
+        assert WebsiteInfo.objects.count() == 2
+
+    def test_bulk_delete_requires_filter(self, api_client):
+        """Test that a bulk delete without filters is rejected."""
+        create_websites("example.com", 1)
+
+        response = api_client.post(reverse("websiteinfo-bulk-delete"), {}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert WebsiteInfo.objects.count() == 1
@@ -0,0 +1,206 @@
+"""Tests for the per-domain statistics rollup."""
+
+from unittest.mock import patch
+
+import pytest
+from django.contrib import admin
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.website_info.fetchers import FetchedPage
+from apps.website_info.models import DomainStats, WebsiteInfo
+from apps.website_info.rollups import (
+    rebuild_domain_stats,
+    record_websites_created,
+    record_websites_deleted,
+    record_websites_refreshed,
+)
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client for testing."""
+    return APIClient()
+
+
+def create_website(url, domain_name, stylesheets_count=1, images=()):
+    """Create a WebsiteInfo instance and add it to the rollup."""
+    website = WebsiteInfo.objects.create(
+        url=url,
+        domain_name=domain_name,
+        protocol="https",
+        images=list(images),
+        stylesheets_count=stylesheets_count,
+    )
+    record_websites_created([website])
+    return website
+
+
+@pytest.mark.django_db
+class TestDomainStatsRollup:
+    """Tests for the maintenance of DomainStats."""
+
+    def test_created_and_deleted(self):
+        """Test that the rollup follows created and deleted websites."""
+        first = create_website("https://example.com/a", "example.com", 2, ["a.png"])
+        second = create_website("https://example.com/b", "example.com", 4, ["b.png", "c.png"])
+
+        stats = DomainStats.objects.get(domain_name="example.com")
+        assert stats.page_count == 2
+        assert stats.avg_stylesheets_count == 3
+        assert stats.images_total == 3
+        assert stats.latest_updated_at == second.updated_at
+
+        second.delete()
+        record_websites_deleted([second])
+
+        stats.refresh_from_db()
+        assert stats.page_count == 1
+        assert stats.avg_stylesheets_count == 2
+        assert stats.images_total == 1
+        assert stats.latest_updated_at == first.updated_at
+
+        first.delete()
+        record_websites_deleted([first])
+        assert not DomainStats.objects.exists()
+
+    def test_refreshed(self):
+        """Test that refreshed websites replace their previous counts."""
+        website = create_website("https://example.com/a", "example.com", 2, ["a.png"])
+        old_website = WebsiteInfo.objects.get(id=website.id)
+
+        website.stylesheets_count = 6
+        website.images = ["a.png", "b.png", "c.png"]
+        website.save()
+        record_websites_refreshed([old_website], [website])
+
+        stats = DomainStats.objects.get(domain_name="example.com")
+        assert stats.page_count == 1
+        assert stats.avg_stylesheets_count == 6
+        assert stats.images_total == 3
+
+    def test_rebuild(self):
+        """Test rebuilding the rollup from the stored websites."""
+        WebsiteInfo.objects.create(
+            url="https://example.org", domain_name="example.org", protocol="https", images=["a"]
+        )
+        DomainStats.objects.create(domain_name="stale.example", page_count=5)
+
+        assert rebuild_domain_stats() == 1
+        assert list(DomainStats.objects.values_list("domain_name", "page_count")) == [
+            ("example.org", 1)
+        ]
+
+    def test_rebuild_command(self):
+        """Test the rebuild_domain_stats management command."""
+        WebsiteInfo.objects.create(url="https://example.org", domain_name="example.org")
+
+        call_command("rebuild_domain_stats")
+
+        assert DomainStats.objects.get().page_count == 1
+
+
+@pytest.mark.django_db
+class TestDomainStatsView:
+    """Tests for the DomainStatsView."""
+
+    def test_list_domains(self, api_client):
+        """Test listing, filtering and sorting the domain statistics."""
+        create_website("https://example.com/a", "example.com", 1)
+        create_website("https://example.com/b", "example.com", 1)
+        create_website("https://example.org/a", "example.org", 5, ["a.png"])
+        url = reverse("websiteinfo-domains")
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["domain_name"] for row in response.data["results"]] == [
+            "example.com",
+            "example.org",
+        ]
+
+        response = api_client.get(url, {"ordering": "-avg_stylesheets_count"})
+        assert response.data["results"][0]["domain_name"] == "example.org"
+        assert response.data["results"][0]["images_total"] == 1
+
+        response = api_client.get(url, {"min_pages": 2})
+        assert [row["domain_name"] for row in response.data["results"]] == ["example.com"]
+
+        response = api_client.get(url, {"search": "org"})
+        assert [row["domain_name"] for row in response.data["results"]] == ["example.org"]
+
+    def test_invalid_min_pages(self, api_client):
+        """Test that an invalid page count filter is rejected."""
+        response = api_client.get(reverse("websiteinfo-domains"), {"min_pages": "many"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_destroy_updates_rollup(self, api_client):
+        """Test that deleting a website through the API updates the rollup."""
+        website = create_website("https://example.com/a", "example.com")
+
+        response = api_client.delete(reverse("websiteinfo-detail", args=[website.id]))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not DomainStats.objects.exists()
+
+    @patch("apps.website_info.views.record_websites_deleted", side_effect=RuntimeError)
+    def test_destroy_rolls_back_with_rollup(self, mock_record, api_client):
+        """Test that a website is kept when its rollup update fails."""
+        website = create_website("https://example.com/a", "example.com")
+        api_client.raise_request_exception = False
+
+        response = api_client.delete(reverse("websiteinfo-detail", args=[website.id]))
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert WebsiteInfo.objects.filter(id=website.id).exists()
+        assert DomainStats.objects.get().page_count == 1
+
+    @patch("apps.website_info.views.record_websites_created", side_effect=RuntimeError)
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_rolls_back_with_rollup(self, mock_fetch, mock_record, api_client):
+        """Test that no website is stored when its rollup update fails."""
+        mock_fetch.return_value = FetchedPage(
+            url="https://example.com/", final_url="https://example.com/", text="<html></html>"
+        )
+
+        response = api_client.post(
+            reverse("websiteinfo-list"), {"url": "https://example.com/"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert not WebsiteInfo.objects.exists()
+        assert not DomainStats.objects.exists()
+
+
+@pytest.mark.django_db
+class TestWebsiteInfoAdminRollup:
+    """Tests for the rollup maintenance of the WebsiteInfo admin."""
+
+    @patch("apps.website_info.admin.record_websites_deleted", side_effect=RuntimeError)
+    def test_delete_queryset_rolls_back_with_rollup(self, mock_record):
+        """Test that websites deleted in bulk are kept when their rollup update fails."""
+        create_website("https://example.com/a", "example.com")
+        create_website("https://example.com/b", "example.com")
+        model_admin = admin.site._registry[WebsiteInfo]
+
+        with pytest.raises(RuntimeError):
+            model_admin.delete_queryset(None, WebsiteInfo.objects.all())
+
+        assert WebsiteInfo.objects.count() == 2
+        assert DomainStats.objects.get().page_count == 2
+
+    @patch("apps.website_info.admin.record_websites_deleted", side_effect=RuntimeError)
+    def test_delete_model_rolls_back_with_rollup(self, mock_record):
+        """Test that a website is kept when its rollup update fails."""
+        website = create_website("https://example.com/a", "example.com")
+        model_admin = admin.site._registry[WebsiteInfo]
+
+        website_id = website.id
+
+        with pytest.raises(RuntimeError):
+            model_admin.delete_model(None, website)
+
+        assert WebsiteInfo.objects.filter(id=website_id).exists()
+        assert DomainStats.objects.get().page_count == 1
@@ -0,0 +1,91 @@
+"""Tests for the full-text search over WebsiteInfo titles."""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.website_info.models import WebsiteInfo
+from apps.website_info.search import search_websites
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client for testing."""
+    return APIClient()
+
+
+@pytest.fixture
+def websites():
+    """Create and return WebsiteInfo instances with various titles."""
+    titles = [
+        "Bitcoin price tracker",
+        "Bitcoin news and Bitcoin analysis",
+        "Café reviews",
+        "Weather forecast",
+        None,
+    ]
+    return [
+        WebsiteInfo.objects.create(
+            url=f"https://example.com/{index}",
+            domain_name="example.com",
+            protocol="https",
+            title=title,
+        )
+        for index, title in enumerate(titles)
+    ]
+
+
+def search(query):
+    """Return the titles matching a search, best matches first."""
+    return [website.title for website in search_websites(WebsiteInfo.objects.all(), query)]
+
+
+@pytest.mark.django_db
+class TestSearchWebsites:
+    """Tests for search_websites."""
+
+    def test_ranked_word_match(self, websites):
+        """Test that titles mentioning a word more often rank higher."""
+        assert search("bitcoin") == [
+            "Bitcoin news and Bitcoin analysis",
+            "Bitcoin price tracker",
+        ]
+
+    def test_prefix_and_all_terms(self, websites):
+        """Test that every query word must match the start of a title word."""
+        assert search("bitc pri") == ["Bitcoin price tracker"]
+        assert search("itcoin") == []
+
+    def test_diacritics(self, websites):
+        """Test that diacritics are ignored."""
+        assert search("cafe") == ["Café reviews"]
+
+    def test_empty_query(self, websites):
+        """Test that a query without words matches nothing."""
+        assert search(' -*"') == []
+
+    def test_index_follows_updates_and_deletes(self, websites):
+        """Test that the index is kept in sync with the table."""
+        websites[3].title = "Bitcoin weather"
+        websites[3].save()
+        websites[0].delete()
+
+        assert search("weather") == ["Bitcoin weather"]
+        assert search("tracker") == []
+
+
+@pytest.mark.django_db
+class TestWebsiteInfoSearchView:
+    """Tests for the q parameter of the website information list."""
+
+    def test_search(self, api_client, websites):
+        """Test searching the list endpoint with pagination."""
+        response = api_client.get(reverse("websiteinfo-list"), {"q": "bitcoin"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+        assert [row["title"] for row in response.data["results"]] == [
+            "Bitcoin news and Bitcoin analysis",
+            "Bitcoin price tracker",
+        ]
@@ -7,7 +7,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from apps.website_info.models import WebsiteInfo
+from apps.website_info.fetchers import FetchedPage
+from apps.website_info.models import DomainStats, WebsiteAlias, WebsiteInfo
 
 
 @pytest.fixture
@@ -74,3 +75,132 @@ class TestWebsiteInfoViewSet:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "url" in response.data
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_website_info_validates_once(self, mock_fetch, api_client):
+        """Test that only the submitted URL is validated, not the extracted information."""
+        mock_fetch.return_value = FetchedPage(
+            url="https://gallery.example.com",
+            final_url="https://gallery.example.com/",
+            text='<img src="/a.png"><img src="https://cdn.example.com/b c.png">',
+        )
+
+        with patch(
+            "apps.website_info.serializers.validators.url", return_value=True
+        ) as mock_validate:
+            response = api_client.post(
+                reverse("websiteinfo-list"), {"url": "https://gallery.example.com"}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        mock_validate.assert_called_once_with("https://gallery.example.com")
+        # Stored as extracted, although URLField would reject the second image
+        assert response.data["images"] == [
+            "https://gallery.example.com/a.png",
+            "https://cdn.example.com/b c.png",
+        ]
+        assert WebsiteInfo.objects.get(pk=response.data["id"]).domain_name == "gallery.example.com"
+        assert DomainStats.objects.get(domain_name="gallery.example.com").page_count == 1
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_website_info_too_long_host(self, mock_fetch, api_client):
+        """Test that a page on a host longer than its column is rejected, not truncated."""
+        final_url = f"https://{'a' * 60}.{'b' * 60}.{'c' * 60}.{'d' * 60}.{'e' * 60}.com/"
+        mock_fetch.return_value = FetchedPage(
+            url="https://example.com", final_url=final_url, text="<html></html>"
+        )
+
+        response = api_client.post(
+            reverse("websiteinfo-list"), {"url": "https://example.com"}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "domain name" in response.data["error"]
+        assert not WebsiteInfo.objects.exists()
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_website_info_stored_concurrently(self, mock_fetch, api_client, website_info):
+        """Test that a URL stored by a concurrent request is returned instead of failing."""
+        mock_fetch.return_value = FetchedPage(
+            url=website_info.url, final_url="https://example.com/other", text="<html></html>"
+        )
+
+        # The concurrent request stored the URL after it was looked up
+        with patch(
+            "apps.website_info.views.WebsiteInfoView._find_existing_website_info",
+            return_value=None,
+        ):
+            response = api_client.post(
+                reverse("websiteinfo-list"), {"url": website_info.url}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == website_info.id
+        assert WebsiteInfo.objects.count() == 1
+        assert not DomainStats.objects.exists()
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_website_info_records_redirects(self, mock_fetch, api_client):
+        """Test that the final URL and redirect chain are stored on creation."""
+        mock_fetch.return_value = FetchedPage(
+            url="http://example.org",
+            final_url="https://www.example.org/blog/",
+            text='<html><title>Blog</title><img src="a.png"></html>',
+            redirect_chain=["http://example.org/"],
+        )
+
+        url = reverse("websiteinfo-list")
+        response = api_client.post(url, {"url": "http://example.org"}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["url"] == "http://example.org"
+        assert response.data["final_url"] == "https://www.example.org/blog/"
+        assert response.data["redirect_chain"] == ["http://example.org/"]
+        assert response.data["domain_name"] == "www.example.org"
+        assert response.data["protocol"] == "https"
+        assert response.data["images"] == ["https://www.example.org/blog/a.png"]
+        assert set(WebsiteAlias.objects.values_list("url", flat=True)) == {
+            "http://example.org/",
+            "https://www.example.org/blog/",
+        }
+        assert DomainStats.objects.get(domain_name="www.example.org").images_total == 1
+
+    @patch("apps.website_info.views.fetch_page")
+    def test_create_website_info_redirecting_to_existing(
+        self, mock_fetch, api_client, website_info
+    ):
+        """Test that a URL redirecting to a stored page returns it without parsing."""
+        website_info.final_url = "https://example.com/"
+        website_info.save()
+        mock_fetch.return_value = FetchedPage(
+            url="http://example.com/?ref=1",
+            final_url="https://example.com/",
+            text="<html></html>",
+            redirect_chain=["http://example.com/?ref=1"],
+        )
+
+        url = reverse("websiteinfo-list")
+        with patch("apps.website_info.views.extract_page_info") as mock_extract:
+            response = api_client.post(url, {"url": "http://example.com/?ref=1"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == website_info.id
+        mock_extract.assert_not_called()
+        assert WebsiteInfo.objects.count() == 1
+
+        # The alias now resolves without fetching the URL again
+        mock_fetch.reset_mock()
+        response = api_client.post(url, {"url": "http://example.com/?ref=1"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == website_info.id
+        mock_fetch.assert_not_called()
+
+    def test_stats(self, api_client):
+        """Test getting website extraction statistics."""
+        url = reverse("websiteinfo-stats")
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "hit_ratio" in response.data["page_cache"]
+        assert "bytes_saved" in response.data["page_cache"]